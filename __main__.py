@@ -1,7 +1,18 @@
+import argparse
+import json
+import sys
+from typing import Iterable, TextIO
+
+from calc.cache import ParseCache
 from calc.calc import Calc
+from calc.limits import Limits
+from calc.records import Outcome, format_value, json_record, try_evaluate
 
+# Roughly how many bytes of input are read and evaluated at a time in batch mode
+CHUNK_SIZE = 1 << 20
 
-def main():
+
+def interactive():
     calc = Calc()
     try:
         calc.read_input()
@@ -19,4 +30,63 @@ def main():
         print("quit")
 
 
-main()
+def _format_plain(outcome: Outcome) -> str:
+    value, error, position = outcome
+    if error is None:
+        return "\n" if value is None else f"{format_value(value)}\n"
+    if position is None:
+        return f"error: {error}\n"
+    # 0-based, as in the messages and the JSON records
+    return f"error at {position}: {error}\n"
+
+
+def _format_jsonl(outcome: Outcome) -> str:
+    return json.dumps(json_record(outcome), allow_nan=False) + "\n"
+
+
+FORMATS = {"plain": _format_plain, "jsonl": _format_jsonl}
+
+
+def evaluate_lines(lines: Iterable[str], calc: Calc, output_format: str) -> str:
+    """Evaluates one expression per line.
+
+    Returns:
+        str: One result per line, in the given output format.
+    """
+    format_line = FORMATS[output_format]
+    return "".join(format_line(try_evaluate(calc, line.rstrip("\n"))) for line in lines)
+
+
+def batch(stdin: TextIO, stdout: TextIO, output_format: str):
+    # No prompt, so the error positions are relative to the line
+    calc = Calc(prompt="", cache=ParseCache(maxsize=1024), limits=Limits())
+
+    lines = stdin.readlines(CHUNK_SIZE)
+    while lines:
+        stdout.write(evaluate_lines(lines, calc, output_format))
+        lines = stdin.readlines(CHUNK_SIZE)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluates arithmetic expressions.")
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="read one expression per line from stdin, without a prompt",
+    )
+    parser.add_argument(
+        "--format",
+        choices=FORMATS,
+        default="plain",
+        help="the batch output format (default: plain)",
+    )
+    args = parser.parse_args()
+
+    if args.batch:
+        batch(sys.stdin, sys.stdout, args.format)
+    else:
+        interactive()
+
+
+if __name__ == "__main__":
+    main()
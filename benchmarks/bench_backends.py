@@ -0,0 +1,88 @@
+"""Numeric backend benchmark.
+
+Times parsing and evaluating generated expressions with every backend,
+and evaluating their compiled programs, along with the error of summing
+a decimal fraction many times.
+
+Usage:
+    python -m benchmarks.bench_backends
+"""
+
+import random
+from timeit import Timer
+from typing import Dict, List
+
+from calc import Calc
+from calc.numeric import DecimalBackend, FloatBackend, FractionBackend, NumericBackend
+
+from .bench_cli import _expression
+
+EXPRESSIONS = 2_000
+# Keeps the fractions from growing without bound
+OPS = {"**": "*"}
+
+BACKENDS: Dict[str, NumericBackend] = {
+    "float": FloatBackend(),
+    "decimal": DecimalBackend(),
+    "fraction": FractionBackend(),
+}
+
+
+def _expressions() -> List[str]:
+    rng = random.Random(0)
+    texts = []
+    for _ in range(EXPRESSIONS):
+        text = _expression(rng).replace("**", "*")
+        texts.append(text.replace(" * ", " * 1.25 * ", 1))
+    return texts
+
+
+def _parse_and_evaluate(texts: List[str], backend: NumericBackend):
+    calc = Calc(prompt="", backend=backend)
+    for text in texts:
+        calc.input = text
+        try:
+            calc.compile(optimize=False).eval()
+        except ArithmeticError:
+            pass
+
+
+def _evaluate(texts: List[str], backend: NumericBackend):
+    programs = [
+        Calc(input_string=text, backend=backend).compile(optimize=False)
+        for text in texts
+    ]
+
+    def run():
+        for program in programs:
+            try:
+                program.eval()
+            except ArithmeticError:
+                pass
+
+    return run
+
+
+def _time(run) -> float:
+    number, _ = Timer(run).autorange()
+    return min(Timer(run).repeat(3, number)) / number
+
+
+def main():
+    texts = _expressions()
+    sum_text = " + ".join(["0.1"] * 1_000)
+
+    print(f"{EXPRESSIONS} expressions")
+    print(f"{'backend':>9} {'parse + eval':>14} {'eval':>12} {'1000 x 0.1':>30}")
+    for name, backend in BACKENDS.items():
+        parse = _time(lambda: _parse_and_evaluate(texts, backend))
+        evaluate = _time(_evaluate(texts, backend))
+        total = Calc(input_string=sum_text, backend=backend).result
+        print(
+            f"{name:>9} {parse * 1e3:11.1f} ms {evaluate * 1e3:9.1f} ms"
+            f" {str(total):>30}"
+        )
+
+
+if __name__ == "__main__":
+    main()
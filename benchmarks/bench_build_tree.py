@@ -0,0 +1,116 @@
+"""Tree construction scaling benchmark.
+
+Times `_make_node` on inputs from 10 to 100k tokens, next to the previous
+rightmost-spine walk, which is quadratic on long spines
+and is only run up to 1k tokens.
+
+Usage:
+    python -m benchmarks.bench_build_tree
+"""
+
+import sys
+from timeit import Timer
+
+from calc import Calc
+from calc.parser import TokenGroup, _make_node
+from calc.op import Op
+from calc.token import Token
+from calc.tree import GroupNode, NumNode, OpNode, Tree
+
+SIZES = [10, 100, 1_000, 10_000, 100_000]
+QUADRATIC_LIMIT = 1_000
+
+WORKLOADS = {
+    # Cycles through all the precedence levels,
+    #  so the spine keeps growing and shrinking
+    "flat": "1 + 2 * 3 ** 4 - 5 // 6 % 7 / 8 ** 9 *",
+    # Every unary operation lands at the bottom of an ever-growing spine
+    "unary chain": "-",
+}
+
+
+def _walk_put_value(root: Tree | None, new_node: Tree) -> Tree:
+    if root is None:
+        return new_node
+
+    rightmost_node = root
+    while rightmost_node.right:
+        rightmost_node = rightmost_node.right
+    rightmost_node.right = new_node
+
+    return root
+
+
+def _walk_put_op(root: Tree | None, new_node: OpNode, unary: bool = False) -> Tree:
+    if not root:
+        return new_node
+
+    if type(root) is OpNode and (new_node.token > root.token or unary):
+        root.right = _walk_put_op(root.right, new_node, unary)
+        return root
+
+    new_node.left = root
+    return new_node
+
+
+def _walk_make_node(token_group: TokenGroup) -> Tree:
+    root = None
+    prev_is_value = False
+
+    for item in token_group:
+        if isinstance(item, Token) and isinstance(item.value, Op):
+            root = _walk_put_op(root, OpNode(item), unary=not prev_is_value)
+            prev_is_value = False
+        else:
+            new_node = (
+                _walk_make_node(item) if isinstance(item, list) else NumNode(item)
+            )
+            if isinstance(new_node, OpNode):
+                new_node.__class__ = GroupNode
+
+            root = _walk_put_value(root, new_node)
+            prev_is_value = True
+
+    return root
+
+
+def _grouped_tokens(pattern: str, size: int) -> TokenGroup:
+    text = (pattern.split() * (size // len(pattern.split()) + 1))[:size]
+    text[-1] = "1"
+
+    calc = Calc(input_string=" ".join(text))
+    calc._tokenize()
+    calc._group_tokens_by_brackets()
+    return calc._grouped_tokens
+
+
+def _best(func, arg) -> float:
+    timer = Timer(lambda: func(arg))
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=3, number=number)) / number
+
+
+def main():
+    # The spine walk recurses once per spine level
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 2 * QUADRATIC_LIMIT))
+
+    for name, pattern in WORKLOADS.items():
+        print(f"{name}: {pattern} ...")
+        print(f"{'tokens':>8} {'spine stack':>14} {'per token':>12} {'spine walk':>14}")
+        for size in SIZES:
+            group = _grouped_tokens(pattern, size)
+            linear = _best(_make_node, group)
+            walk = (
+                f"{_best(_walk_make_node, group) * 1e3:11.3f} ms"
+                if size <= QUADRATIC_LIMIT
+                else f"{'-':>14}"
+            )
+            print(
+                f"{size:>8} {linear * 1e3:11.3f} ms {linear / size * 1e9:9.1f} ns"
+                f" {walk}"
+            )
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Batch command line throughput benchmark.
+
+Pipes generated expressions through `python . --batch`
+and reports the lines per second for each output format.
+
+Usage:
+    python -m benchmarks.bench_cli
+"""
+
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+LINES = 200_000
+DISTINCT = 1_000
+
+OPS = ["+", "-", "*", "/", "//", "%", "**"]
+
+
+def _expression(rng: random.Random) -> str:
+    terms = [str(rng.randint(0, 99)) for _ in range(rng.randint(1, 8))]
+    text = terms[0]
+    for term in terms[1:]:
+        op = rng.choice(OPS)
+        text += f" {op} {term if op != '**' else rng.randint(0, 3)}"
+    return f"({text}) * 2" if rng.random() < 0.3 else text
+
+
+def main():
+    rng = random.Random(0)
+    expressions = [_expression(rng) for _ in range(DISTINCT)]
+
+    with tempfile.TemporaryFile("w+") as stdin:
+        stdin.writelines(rng.choice(expressions) + "\n" for _ in range(LINES))
+
+        print(f"{LINES} lines, {DISTINCT} distinct expressions")
+        for output_format in ("plain", "jsonl"):
+            stdin.seek(0)
+            start = time.perf_counter()
+            subprocess.run(
+                [sys.executable, str(ROOT), "--batch", "--format", output_format],
+                stdin=stdin,
+                stdout=subprocess.DEVNULL,
+                check=True,
+            )
+            elapsed = time.perf_counter() - start
+            print(f"{output_format:>6}: {LINES / elapsed:10,.0f} lines/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Python code generation benchmark.
+
+Times re-evaluating expressions over variables as native Python functions
+next to their compiled programs and walking their syntax trees.
+
+Usage:
+    python -m benchmarks.bench_codegen
+"""
+
+from timeit import Timer
+
+from calc import Calc
+
+SIZES = [10, 100, 400]
+
+PATTERN = "x * 2 + y / 3 - x ** 2 % 7 * - y +"
+
+BINDINGS = {"x": 3, "y": 0.5}
+
+
+def _calc(size: int) -> Calc:
+    text = (PATTERN.split() * (size // len(PATTERN.split()) + 1))[:size]
+    text[-1] = "x"
+    return Calc(input_string=" ".join(text))
+
+
+def _best(func) -> float:
+    timer = Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=3, number=number)) / number
+
+
+def main():
+    print(f"{'tokens':>8} {'tree':>12} {'program':>12} {'python':>12} {'speedup':>8}")
+    for size in SIZES:
+        calc = _calc(size)
+        program = calc.compile()
+        tree = calc._tree
+        function = calc.to_python()
+        args = [BINDINGS[name] for name in function.variables]
+
+        walk = _best(lambda: tree.eval(BINDINGS))
+        run = _best(lambda: program.eval(BINDINGS))
+        call = _best(lambda: function(*args))
+        print(
+            f"{size:>8} {walk * 1e6:9.2f} us {run * 1e6:9.2f} us"
+            f" {call * 1e6:9.2f} us {run / call:7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
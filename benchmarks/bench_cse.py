@@ -0,0 +1,72 @@
+"""Common subexpression elimination benchmark.
+
+Generates sets of rules built from a few shared subexpressions,
+and reports how many tree nodes every DAG node stands for,
+with the time to evaluate the rules one by one as compiled programs
+and all at once as a `FormulaSet`.
+
+Usage:
+    python -m benchmarks.bench_cse
+"""
+
+import random
+from timeit import Timer
+
+from calc import parse
+from calc.cse import FormulaSet
+from calc.program import Program
+
+RULES = [10, 100, 1_000]
+
+SHARED = [
+    "(a + b) ** 2",
+    "(c - d) * (a + b)",
+    "[a * 2 + b * 3 - c / 4] % 7",
+    "{(a - 1) * (b + 1) - (c - 1) * (d + 1)} / 5",
+    "(b ** 2 - 4 * a * c) // 3",
+]
+
+BINDINGS = {"a": 3, "b": 5, "c": 7, "d": 11}
+
+
+def _rules(count: int, seed: int = 0) -> list:
+    # Every rule combines two shared subexpressions with a few of its own terms
+    rng = random.Random(seed)
+    return [
+        f"{rng.choice(SHARED)} + {rng.choice(SHARED)} * {rng.randint(1, 9)}"
+        f" - d * {i % 10}"
+        for i in range(count)
+    ]
+
+
+def _best(func) -> float:
+    timer = Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=3, number=number)) / number
+
+
+def main():
+    print(
+        f"{'rules':>6} {'tree nodes':>11} {'dag nodes':>10} {'ratio':>7}"
+        f" {'programs':>12} {'dag':>12} {'saved':>7}"
+    )
+    for count in RULES:
+        trees = [parse(rule).tree for rule in _rules(count)]
+        formulas = FormulaSet(trees)
+        programs = [Program(tree) for tree in trees]
+
+        def separate():
+            return [program.eval(BINDINGS) for program in programs]
+
+        assert separate() == formulas.eval(BINDINGS)
+        alone = _best(separate)
+        shared = _best(lambda: formulas.eval(BINDINGS))
+        print(
+            f"{count:>6} {formulas.tree_nodes:>11} {formulas.nodes:>10}"
+            f" {formulas.ratio:6.2f}x {alone * 1e3:9.3f} ms {shared * 1e3:9.3f} ms"
+            f" {1 - shared / alone:6.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
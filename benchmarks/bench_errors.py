@@ -0,0 +1,45 @@
+"""Error path benchmark.
+
+Times a batch of malformed and failing inputs, with the errors
+printed as before and returned as values, which never renders them.
+
+Usage:
+    python -m benchmarks.bench_errors
+"""
+
+import io
+from contextlib import redirect_stdout
+from timeit import Timer
+
+from calc import Calc
+
+INPUTS = ["1 + (2 * 3", "4 / (2 - 2)", "1 + $", "x * 2", "3 +", "1 + 2)"] * 100
+
+
+def _run(errors: str):
+    calc = Calc(prompt="> ", errors=errors)
+    for text in INPUTS:
+        calc.input = text
+        try:
+            calc.result
+        except SyntaxError as se:
+            print(se.msg)
+
+
+def _best(func) -> float:
+    timer = Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=3, number=number)) / number
+
+
+def main():
+    with redirect_stdout(io.StringIO()):
+        printed = _best(lambda: _run("print"))
+    returned = _best(lambda: _run("return"))
+    per_input = 1e6 / len(INPUTS)
+    print(f"{'print':>8} {printed * per_input:8.2f} µs/input")
+    print(f"{'return':>8} {returned * per_input:8.2f} µs/input")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Tree evaluation benchmark.
+
+Times `Tree.eval` on large trees next to the previous recursive evaluator.
+
+Usage:
+    python -m benchmarks.bench_eval
+"""
+
+import sys
+from timeit import Timer
+
+from calc import Calc
+from calc.tree import OpNode, Tree
+
+SIZES = [1_000, 10_000, 100_000]
+
+WORKLOADS = {
+    # A left-deep tree, one level per term
+    "flat": "1 + 2 * 3 ** 2 - 5 // 6 % 7 / 8 *",
+    # A right-deep tree, one level per group
+    "nested": "( 1 +",
+}
+
+
+def _recursive_eval(node: Tree):
+    if not isinstance(node, OpNode):
+        return node.eval()
+
+    if not node.right:
+        raise ArithmeticError(
+            f"missing the right-hand-side for '{node.token.value.symbol}'",
+            node.token.end - 1,
+        )
+
+    try:
+        return node.token.value.eval(
+            _recursive_eval(node.left) if node.left else None,
+            _recursive_eval(node.right),
+        )
+    except ArithmeticError as ae:
+        if len(ae.args) > 1:
+            raise
+        else:
+            raise ArithmeticError(ae.args[0], node.token.start)
+
+
+def _tree(pattern: str, size: int) -> Tree:
+    text = (pattern.split() * (size // len(pattern.split()) + 1))[:size]
+    text[-1] = "1"
+    text.extend(")" * text.count("("))
+
+    calc = Calc(input_string=" ".join(text))
+    calc._build_tree()
+    return calc._tree
+
+
+def _best(func, arg) -> float:
+    timer = Timer(lambda: func(arg))
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=3, number=number)) / number
+
+
+def main():
+    # The recursive evaluator goes a few frames deep per tree level
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 4 * max(SIZES)))
+
+    for name, pattern in WORKLOADS.items():
+        print(f"{name}: {pattern} ...")
+        print(f"{'tokens':>8} {'iterative':>12} {'recursive':>12} {'speedup':>8}")
+        for size in SIZES:
+            tree = _tree(pattern, size)
+            iterative = _best(lambda node: node.eval(), tree)
+            recursive = _best(_recursive_eval, tree)
+            print(
+                f"{size:>8} {iterative * 1e3:9.3f} ms {recursive * 1e3:9.3f} ms"
+                f" {recursive / iterative:7.2f}x"
+            )
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Incremental re-parsing benchmark.
+
+Times evaluating an edited input on the same calculator, which re-parses
+only around the edit, next to evaluating it on a new calculator,
+for a few kinds of edits of a large pasted expression.
+
+Usage:
+    python -m benchmarks.bench_incremental
+"""
+
+from timeit import Timer
+from typing import Callable, Tuple
+
+from calc import Calc
+
+# Every term is a group, as in a long formula pasted from a spreadsheet
+TERMS = 20_000
+TERM = "({i} * 3 + {i} % 7 - ({i} // 2))"
+
+BASE = " + ".join(TERM.format(i=i) for i in range(TERMS))
+MIDDLE = BASE.index(TERM.format(i=TERMS // 2))
+
+
+def _replace(text: str, start: int, end: int, new_text: str) -> str:
+    return text[:start] + new_text + text[end:]
+
+
+EDITS: dict[str, Callable[[str], str]] = {
+    "append": lambda text: text + " + 1",
+    # The same length, so the groups after the edit are reused as they are
+    "change a digit": lambda text: _replace(text, MIDDLE + 1, MIDDLE + 2, "9"),
+    # The groups after the edit are copied with their tokens shifted
+    "insert a term": lambda text: _replace(text, MIDDLE, MIDDLE, "(1 + 2) + "),
+}
+
+
+def _time(edited: str, reuse: bool) -> float:
+    texts: Tuple[str, str] = (BASE, edited)
+    calc = Calc(input_string=BASE)
+    calc.result
+    count = 0
+
+    def run():
+        nonlocal calc, count
+        count += 1
+        text = texts[count % 2]
+        if reuse:
+            calc.input = text
+        else:
+            calc = Calc(input_string=text)
+        return calc.result
+
+    number, _ = Timer(run).autorange()
+    return min(Timer(run).repeat(3, number)) / number
+
+
+def main():
+    print(f"{len(BASE):,} characters, {TERMS:,} groups")
+    print(f"{'edit':>15} {'new calc':>11} {'same calc':>11} {'speedup':>8}")
+    for name, edit in EDITS.items():
+        edited = edit(BASE)
+        assert Calc(input_string=edited).result is not None
+
+        full = _time(edited, reuse=False)
+        incremental = _time(edited, reuse=True)
+        print(
+            f"{name:>15} {full * 1e3:8.1f} ms {incremental * 1e3:8.1f} ms"
+            f" {full / incremental:7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
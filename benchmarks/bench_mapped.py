@@ -0,0 +1,74 @@
+"""Memory-mapped file evaluation benchmark.
+
+Evaluates files of one expression per line into a binary file of doubles,
+from the memory-mapped bytes, and from the lines read as `str` as before,
+reporting the time per line and the peak memory allocated.
+
+Usage:
+    python -m benchmarks.bench_mapped
+"""
+
+import math
+import os
+import tempfile
+import tracemalloc
+from array import array
+from time import perf_counter
+
+from calc.errors import CalcError
+from calc.expression import evaluate
+from calc.limits import Limits
+from calc.mapped import write_mapped
+
+SIZES = [10_000, 100_000, 300_000]
+
+LINES = ["1 + 2 * 3", "(4 - 5) // 6 % 7", "8 ** 2 / 9", "1 + (2", "3 / 0"]
+
+
+def _write_read(path: str, output):
+    # Reading the lines, in chunks of the same size as write_mapped
+    limits = Limits()
+    chunk = array("d")
+    with open(path) as lines:
+        for line in lines:
+            try:
+                value = evaluate(line, limits=limits)
+                chunk.append(math.nan if value is None else float(value))
+            except (CalcError, ValueError, OverflowError):
+                chunk.append(math.nan)
+            if len(chunk) == 65_536:
+                chunk.tofile(output)
+                del chunk[:]
+    chunk.tofile(output)
+
+
+def _measure(func, *args):
+    tracemalloc.start()
+    start = perf_counter()
+    func(*args)
+    duration = perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return duration, peak
+
+
+def main():
+    print(f"{'lines':>9} {'':>8} {'per line':>12} {'peak memory':>14}")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "expressions.txt")
+        for size in SIZES:
+            with open(path, "w") as file:
+                for i in range(size):
+                    file.write(LINES[i % len(LINES)] + "\n")
+
+            with open(os.devnull, "wb") as output:
+                for name, func in [("read", _write_read), ("mapped", write_mapped)]:
+                    duration, peak = _measure(func, path, output)
+                    print(
+                        f"{size:>9} {name:>8} {duration / size * 1e6:9.2f} µs"
+                        f" {peak / 1024:11.0f} KiB"
+                    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Memoized evaluation benchmark.
+
+Times re-evaluating a large formula after changing one variable,
+with a `MemoizedTree`, which only re-evaluates the path from that variable
+to the root, next to walking the whole tree and running the compiled program.
+
+Usage:
+    python -m benchmarks.bench_memo
+"""
+
+from timeit import Timer
+from typing import Callable, Dict
+
+from calc import Calc
+
+OPS = ["+", "-", "*", "+"]
+LEVELS = [10, 13, 16]
+
+
+def _balanced(levels: int) -> str:
+    # Every variable is at the same depth
+    terms = [f"x{i}" for i in range(2**levels)]
+    level = 0
+    while len(terms) > 1:
+        op = OPS[level % len(OPS)]
+        terms = [f"({a} {op} {b})" for a, b in zip(terms[::2], terms[1::2])]
+        level += 1
+    return terms[0]
+
+
+def _time(run: Callable[[], object]) -> float:
+    number, _ = Timer(run).autorange()
+    return min(Timer(run).repeat(3, number)) / number
+
+
+def main():
+    print(f"{'variables':>10} {'tree walk':>12} {'program':>12} {'memoized':>12}")
+    for levels in LEVELS:
+        calc = Calc(input_string=_balanced(levels))
+        bindings: Dict[str, int] = {f"x{i}": i % 7 for i in range(2**levels)}
+        program = calc.compile()
+        formula = calc.memoize(bindings)
+        formula.eval()
+        tree = calc._tree
+
+        # The variable in the middle changes before every evaluation
+        changed = f"x{2 ** levels // 2}"
+        count = 0
+
+        def change():
+            nonlocal count
+            count += 1
+            bindings[changed] = count
+
+        def walk():
+            change()
+            return tree.eval(bindings)
+
+        def run():
+            change()
+            return program.eval(bindings)
+
+        def memoized():
+            change()
+            formula.bind(**{changed: count})
+            return formula.eval()
+
+        memoized()
+        assert tree.eval(bindings) == program.eval(bindings) == formula.eval()
+        times = [_time(f) for f in (walk, run, memoized)]
+        print(f"{2 ** levels:>10} " + " ".join(f"{t * 1e6:9.1f} us" for t in times))
+
+
+if __name__ == "__main__":
+    main()
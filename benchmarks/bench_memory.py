@@ -0,0 +1,122 @@
+"""Parsed expression memory benchmark.
+
+Reports the bytes per token held by the tokens, the grouped tokens and the tree
+of a parsed input, with the `__slots__` tokens and nodes next to the equivalent
+dict-backed classes they replaced.
+
+Usage:
+    python -m benchmarks.bench_memory
+"""
+
+import tracemalloc
+
+import calc.parser
+from calc import Calc
+
+SIZES = [1_000, 100_000]
+
+PATTERN = "rate * (12 + 345) - 6.5 // [x % 7] ** 2 / "
+
+
+class _DictToken:
+    def __init__(self, value, start: int, end: int, kind=None, precedence=0):
+        self.value = value
+        self.start = start
+        self.end = end
+        self.kind = kind
+        self.precedence = precedence
+
+
+class _DictTree:
+    def __init__(self, left=None, right=None):
+        self._left = left
+        self._right = right
+
+    @property
+    def left(self):
+        return self._left
+
+    @left.setter
+    def left(self, left):
+        self._left = left
+
+    @property
+    def right(self):
+        return self._right
+
+    @right.setter
+    def right(self, right):
+        self._right = right
+
+
+class _DictNumNode(_DictTree):
+    def __init__(self, token):
+        super().__init__()
+        self.token = token
+
+
+class _DictVarNode(_DictNumNode):
+    pass
+
+
+class _DictOpNode(_DictTree):
+    def __init__(self, token, left=None, right=None):
+        super().__init__(left, right)
+        self.token = token
+
+
+class _DictGroupNode(_DictOpNode):
+    pass
+
+
+_DICT_CLASSES = {
+    "Token": _DictToken,
+    "NumNode": _DictNumNode,
+    "VarNode": _DictVarNode,
+    "OpNode": _DictOpNode,
+    "GroupNode": _DictGroupNode,
+}
+
+
+def _text(size: int) -> str:
+    tokens = PATTERN.replace("(", "( ").replace(")", " )").split()
+    repeats = size // len(tokens) + 1
+    return (PATTERN * repeats).rstrip("+-*/%([{ ")
+
+
+def _parsed_size(text: str) -> tuple:
+    parser = Calc(input_string=text)
+
+    tracemalloc.start()
+    parser._build_tree()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return size, len(parser._tokens)
+
+
+def _parsed_size_with_dicts(text: str) -> tuple:
+    originals = {name: getattr(calc.parser, name) for name in _DICT_CLASSES}
+    try:
+        for name, cls in _DICT_CLASSES.items():
+            setattr(calc.parser, name, cls)
+        return _parsed_size(text)
+    finally:
+        for name, cls in originals.items():
+            setattr(calc.parser, name, cls)
+
+
+def main():
+    print(f"{'tokens':>8} {'dicts':>14} {'slots':>14} {'saved':>6}")
+    for size in SIZES:
+        text = _text(size)
+        dicts, tokens = _parsed_size_with_dicts(text)
+        slots, _ = _parsed_size(text)
+        print(
+            f"{tokens:>8} {dicts / tokens:8.1f} B/tok {slots / tokens:8.1f} B/tok"
+            f" {1 - slots / dicts:6.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Operation dispatch benchmark.
+
+Times `Op.eval` for every operation, and the evaluation of trees
+of about 100k nodes, which dispatch one operation per inner node.
+
+Usage:
+    python -m benchmarks.bench_op
+"""
+
+from timeit import Timer
+
+from calc import Calc
+from calc.calc import _evaluate
+from calc.op import Op
+from calc.tree import Tree
+
+SIZE = 100_000
+
+WORKLOADS = {
+    # A left-deep tree, one level per term
+    "flat": "1 + 2 * 3 ** 2 - 5 // 6 % 7 / 8 *",
+    # A right-deep tree, one level per group
+    "nested": "( 1 +",
+}
+
+
+def _tree(pattern: str, size: int) -> Tree:
+    text = (pattern.split() * (size // len(pattern.split()) + 1))[:size]
+    text[-1] = "1"
+    text.extend(")" * text.count("("))
+
+    calc = Calc(input_string=" ".join(text))
+    calc._build_tree()
+    return calc._tree
+
+
+def _best(func) -> float:
+    timer = Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=5, number=number)) / number
+
+
+def main():
+    print(f"{'operation':>10} {'binary':>10} {'unary':>10}")
+    for op in Op:
+        binary = _best(lambda: op.eval(7, 3))
+        unary = (
+            f"{_best(lambda: op.eval(None, 3)) * 1e9:7.1f} ns"
+            if op in (Op.ADD, Op.SUB)
+            else ""
+        )
+        print(f"{op.symbol:>10} {binary * 1e9:7.1f} ns {unary:>10}")
+
+    print()
+    print(f"{'tree':>10} {'nodes':>10} {'Tree.eval':>12} {'Calc':>12}")
+    for name, pattern in WORKLOADS.items():
+        tree = _tree(pattern, SIZE)
+        walk = _best(tree.eval)
+        calc = _best(lambda: _evaluate(tree, {}))
+        print(f"{name:>10} {SIZE:>10} {walk * 1e3:9.2f} ms {calc * 1e3:9.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Parallel evaluation scaling benchmark.
+
+Times `calc.parallel.evaluate_all` on generated expressions with 1, 2, 4 and 8
+worker processes. The speedup is bounded by the number of CPUs available.
+
+Usage:
+    python -m benchmarks.bench_parallel
+"""
+
+import os
+import random
+import time
+
+from benchmarks.bench_cli import _expression
+from calc.parallel import evaluate_all
+
+EXPRESSIONS = 200_000
+DISTINCT = 20_000
+WORKERS = [1, 2, 4, 8]
+CHUNK_SIZE = 2_000
+
+
+def main():
+    rng = random.Random(0)
+    distinct = [_expression(rng) for _ in range(DISTINCT)]
+    expressions = [rng.choice(distinct) for _ in range(EXPRESSIONS)]
+
+    print(f"{EXPRESSIONS} expressions, {DISTINCT} distinct, {os.cpu_count()} CPUs")
+    print(f"{'workers':>8} {'time':>10} {'expr/s':>12} {'speedup':>8}")
+    baseline = None
+    for workers in WORKERS:
+        start = time.perf_counter()
+        for _ in evaluate_all(expressions, workers=workers, chunk_size=CHUNK_SIZE):
+            pass
+        elapsed = time.perf_counter() - start
+
+        baseline = baseline or elapsed
+        print(
+            f"{workers:>8} {elapsed:8.2f} s {EXPRESSIONS / elapsed:12,.0f}"
+            f" {baseline / elapsed:7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
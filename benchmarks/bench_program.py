@@ -0,0 +1,44 @@
+"""Compiled program benchmark.
+
+Times re-evaluating one expression as a compiled program
+next to walking its syntax tree.
+
+Usage:
+    python -m benchmarks.bench_program
+"""
+
+from timeit import Timer
+
+from calc import Calc
+
+SIZES = [10, 100, 1_000, 10_000, 100_000]
+
+PATTERN = "1 + 2 * 3 ** 2 - 5 // 6 % 7 / 8 * - 9 +"
+
+
+def _calc(size: int) -> Calc:
+    text = (PATTERN.split() * (size // len(PATTERN.split()) + 1))[:size]
+    text[-1] = "1"
+    return Calc(input_string=" ".join(text))
+
+
+def _best(func) -> float:
+    timer = Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=3, number=number)) / number
+
+
+def main():
+    print(f"{'tokens':>8} {'tree':>12} {'program':>12} {'speedup':>8}")
+    for size in SIZES:
+        calc = _calc(size)
+        program = calc.compile(optimize=False)
+        tree = calc._tree
+
+        walk = _best(tree.eval)
+        run = _best(program.eval)
+        print(f"{size:>8} {walk * 1e3:9.3f} ms {run * 1e3:9.3f} ms {walk / run:7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Evaluation server load test.
+
+Starts `python -m calc.server` on a free port, opens a number of connections,
+each pipelining its requests a few at a time, and reports the requests per second
+and the latency of the responses.
+
+Usage:
+    python -m benchmarks.bench_server [CONNECTIONS] [REQUESTS_PER_CONNECTION]
+"""
+
+import asyncio
+import json
+import random
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+from .bench_cli import _expression
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# The number of requests sent before waiting for their responses
+WINDOW = 16
+
+
+async def _client(host: str, port: int, requests: List[bytes]) -> List[float]:
+    reader, writer = await asyncio.open_connection(host, port)
+    latencies = []
+
+    # The requests are pipelined a window at a time, so the latency is
+    #  the one of a busy server, not of the client's own backlog
+    for i in range(0, len(requests), WINDOW):
+        window = requests[i : i + WINDOW]
+        start = time.perf_counter()
+        writer.writelines(window)
+        await writer.drain()
+        for _ in window:
+            await reader.readline()
+            latencies.append(time.perf_counter() - start)
+
+    writer.close()
+    return latencies
+
+
+async def _load(host: str, port: int, connections: int, requests: int):
+    rng = random.Random(0)
+    batches = [
+        [
+            json.dumps(
+                {"id": i, "expr": _expression(rng).replace("2", "x"), "vars": {"x": 2}}
+            ).encode()
+            + b"\n"
+            for i in range(requests)
+        ]
+        for _ in range(connections)
+    ]
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(_client(host, port, b) for b in batches))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency for result in results for latency in result)
+    print(f"{connections} connections x {requests} requests")
+    print(f"{len(latencies) / elapsed:10,.0f} requests/s")
+    print(f"latency p50: {statistics.median(latencies) * 1e3:8.2f} ms")
+    print(f"latency p99: {latencies[int(len(latencies) * 0.99)] * 1e3:8.2f} ms")
+
+
+def main():
+    connections = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    requests = int(sys.argv[2]) if len(sys.argv) > 2 else 2_000
+
+    server = subprocess.Popen(
+        [sys.executable, "-m", "calc.server", "--port", "0"],
+        cwd=ROOT,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        # listening on host:port
+        address = server.stdout.readline().split()[-1]
+        host, port = address.rsplit(":", 1)
+        asyncio.run(_load(host, int(port), connections, requests))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+"""Benchmark suite of the parsing and evaluation stages.
+
+Times every stage separately on generated workloads:
+`Calc._tokenize`, `Calc._group_tokens_by_brackets`, `_make_node`
+and `Tree.eval`. The results are written as JSON, and can be compared
+with the results of another commit, reporting the stages that got slower.
+
+Usage:
+    python -m benchmarks.bench_suite [--output FILE] [--compare BASELINE]
+        [--threshold RATIO] [--size TOKENS] [--repeat N]
+
+Examples:
+    python -m benchmarks.bench_suite --output baseline.json
+    python -m benchmarks.bench_suite --compare baseline.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+from pathlib import Path
+from timeit import Timer
+from typing import Callable, Dict, List
+
+from calc import Calc
+from calc.parser import _make_node
+
+from .bench_cli import _expression
+
+ROOT = Path(__file__).resolve().parent.parent
+
+SIZE = 100_000
+SHORT_EXPRESSIONS = 2_000
+
+BINDINGS = {"x": 3, "y": 0.5, "rate": 1.25}
+
+
+def _flat_sum(size: int) -> List[str]:
+    return [" + ".join(str(i % 1000) for i in range(size // 2))]
+
+
+def _mixed_operators(size: int) -> List[str]:
+    # Cycles through all the precedence levels and unary signs,
+    #  so the spine keeps growing and shrinking
+    pattern = "1 + 2 * 3 ** 2 - -5 // 6 % 7 / 8 ** 2 * "
+    count = size // len(pattern.split())
+    return [pattern * count + "1"]
+
+
+def _deep_nesting(size: int) -> List[str]:
+    depth = size // 4
+    return ["(1 + " * depth + "1" + ")" * depth]
+
+
+def _exponent_chain(size: int) -> List[str]:
+    # Grouped from the left, so the value stays finite
+    return ["1.5" + " ** 1.0001" * (size // 2)]
+
+
+def _short_expressions(size: int) -> List[str]:
+    rng = random.Random(0)
+    texts = []
+    for _ in range(SHORT_EXPRESSIONS):
+        text = _expression(rng)
+        texts.append(f"x * {text} + y / rate" if rng.random() < 0.5 else text)
+    return texts
+
+
+WORKLOADS: Dict[str, Callable[[int], List[str]]] = {
+    "flat sum": _flat_sum,
+    "mixed operators": _mixed_operators,
+    "deep nesting": _deep_nesting,
+    "exponent chain": _exponent_chain,
+    "short expressions": _short_expressions,
+}
+
+
+def _calcs(texts: List[str]) -> List[Calc]:
+    # The calculators are prepared up to the stage being timed
+    calcs = []
+    for text in texts:
+        calc = Calc(prompt="", input_string=text)
+        calc._tokenize()
+        calc._group_tokens_by_brackets()
+        calc._tree = _make_node(calc._grouped_tokens)
+        calcs.append(calc)
+    return calcs
+
+
+def _stages(calcs: List[Calc]) -> Dict[str, Callable[[], None]]:
+    trees = [calc._tree for calc in calcs]
+    grouped_tokens = [calc._grouped_tokens for calc in calcs]
+
+    def tokenize():
+        for calc in calcs:
+            calc._tokenize()
+
+    def group():
+        for calc in calcs:
+            calc._group_tokens_by_brackets()
+
+    def make_node():
+        for tokens in grouped_tokens:
+            _make_node(tokens)
+
+    def evaluate():
+        for tree in trees:
+            try:
+                tree.eval(BINDINGS)
+            except ArithmeticError:
+                pass
+
+    return {
+        "tokenize": tokenize,
+        "group": group,
+        "make_node": make_node,
+        "eval": evaluate,
+    }
+
+
+def _best(run: Callable[[], None], repeat: int) -> float:
+    timer = Timer(run)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def _commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(size: int = SIZE, repeat: int = 5) -> dict:
+    """Runs the whole suite.
+
+    Args:
+        size (int, optional): The approximate number of tokens
+            of the large workloads. Defaults to `SIZE`.
+        repeat (int, optional): The number of timings of every stage,
+            of which the best is kept. Defaults to 5.
+
+    Returns:
+        dict: The results, as written to the JSON output.
+    """
+    results = []
+    for workload, generate in WORKLOADS.items():
+        calcs = _calcs(generate(size))
+        tokens = sum(len(calc._tokens) for calc in calcs)
+        for stage, stage_run in _stages(calcs).items():
+            seconds = _best(stage_run, repeat)
+            results.append(
+                {
+                    "workload": workload,
+                    "stage": stage,
+                    "inputs": len(calcs),
+                    "tokens": tokens,
+                    "seconds": seconds,
+                    "ns_per_token": seconds / tokens * 1e9,
+                }
+            )
+
+    return {
+        "commit": _commit(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "size": size,
+        "results": results,
+    }
+
+
+def _key(result: dict) -> str:
+    return f"{result['workload']} / {result['stage']}"
+
+
+def _print(report: dict, baseline: dict | None, threshold: float) -> List[str]:
+    # Returns the stages that got slower than the baseline by the threshold
+    before = {_key(result): result for result in (baseline or {}).get("results", [])}
+    regressions = []
+
+    print(f"commit {report['commit'] or '-'}, Python {report['python']}")
+    header = f"{'workload / stage':<32} {'tokens':>8} {'time':>12} {'per token':>12}"
+    print(header + (f" {'ratio':>8}" if baseline else ""))
+    for result in report["results"]:
+        key = _key(result)
+        line = (
+            f"{key:<32} {result['tokens']:>8} {result['seconds'] * 1e3:9.3f} ms"
+            f" {result['ns_per_token']:9.1f} ns"
+        )
+        if key in before:
+            # Per token, so that the runs of different sizes can be compared
+            ratio = result["ns_per_token"] / before[key]["ns_per_token"]
+            line += f" {ratio:7.2f}x"
+            if ratio > threshold:
+                line += " slower"
+                regressions.append(key)
+        print(line)
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--output", help="the file to write the JSON results to")
+    parser.add_argument("--compare", help="the JSON results to compare with")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.2,
+        help="the time ratio over which a stage counts as slower (default: 1.2)",
+    )
+    parser.add_argument("--size", type=int, default=SIZE)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+
+    report = run(args.size, args.repeat)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+            file.write("\n")
+
+    regressions = _print(report, baseline, args.threshold)
+    if regressions:
+        sys.exit(f"{len(regressions)} stages got slower: {', '.join(regressions)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Tokenizer benchmark.
+
+Times `Calc._tokenize` on 1 MB inputs next to the previous tokenizer,
+which searched for one token at a time and checked the text between tokens
+with a second regular expression.
+
+Usage:
+    python -m benchmarks.bench_tokenize
+"""
+
+import re
+from string import digits
+from timeit import Timer
+
+from calc import Calc
+from calc.parser import Parser
+from calc.token import Token
+from calc.var import Var
+
+SIZE = 1 << 20
+
+WORKLOADS = {
+    "integers": "12 + 345 * 6 - 7890 // 12 % 34 ** 2 / ",
+    "reals": "1.5 + 2.25e-3 * .5 - 12.e2 / ",
+    "names": "rate * (price - discount) + tax_2 * [x - y] ** {z} / ",
+    "dense": "1+2*(3-4)**5//6%7/",
+}
+
+_search_re = re.compile(
+    r"0[box][\da-z]+"
+    r"|(?:\d+(?:\.\d*)?|\.\d+)(?:e[+\-]?\d+)?"
+    r"|[a-z_][\da-z_]*"
+    r"|\+|\-|\*{1,2}|\/{1,2}|\%"
+    r"|[\[\]\(\)\{\}]",
+    re.IGNORECASE,
+)
+_non_whitespace_re = re.compile(r"[^\s]")
+
+
+def _search_tokenize(text: str) -> list:
+    tokens = []
+
+    def _check_for_illegal_text_between(pos: int, end_pos: int):
+        gap_text = text[pos:end_pos]
+        invalid_text_match = _non_whitespace_re.search(gap_text)
+        if invalid_text_match:
+            raise SyntaxError(
+                f"unexpected text at {pos + invalid_text_match.start() + 1}: "
+                f"'{invalid_text_match[0]}'"
+            )
+
+    pos = 0
+    match = _search_re.search(text)
+    while match:
+        _check_for_illegal_text_between(pos, match.start())
+
+        match_text = match[0]
+        if match_text[0] in f".{digits}":
+            if match_text[:2].lower() in ("0b", "0o", "0x"):
+                val = int(match_text, base=0)
+            else:
+                val = float(match_text)
+                if val.is_integer():
+                    val = int(val)
+        elif match_text in Parser._sym_tokens:
+            val = Parser._sym_tokens[match_text]
+        else:
+            val = Var(match_text)
+        tokens.append(Token(val, match.start(), match.end()))
+
+        pos = match.end()
+        match = _search_re.search(text, pos)
+
+    _check_for_illegal_text_between(pos, len(text))
+    return tokens
+
+
+def _best(func) -> float:
+    return min(Timer(func).repeat(repeat=3, number=1))
+
+
+def main():
+    print(
+        f"{'workload':>10} {'tokens':>8} {'finditer':>11} {'search':>11} {'speedup':>8}"
+    )
+    for name, pattern in WORKLOADS.items():
+        text = (pattern * (SIZE // len(pattern) + 1))[:SIZE].rstrip("+-*/%([{ ")
+        text += ")" * (text.count("(") - text.count(")"))
+        calc = Calc(input_string=text)
+
+        single_pass = _best(calc._tokenize)
+        search = _best(lambda: _search_tokenize(text))
+        assert calc._tokens == _search_tokenize(text)
+
+        print(
+            f"{name:>10} {len(calc._tokens):>8} {single_pass * 1e3:8.1f} ms"
+            f" {search * 1e3:8.1f} ms {search / single_pass:7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
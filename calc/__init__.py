@@ -1 +1,3 @@
 from .calc import Calc
+from .errors import CalcError, ErrorKind, EvalError, ParseError
+from .expression import Expression, evaluate, parse
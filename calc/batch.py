@@ -0,0 +1,181 @@
+"""Vectorized evaluation over arrays of variable values.
+
+Requires NumPy, which is only imported when a batch is evaluated,
+so the scalar evaluation doesn't depend on it.
+"""
+
+from numbers import Number
+from typing import TYPE_CHECKING, List, Mapping, NamedTuple, Tuple
+
+from .errors import ErrorKind, EvalError
+from .op import Op
+from .token import Token
+from .tree import OpNode, Tree, VarNode
+
+if TYPE_CHECKING:  # pragma: no cover
+    import numpy as np
+
+
+class BatchResult(NamedTuple):
+    """The values of an expression for every row of a batch."""
+
+    values: "np.ndarray"
+    """The values, NaN where the evaluation failed."""
+    errors: "np.ndarray"
+    """The boolean mask of the rows where the evaluation failed."""
+
+
+ERROR_POLICIES = ("mask", "raise")
+
+
+Failures = List[Tuple["np.ndarray | bool", str]]
+
+
+def _apply(
+    np, op: Op, lhs: "np.ndarray | None", rhs: "np.ndarray"
+) -> Tuple["np.ndarray", Failures]:
+    """Applies an operation to whole arrays.
+
+    Returns:
+        Tuple[np.ndarray, Failures]: The result, and the rows where
+            the scalar evaluation would raise, with the message it would raise.
+    """
+    if lhs is None:
+        if op is Op.ADD:
+            return 0 + rhs, []
+        if op is Op.SUB:
+            return 0 - rhs, []
+        return np.full_like(rhs, np.nan), [
+            (True, f"missing the left-hand-side for '{op.symbol}'")
+        ]
+
+    match op:
+        case Op.ADD:
+            return lhs + rhs, []
+        case Op.SUB:
+            return lhs - rhs, []
+        case Op.MULT:
+            return lhs * rhs, []
+        case Op.DIV:
+            return lhs / rhs, [(rhs == 0, "division by zero")]
+        case Op.DIV_INT:
+            return lhs // rhs, [(rhs == 0, "integer division or modulo by zero")]
+        case Op.MOD:
+            return lhs % rhs, [(rhs == 0, "integer division or modulo by zero")]
+        case Op.EXP:
+            result = lhs**rhs
+            return result, [
+                ((lhs == 0) & (rhs < 0), "0.0 cannot be raised to a negative power"),
+                # Python gives a complex number here
+                (
+                    (lhs < 0) & (rhs != np.floor(rhs)),
+                    "negative number cannot be raised to a fractional power",
+                ),
+                (
+                    ~np.isfinite(result) & np.isfinite(lhs) & np.isfinite(rhs),
+                    "numerical result out of range",
+                ),
+            ]
+
+    raise NotImplementedError(f"unexpected operation '{op.symbol}'")
+
+
+def eval_batch(
+    tree: Tree | None,
+    columns: Mapping[str, "np.ndarray"],
+    errors: str = "mask",
+) -> BatchResult:
+    """Evaluates an expression for every row of a batch.
+
+    Walks the tree once, applying every operation to whole arrays.
+    The values are computed as 64-bit floats.
+
+    Args:
+        tree (Tree | None): The root of the tree.
+        columns (Mapping[str, np.ndarray]): The values of the variables,
+            broadcast against each other.
+        errors (str, optional): What to do with the rows that fail to evaluate:
+            "mask" marks them in the result's errors, "raise" raises the first
+            error as an `EvalError`. Defaults to "mask".
+
+    Returns:
+        BatchResult: The values and the mask of the failed rows.
+    """
+    import numpy as np
+
+    if errors not in ERROR_POLICIES:
+        raise ValueError(
+            f"unexpected error policy '{errors}', expected one of {ERROR_POLICIES}"
+        )
+
+    arrays = {
+        name: np.asarray(column, dtype=np.float64) for name, column in columns.items()
+    }
+    shape = np.broadcast_shapes(*(array.shape for array in arrays.values()))
+    failed = np.zeros(shape, dtype=bool)
+
+    def fail(
+        rows: "np.ndarray | bool",
+        message: str,
+        position: int,
+        kind: ErrorKind = ErrorKind.ARITHMETIC,
+    ):
+        if errors == "raise":
+            raise EvalError(message, position, kind)
+        np.logical_or(failed, rows, out=failed)
+
+    if tree is None:
+        return BatchResult(np.full(shape, np.nan), failed)
+
+    with np.errstate(all="ignore"):
+        # The same traversal as in OpNode.eval, but on whole arrays
+        values: List["np.ndarray | None"] = []
+        stack: List[Tree | Token[Op]] = [tree]
+
+        while stack:
+            item = stack.pop()
+
+            if type(item) is Token:
+                rhs = values.pop()
+                lhs = values.pop()
+                result, failures = _apply(np, item.value, lhs, rhs)
+                for rows, message in failures:
+                    if np.any(rows):
+                        fail(rows, message, item.start)
+                values.append(result)
+
+            elif isinstance(item, OpNode):
+                op_token = item.token
+                if not item.right:
+                    error = EvalError.missing_rhs(op_token)
+                    fail(True, error.message, error.position, error.kind)
+                    values.append(np.full(shape, np.nan))
+                    continue
+
+                stack.append(op_token)
+                stack.append(item.right)
+                if item.left:
+                    stack.append(item.left)
+                else:
+                    values.append(None)
+
+            elif isinstance(item, VarNode):
+                name = item.token.value.name
+                if name not in arrays:
+                    fail(
+                        True,
+                        f"undefined variable '{name}'",
+                        item.token.start,
+                        ErrorKind.UNDEFINED_VARIABLE,
+                    )
+                    values.append(np.full(shape, np.nan))
+                else:
+                    values.append(arrays[name])
+
+            else:
+                value: Number = item.eval()
+                values.append(np.float64(value))
+
+    result = np.broadcast_to(values.pop(), shape).astype(np.float64)
+    result[failed] = np.nan
+    return BatchResult(result, failed)
@@ -0,0 +1,94 @@
+import threading
+from collections import OrderedDict
+from typing import Generic, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class ParseCache(Generic[T]):
+    """A bounded cache of parsed inputs, with the least recently used evicted first.
+
+    A cache can be given to a single `Calc`, or shared by several of them,
+    and by any number of threads:
+
+        >>> cache = ParseCache(maxsize=256)
+        >>> first, second = Calc(cache=cache), Calc(cache=cache)
+    """
+
+    def __init__(self, maxsize: int | None = 128):
+        """Creates an empty cache.
+
+        Args:
+            maxsize (int | None, optional): The maximum number of entries,
+                or None for no limit. Defaults to 128.
+        """
+        if maxsize is not None and maxsize < 1:
+            raise ValueError(f"cache size must be positive, got {maxsize}")
+
+        self._maxsize = maxsize
+        self._entries: OrderedDict[Hashable, T] = OrderedDict()
+        # Reordering the entries isn't atomic, so every access holds the lock
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def maxsize(self) -> int | None:
+        """The maximum number of entries."""
+        return self._maxsize
+
+    def get(self, key: Hashable) -> T | None:
+        """Looks up an entry, marking it as the most recently used.
+
+        Args:
+            key (Hashable): The key of the entry.
+
+        Returns:
+            T | None: The entry, or None if it's not in the cache.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: Hashable, entry: T):
+        """Adds or replaces an entry, evicting the least recently used if full.
+
+        Args:
+            key (Hashable): The key of the entry.
+            entry (T): The entry.
+        """
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+
+            if self._maxsize is not None and len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Removes all the entries and resets the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(maxsize={self._maxsize}, size={len(self)}, "
+            f"hits={self.hits}, misses={self.misses}, evictions={self.evictions})"
+        )
+
+
+shared_cache: ParseCache = ParseCache()
+"""A cache to share between `Calc` instances."""
@@ -1,82 +1,147 @@
-import re
+from functools import wraps
 from numbers import Number
-from string import digits
-from typing import List, Tuple
-
-from .token import Token
-from .op import Bracket, Op
-from .tree import GroupNode, NumNode, OpNode, Tree
-
-AnyToken = Token[Bracket] | Token[Number] | Token[Op]
-TokenGroup = List[Token[Number] | Token[Op] | "TokenGroup"]
-
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Mapping
+
+from .batch import BatchResult, eval_batch
+from .cache import ParseCache
+from .codegen import to_python as _to_python
+from .errors import CalcError, EvalError, ParseError
+from .expression import Expression
+from .limits import Limits
+from .memo import MemoizedTree
+from .numeric import FLOAT, NumericBackend
+from .op import Bracket
+from .parser import (
+    _UNEVALUATED,
+    AnyToken,
+    Parser,
+    TokenGroup,
+    _Group,
+    _ParsedInput,
+    _shift_groups,
+)
+from .program import Program
+from .stats import Measurement, Stats
+from .tree import GroupNode, OpNode, Tree
+
+if TYPE_CHECKING:  # pragma: no cover
+    import numpy as np
+
+
+def _evaluate(
+    tree: Tree, groups: Mapping[int, _Group], backend: NumericBackend = FLOAT
+) -> Number:
+    """Evaluates a tree, reusing the values of the groups evaluated before.
+
+    The groups evaluated now have their values stored, even if the tree
+    then fails to evaluate.
+
+    Args:
+        tree (Tree): The root of the tree.
+        groups (Mapping[int, _Group]): The groups, by the `id` of their roots.
+        backend (NumericBackend, optional): The backend applying the operations.
+            Defaults to `FLOAT`.
+
+    Returns:
+        Number: The numerical value.
+    """
+    if not isinstance(tree, OpNode):
+        return tree.eval(None, backend)
+
+    # The default operations are applied without going through the backend
+    if type(backend).eval is NumericBackend.eval:
+        backend.begin()
+        backend = None
+
+    values = {
+        key: group.value
+        for key, group in groups.items()
+        if group.value is not _UNEVALUATED
+    }
+    try:
+        return tree.eval(None, backend, values)
+    finally:
+        # The groups aren't kept when a value follows one of them
+        for key, value in values.items():
+            if key in groups:
+                groups[key].value = value
 
-def _put_value(root: Tree | None, new_node: NumNode | GroupNode) -> Tree:
-    if root is None:
-        return new_node
 
-    rightmost_node = root
-    while rightmost_node.right:
-        rightmost_node = rightmost_node.right
-    rightmost_node.right = new_node
+class _Measuring:
+    """The measurements of an operation in progress."""
 
-    return root
+    __slots__ = ("durations", "parse", "failed")
 
+    def __init__(self):
+        self.durations: Dict[str, float] = {}
+        self.parse: str | None = None
+        self.failed = False
 
-def _put_op(root: Tree | None, new_node: OpNode, unary: bool = False) -> Tree:
-    if not root:
-        return new_node
 
-    # If the new operation has a higher precedence than the root
-    #  (unary operations have a higher precedence than binary,
-    #   groups have a higher precedence than any operation),
-    # then the new operation is part of the root's right-hand side
-    if (
-        # checks that root is an OpNode, but not a GroupNode
-        type(root) is OpNode
-        and (new_node.token > root.token or unary)
-    ):
-        root.right = _put_op(root.right, new_node, unary)
-        return root
-
-    # Otherwise, the entire expression
-    #  on the left of the new operation
-    #  is its left-hand side
-    new_node.left = root
-    return new_node
-
-
-def _make_node(token_group: TokenGroup) -> Tree:
-    root: Tree | None = None
-    prev_is_value = False
-
-    for item in token_group:
-        # Token[Op]
-        if isinstance(item, Token) and isinstance(item.value, Op):
-            root = _put_op(root, OpNode(item), unary=not prev_is_value)
-            prev_is_value = False
-        # Token[Number] | TokenGroup
-        else:
-            new_node = _make_node(item) if isinstance(item, list) else NumNode(item)
-            if isinstance(new_node, OpNode):
-                new_node.__class__ = GroupNode
+def _measured(operation: str):
+    # Measures the operations of the instrumented calculators,
+    #  the others only pay for the check
+    def decorator(method):
+        @wraps(method)
+        def measured(self: "Calc", *args, **kwargs):
+            if not self._instrumented or self._measuring is not None:
+                return method(self, *args, **kwargs)
+            return self._measure(operation, method, *args, **kwargs)
 
-            root = _put_value(root, new_node)
-            prev_is_value = True
+        return measured
 
-    return root
+    return decorator
 
 
 class Calc:
-    def __init__(self, prompt: str = "Type an expression: ", input_string: str = ""):
+    """An interactive calculator, keeping its current input and its value.
+
+    The parsing and the evaluation are done by a stateless `Parser`
+    and `Expression`, see `calc.expression.parse` for using them directly.
+    A `Calc` adds the prompt, the incremental parsing of the edited inputs,
+    and the measurements. It's not to be shared between threads.
+
+    The evaluation errors are printed with a caret line pointing at them,
+    unless `errors` is "raise", which raises them, or "return", which makes
+    the result the error, parse errors included, see `calc.errors`.
+    """
+
+    _error_policies = ("print", "raise", "return")
+
+    def __init__(
+        self,
+        prompt: str = "Type an expression: ",
+        input_string: str = "",
+        cache: ParseCache[_ParsedInput] | None = None,
+        backend: NumericBackend | None = None,
+        limits: Limits | None = None,
+        stats: bool = False,
+        on_measurement: Callable[[Measurement], Any] | None = None,
+        errors: str = "print",
+    ):
+        if errors not in self._error_policies:
+            raise ValueError(
+                f"errors must be one of {', '.join(self._error_policies)}, "
+                f"not {errors!r}"
+            )
         self._input = input_string
         self._tokens: List[AnyToken] = []
         self._grouped_tokens: TokenGroup = []
+        self._groups: Dict[int, _Group] = {}
         self._tree: Tree | None = None
-        self._value: Number | None = None
+        self._value: Number | CalcError | None = None
         self._is_evaluated = False
+        self._errors = errors
         self._prompt: str = prompt
         self._pl: int = len(prompt)
+        self._cache = cache
+        self._parsed: _ParsedInput | None = None
+        self._parser = Parser(backend, limits)
+        self._stats = Stats() if stats else None
+        self._on_measurement = on_measurement
+        self._instrumented = stats or on_measurement is not None
+        self._measuring: _Measuring | None = None
 
     def read_input(self):
         input_string = input(self._prompt)
@@ -115,150 +180,297 @@ class Calc:
         self._prompt = new_prompt
         self._pl = len(new_prompt)
 
-    _numbers_patterns = [
-        # 0(b|o|x)##
-        r"0[box][\da-z]+",
-        # (##[.[##]] | .##)[e[+|-]##]
-        r"(?:\d+(?:\.\d*)?|\.\d+)(?:e[+\-]?\d+)?",
-    ]
-    _ops_pattern = [
-        # one of: +, -, *[*], /[/], %
-        r"\+|\-|\*{1,2}|\/{1,2}|\%"
-    ]
-    _brackets_pattern = [
-        # one of: [, ], (, ), {, }
-        r"[\[\]\(\)\{\}]"
-    ]
-    _all_patterns = "|".join(_numbers_patterns + _ops_pattern + _brackets_pattern)
-    _tokens_re = re.compile(_all_patterns, re.IGNORECASE)
-    _non_whitespace_re = re.compile(r"[^\s]")
-    _sym_tokens = {
-        "[": Bracket.S_OPEN,
-        "(": Bracket.P_OPEN,
-        "{": Bracket.C_OPEN,
-        "]": Bracket.S_CLOSE,
-        ")": Bracket.P_CLOSE,
-        "}": Bracket.C_CLOSE,
-        "+": Op.ADD,
-        "-": Op.SUB,
-        "*": Op.MULT,
-        "/": Op.DIV,
-        "//": Op.DIV_INT,
-        "%": Op.MOD,
-        "**": Op.EXP,
-    }
-
     def _tokenize(self):
-        self._tokens = []
-
-        text = self._input
-        regexp = self._tokens_re
-
-        def _check_for_illegal_text_between(pos: int, end_pos: int):
-            gap_text = text[pos:end_pos]
-            invalid_text_match = self._non_whitespace_re.search(gap_text)
-            if invalid_text_match:
-                raise SyntaxError(
-                    (self._pl + pos + invalid_text_match.start()) * " " + "^\n"
-                    f"unexpected text at {pos + invalid_text_match.start() + 1}: "
-                    f"'{invalid_text_match[0]}'"
-                )
-
-        pos = 0
-        match = regexp.search(text)
-        while match:
-            _check_for_illegal_text_between(pos, match.start())
-
-            match_text = match[0]
-            val = None
-            if match_text[0] in f".{digits}":  # Numeric token
-                if match_text[:2].lower() in ("0b", "0o", "0x"):
-                    val = int(match_text, base=0)
-                else:
-                    val = float(match_text)
-                    if val.is_integer():
-                        val = int(val)
-            elif match_text in self._sym_tokens:
-                val = self._sym_tokens[match_text]
-            else:
-                raise NotImplementedError(
-                    (self._pl + match.start()) * " " + "^\n"
-                    f"unrecognized token at character {match.start()}: '{match_text}'"
-                )
-            self._tokens.append(Token(val, match.start(), match.end()))
-
-            pos = match.end()
-            match = regexp.search(text, pos)
-
-        _check_for_illegal_text_between(pos, len(text))
-
-    _bracket_matching = {
-        Bracket.P_CLOSE: Bracket.P_OPEN,
-        Bracket.S_CLOSE: Bracket.S_OPEN,
-        Bracket.C_CLOSE: Bracket.C_OPEN,
-    }
+        self._tokens = self._parser.tokenize(self._input)
 
-    def _group_tokens_by_brackets(self):
-        self._grouped_tokens = []
+    def _group_tokens_by_brackets(self, reusable: Dict[int, _Group] | None = None):
+        self._grouped_tokens, self._groups = self._parser.group(self._tokens, reusable)
 
-        group, bracket = self._grouped_tokens, None
+    @property
+    def backend(self) -> NumericBackend:
+        """The numeric backend, converting the literals and applying the operations."""
+        return self._parser.backend
 
-        stack: List[Tuple[TokenGroup, Token[Bracket]]] = []
-        stack.append((group, bracket))
+    @property
+    def limits(self) -> Limits | None:
+        """The resource limits, if any."""
+        return self._parser.limits
 
-        for token in self._tokens:
-            tok_val, tok_start = token.value, token.start
-            match tok_val:
-                case Op() | Number():
-                    group.append(token)
+    @property
+    def cache(self) -> ParseCache[_ParsedInput] | None:
+        """The cache of parsed inputs, if any."""
+        return self._cache
 
-                case Bracket.P_OPEN | Bracket.S_OPEN | Bracket.C_OPEN:
-                    group.append([])
-                    group, bracket = group[-1], token
-                    stack.append((group, bracket))
+    @property
+    def errors(self) -> str:
+        """What is done with the errors: "print", "raise" or "return"."""
+        return self._errors
 
-                case Bracket.P_CLOSE | Bracket.S_CLOSE | Bracket.C_CLOSE:
-                    if not bracket or self._bracket_matching[tok_val] != bracket.value:
-                        raise SyntaxError(
-                            (self._pl + tok_start) * " " + "^\n"
-                            f"unmatched '{tok_val.value}' at {tok_start}"
-                        )
+    @property
+    def stats(self) -> Stats | None:
+        """The aggregated measurements, if enabled."""
+        return self._stats
 
-                    stack.pop()
-                    group, bracket = stack[-1]
+    def _measure(self, operation: str, method: Callable, *args, **kwargs):
+        measuring = self._measuring = _Measuring()
+        start = perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        except BaseException:
+            measuring.failed = True
+            raise
+        finally:
+            total = perf_counter() - start
+            self._measuring = None
+
+            # The parse is only measured once it succeeds
+            nodes = 0
+            if measuring.parse is not None:
+                parsed = self._parsed
+                if parsed.nodes is None:
+                    parsed.nodes = sum(
+                        type(token.value) is not Bracket for token in parsed.tokens
+                    )
+                nodes = parsed.nodes
+
+            measurement = Measurement(
+                operation,
+                measuring.durations,
+                total,
+                measuring.parse,
+                len(self._tokens),
+                nodes,
+                measuring.failed,
+            )
+            if self._stats is not None:
+                self._stats.record(measurement)
+            if self._on_measurement is not None:
+                self._on_measurement(measurement)
 
-                case _:
-                    raise NotImplementedError(
-                        (self._pl + tok_start) * " " + "^\n"
-                        f"unexpected token '{tok_val}' at {tok_start}"
+    def _stage(self, stage: str, func: Callable, *args):
+        measuring = self._measuring
+        if measuring is None:
+            return func(*args)
+
+        start = perf_counter()
+        try:
+            return func(*args)
+        finally:
+            measuring.durations[stage] = perf_counter() - start
+
+    def _reparse(self, old: _ParsedInput, text: str):
+        """Parses an edited input, reusing the unchanged parts of the old one.
+
+        Only the text around the edit is tokenized again.
+        The bracket groups before and after the edit are reused along with
+        their trees and values, and the groups around the edit are built again.
+        If the edit changes the length, the groups after it are copied
+        with their tokens shifted, see `_shift_groups`.
+
+        Args:
+            old (_ParsedInput): The input before the edit.
+            text (str): The edited input.
+        """
+        parser = self._parser
+        self._tokens, i, j, k = self._stage("tokenize", parser.retokenize, old, text)
+
+        # The groups after the edit are copied with their shifted tokens
+        #  if the length changed, and otherwise only their brackets move
+        #  by the change in the number of tokens
+        reusable: Dict[int, _Group] = {}
+        after: Dict[int, _Group] = {}
+        for start, group in old.groups.items():
+            if group.end < i:
+                reusable[start] = group
+            elif start >= j:
+                after[start] = group
+
+        if len(text) != len(old.text):
+            reusable.update(_shift_groups(after, old.tokens, self._tokens, j, k))
+        else:
+            for start, group in after.items():
+                if j != k:
+                    group = _Group(
+                        group.end - j + k,
+                        group.items,
+                        group.tree,
+                        group.value,
+                        group.depth,
                     )
+                reusable[start - j + k] = group
+        self._stage("group", self._group_tokens_by_brackets, reusable)
+        self._make_tree(reusable)
 
-        if bracket:
-            raise SyntaxError(
-                (self._pl + bracket.start) * " " + "^\n"
-                f"unmatched '{bracket.value.value}' at {bracket.start}"
-            )
+    def _make_tree(self, reusable: Dict[int, _Group] | None = None):
+        self._tree, self._groups = self._stage(
+            "tree", self._parser.build, self._grouped_tokens, self._groups, reusable
+        )
 
     def _build_tree(self):
-        self._tokenize()
-        self._group_tokens_by_brackets()
-
-        self._tree = _make_node(self._grouped_tokens)
+        # Trailing whitespace doesn't affect the tokens or their positions
+        text = self._input.rstrip()
+        key = self._parser.key(text)
+        parsed = self._cache.get(key) if self._cache is not None else None
+        if parsed is None and self._parsed is not None and self._parsed.text == text:
+            parsed = self._parsed
+
+        parse = "cached"
+        if parsed is None:
+            try:
+                if self._parsed is not None:
+                    parse = "incremental"
+                    self._reparse(self._parsed, text)
+                else:
+                    parse = "full"
+                    self._stage("tokenize", self._tokenize)
+                    self._stage("group", self._group_tokens_by_brackets)
+                    self._make_tree()
+            except ParseError as pe:
+                # The parser's positions start at the input, after the prompt
+                pe.indent = self._pl
+                raise
+
+            parsed = _ParsedInput(
+                text, self._tokens, self._grouped_tokens, self._tree, self._groups
+            )
+            if self._cache is not None:
+                self._cache.put(key, parsed)
+        else:
+            self._tokens = parsed.tokens
+            self._grouped_tokens = parsed.grouped_tokens
+            self._groups = parsed.groups
+            self._tree = parsed.tree
+
+        self._parsed = parsed
+        if self._measuring is not None:
+            self._measuring.parse = parse
+
+    def _fail(self, error: CalcError):
+        if self._measuring is not None:
+            self._measuring.failed = True
+        if self._errors == "return":
+            self._value = error
+            self._is_evaluated = True
+        else:
+            error.indent = self._pl
+            print(error)
 
+    @_measured("result")
     def _eval(self):
-        self._build_tree()
+        if self._errors == "return":
+            try:
+                self._build_tree()
+            except ParseError as pe:
+                self._fail(pe)
+                return
+        else:
+            self._build_tree()
 
         if not self._tree:
             return
 
+        # The values of the groups are kept for the later edits of the input
+        groups = {
+            id(group.tree): group
+            for group in self._groups.values()
+            if type(group.tree) is GroupNode
+        }
         try:
-            self._value = self._tree.eval()
+            self._value = self._stage(
+                "eval", _evaluate, self._tree, groups, self._parser.eval_backend
+            )
             self._is_evaluated = True
-        except ArithmeticError as ae:
-            print((self._pl + ae.args[1]) * " " + "^\n" + ae.args[0])
+        except EvalError as ee:
+            if self._errors == "raise":
+                ee.indent = self._pl
+                raise
+            self._fail(ee)
 
     @property
-    def result(self):
+    def result(self) -> Number | CalcError | None:
+        """The value of the input, None if it's empty or fails to evaluate,
+        or the error if `errors` is "return"."""
         if not self._is_evaluated:
             self._eval()
         return self._value
+
+    @property
+    def expression(self) -> Expression:
+        """The current input, parsed. Unlike the calculator,
+        it can be shared between threads."""
+        self._build_tree()
+        return Expression(self._parsed, self._parser)
+
+    @_measured("compile")
+    def compile(self, optimize: bool = True) -> Program:
+        """Compiles the current input into a reusable program.
+
+        Args:
+            optimize (bool, optional): Whether to simplify the tree first,
+                see `calc.optimize.optimize`. Defaults to True.
+
+        Returns:
+            Program: The program evaluating the input.
+        """
+        self._build_tree()
+        expression = Expression(self._parsed, self._parser)
+        return expression._compiled(
+            self._parsed.programs, Program, optimize, self._stage
+        )
+
+    @_measured("to_python")
+    def to_python(self, optimize: bool = True) -> Callable:
+        """Compiles the current input into a native Python function.
+
+        Args:
+            optimize (bool, optional): Whether to simplify the tree first,
+                see `calc.optimize.optimize`. Defaults to True.
+
+        Raises:
+            ValueError: If the input is too deeply nested for the Python compiler.
+
+        Returns:
+            Callable: The function, taking the variables in the order
+                of their first use, see `calc.codegen.to_python`.
+        """
+        self._build_tree()
+        expression = Expression(self._parsed, self._parser)
+        return expression._compiled(
+            self._parsed.functions, _to_python, optimize, self._stage
+        )
+
+    @_measured("memoize")
+    def memoize(self, bindings: Mapping[str, Number] | None = None) -> MemoizedTree:
+        """Makes a tree of the current input that keeps the values of its nodes,
+        so that it's re-evaluated quickly when a variable changes.
+
+        Args:
+            bindings (Mapping[str, Number] | None, optional): The initial values
+                of the variables. Defaults to None.
+
+        Returns:
+            MemoizedTree: The memoized tree, see `calc.memo.MemoizedTree`.
+        """
+        self._build_tree()
+        return self._stage(
+            "compile", MemoizedTree, self._tree, bindings, self._parser.eval_backend
+        )
+
+    @_measured("eval_batch")
+    def eval_batch(
+        self, columns: Mapping[str, "np.ndarray"], errors: str = "mask"
+    ) -> BatchResult:
+        """Evaluates the current input for every row of a batch.
+
+        Requires NumPy.
+
+        Args:
+            columns (Mapping[str, np.ndarray]): The values of the variables.
+            errors (str, optional): "mask" or "raise", see `calc.batch.eval_batch`.
+                Defaults to "mask".
+
+        Returns:
+            BatchResult: The values and the mask of the failed rows.
+        """
+        self._build_tree()
+        return self._stage("eval", eval_batch, self._tree, columns, errors)
@@ -0,0 +1,267 @@
+"""Compilation of syntax trees into native Python functions.
+
+The tree is turned into the source of a Python function,
+with only the parentheses the precedences and the evaluation order need,
+and the source is compiled once, so evaluating it runs as CPython bytecode:
+
+    >>> function = Calc(input_string="(x + 1) * -y").to_python()
+    >>> function.variables
+    ('x', 'y')
+    >>> function(2, 4)
+    -12
+
+which runs `((x or 0) + 1) * (0 - y)`.
+"""
+
+import ast
+import keyword
+import math
+import re
+from numbers import Number
+from typing import Any, Callable, Dict, List, Set, Tuple
+
+from .errors import ErrorKind, EvalError, locate
+from .numeric import FLOAT, NumericBackend
+from .op import Op
+from .token import Token
+from .tree import NumNode, OpNode, Tree, VarNode
+
+# The CPython compiler recurses once per level of the expression
+MAX_DEPTH = 500
+
+# The binding strengths of the operations in Python,
+#  the unary signs are written as subtractions from 0
+_precedences = {
+    Op.ADD: 1,
+    Op.SUB: 1,
+    Op.MULT: 2,
+    Op.DIV: 2,
+    Op.DIV_INT: 2,
+    Op.MOD: 2,
+    Op.EXP: 4,
+}
+
+# The names the generated function uses, besides the constants
+_RESERVED = {"_eval", "_missing", "_fail", "_locate", "_begin", "ArithmeticError"}
+_constant_re = re.compile(r"_c\d+")
+
+
+def _missing(rhs: Number, message: str, position: int):
+    # Only raises once the right-hand side is evaluated, as in OpNode.eval
+    raise EvalError(message, position, ErrorKind.MISSING_OPERAND)
+
+
+def _fail(op_token: Token):
+    raise EvalError.missing_rhs(op_token)
+
+
+def _locate(offsets: Dict[int, int], error: ArithmeticError) -> ArithmeticError:
+    # Finds the operation that raised by the instruction that raised,
+    #  as the innermost frame handling the error is the generated function's
+    if isinstance(error, EvalError) and error.position is not None:
+        return error
+    position = offsets.get(error.__traceback__.tb_lasti)
+    if position is None:
+        return error
+    return locate(error, position)
+
+
+def _parameter(name: str, taken: Set[str]) -> str:
+    # The variables can be named like keywords or like the helpers
+    while (
+        keyword.iskeyword(name)
+        or name in _RESERVED
+        or name in taken
+        or _constant_re.fullmatch(name)
+    ):
+        name += "_"
+    return name
+
+
+class _Generator:
+    """Writes the source of a tree, keeping the constants and the parameters."""
+
+    def __init__(self, backend: NumericBackend):
+        self.inline = type(backend).eval is NumericBackend.eval
+        self.namespace: Dict[str, Any] = {
+            "_eval": backend.eval,
+            "_missing": _missing,
+            "_fail": _fail,
+            "_begin": backend.begin,
+        }
+        self.parameters: Dict[str, str] = {}
+        # The source positions of the operations, in pre-order
+        self.positions: List[int] = []
+
+    def _constant(self, value: Any) -> str:
+        name = f"_c{len(self.namespace)}"
+        self.namespace[name] = value
+        return name
+
+    def _number(self, value: Number) -> str:
+        # The small integers and the finite floats are written as literals
+        if (type(value) is int and value.bit_length() < 64) or (
+            type(value) is float and math.isfinite(value)
+        ):
+            text = repr(value)
+            return f"({text})" if text[0] == "-" else text
+        return self._constant(value)
+
+    def _variable(self, name: str) -> str:
+        if name not in self.parameters:
+            self.parameters[name] = _parameter(name, set(self.parameters.values()))
+        return self.parameters[name]
+
+    def write(self, tree: Tree) -> str:
+        """Writes the expression of a tree.
+
+        Raises:
+            ValueError: If the tree is deeper than `MAX_DEPTH`.
+        """
+        parts: List[str] = []
+        # The parts to write, and the subtrees to expand along with their depth
+        #  and the binding strength they need to go without parentheses
+        stack: List[str | Tuple[Tree, int, int]] = [(tree, 0, 0)]
+
+        while stack:
+            item = stack.pop()
+            if type(item) is str:
+                parts.append(item)
+                continue
+
+            node, depth, needed = item
+            if depth > MAX_DEPTH:
+                raise ValueError(
+                    f"the expression is too deeply nested to compile to Python,"
+                    f" the maximum depth is {MAX_DEPTH}"
+                )
+
+            if isinstance(node, VarNode):
+                parts.append(self._variable(node.token.value.name))
+            elif not isinstance(node, OpNode):
+                parts.append(self._number(node.eval()))
+            else:
+                stack.extend(reversed(self._expand(node, depth + 1, needed)))
+
+        return "".join(parts)
+
+    def _expand(
+        self, node: OpNode, depth: int, needed: int
+    ) -> List[str | Tuple[Tree, int, int]]:
+        # The parts of an operation, in order
+        op_token = node.token
+        op, left, right = op_token.value, node.left, node.right
+
+        if not right:
+            self.positions.append(op_token.end - 1)
+            return [f"_fail({self._constant(op_token)})"]
+
+        self.positions.append(op_token.start)
+
+        if not self.inline:
+            lhs = [(left, depth, 0)] if left else ["None"]
+            operation = self._constant(op)
+            return [f"_eval({operation}, ", *lhs, ", ", (right, depth, 0), ")"]
+
+        if not left and op not in (Op.ADD, Op.SUB):
+            message = f"missing the left-hand-side for '{op.symbol}'"
+            return ["_missing(", (right, depth, 0), f", {message!r}, {op_token.start})"]
+
+        precedence = _precedences[op]
+        # ** groups from the right, and the rest from the left
+        left_needed = precedence + (op is Op.EXP)
+        right_needed = precedence + (op is not Op.EXP)
+
+        if not left:
+            lhs = ["0"]
+        elif op in (Op.ADD, Op.SUB) and not (
+            type(left) is NumNode and left.token.value
+        ):
+            # (lhs or 0) as in OpWithPrecedence.eval, unless lhs is a known number
+            lhs = ["(", (left, depth, 0), " or 0)"]
+        else:
+            lhs = [(left, depth, left_needed)]
+        parts = [*lhs, f" {op.symbol} ", (right, depth, right_needed)]
+
+        if precedence < needed:
+            return ["(", *parts, ")"]
+        return parts
+
+
+def _numbered(source: str) -> ast.Module:
+    # Gives every operation a line of its own after the source's, in pre-order,
+    #  in which they're written, as the lines of the instructions are known
+    #  on every version, unlike their columns
+    module = ast.parse(source)
+    line = source.count("\n") + 1
+    stack: List[ast.AST] = [module]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, ast.BinOp) or (
+            isinstance(node, ast.Call)
+            and isinstance(node.func, ast.Name)
+            and node.func.id in ("_eval", "_missing", "_fail")
+        ):
+            line += 1
+            node.lineno = node.end_lineno = line
+        stack.extend(reversed(list(ast.iter_child_nodes(node))))
+    return module
+
+
+def to_python(tree: Tree | None, backend: NumericBackend = FLOAT) -> Callable:
+    """Compiles a syntax tree into a Python function.
+
+    The parameters of the function are the variables, in the order of their
+    first use, named after them, except for the names that can't be used
+    as parameters, such as keywords, which get a trailing underscore.
+    The function has the `variables` and `source` attributes.
+
+    With the default operations, they're written as Python operations,
+    including `(lhs or 0) + rhs` for the additions and the subtractions,
+    as in `OpWithPrecedence.eval`. Otherwise, they're calls to the backend.
+    The errors are positioned at their operations in the input,
+    as with the other evaluators.
+
+    Args:
+        tree (Tree | None): The root of the tree, or None for an empty input.
+        backend (NumericBackend, optional): The backend applying
+            the operations. Defaults to `FLOAT`.
+
+    Raises:
+        ValueError: If the tree is too deep for the Python compiler.
+
+    Returns:
+        Callable: The function evaluating the tree.
+    """
+    generator = _Generator(backend)
+    expression = "None" if tree is None else generator.write(tree)
+    parameters = list(generator.parameters.values())
+    begin = "" if type(backend).begin is NumericBackend.begin else "_begin()\n    "
+    source = (
+        f"def _expression({', '.join(parameters)}):\n"
+        f"    {begin}try:\n"
+        f"        return {expression}\n"
+        f"    except ArithmeticError as error:\n"
+        f"        raise _locate(error) from None\n"
+    )
+
+    namespace = generator.namespace
+    try:
+        exec(compile(_numbered(source), "<expression>", "exec"), namespace)
+    except (SyntaxError, RecursionError, MemoryError):
+        raise ValueError("the expression is too large to compile to Python") from None
+    function = namespace["_expression"]
+
+    # The instructions of every operation, by their offsets
+    first = source.count("\n") + 2
+    offsets = {
+        offset: generator.positions[line - first]
+        for start, end, line in function.__code__.co_lines()
+        if line is not None and line >= first
+        for offset in range(start, end, 2)
+    }
+    namespace["_locate"] = lambda error: _locate(offsets, error)
+
+    function.variables = tuple(generator.parameters)
+    function.source = source
+    return function
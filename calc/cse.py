@@ -0,0 +1,231 @@
+"""Common subexpression elimination across a set of formulas.
+
+The syntax trees of the formulas are hash-consed into a single DAG,
+where the structurally equal subtrees are one node, keyed by their
+operation and the nodes of their operands, or by their literal value
+or variable name. Every distinct subtree is then evaluated only once
+per set of bindings, however many formulas it appears in:
+
+    >>> formulas = FormulaSet(
+    ...     parse(text).tree for text in ["(a + b) ** 2", "1 + (a + b) ** 2"]
+    ... )
+    >>> formulas.eval({"a": 1, "b": 2})
+    [9, 10]
+    >>> formulas.tree_nodes, formulas.nodes
+    (12, 7)
+"""
+
+from decimal import Decimal
+from numbers import Number
+from typing import Dict, Hashable, Iterable, List, Mapping, Tuple
+
+from .errors import EvalError
+from .numeric import FLOAT, NumericBackend
+from .program import (
+    Program,
+    _backend_functions,
+    _binary_codes,
+    _functions,
+    _unary_codes,
+)
+from .tree import NumNode, OpNode, Tree
+
+# The index of the missing nodes
+_NONE = -1
+
+# The value of the nodes that fail to evaluate, and of the nodes above them
+_FAILED = object()
+
+ERROR_POLICIES = ("raise", "return")
+
+
+def _constant_key(value: Number) -> Hashable:
+    # Equal constants don't always evaluate the same: 1 and 1.0,
+    #  Decimal("0.5") and Decimal("0.50"), or 0.0 and -0.0
+    if isinstance(value, (float, complex, Decimal)):
+        return type(value), repr(value)
+    return type(value), value
+
+
+class FormulaSet:
+    """A set of formulas sharing their common subexpressions.
+
+    The trees themselves are left intact, and are only evaluated again
+    to raise the error of a failing formula, at its own position.
+    """
+
+    def __init__(self, trees: Iterable[Tree | None], backend: NumericBackend = FLOAT):
+        """Hash-conses the trees into a DAG.
+
+        Args:
+            trees (Iterable[Tree | None]): The roots of the trees,
+                None for the empty inputs.
+            backend (NumericBackend, optional): The backend applying
+                the operations. Defaults to `FLOAT`.
+        """
+        self._trees: List[Tree | None] = list(trees)
+        self._backend = backend
+        functions = (
+            _functions
+            if type(backend).eval is NumericBackend.eval
+            else _backend_functions(backend)
+        )
+
+        # The constants are set once, the variables and the operations
+        #  on every evaluation, always after their operands
+        self._initial: List[Number | None] = []
+        self._variables: List[Tuple[int, str]] = []
+        self._operations: List[Tuple[int, object, int, int]] = []
+        self._keys: Dict[Hashable, int] = {}
+        self._tree_nodes = 0
+
+        self._roots = [
+            _NONE if tree is None else self._add(tree, functions)
+            for tree in self._trees
+        ]
+
+    def _intern(self, key: Hashable, value: Number | None = None) -> Tuple[int, bool]:
+        index = self._keys.get(key, _NONE)
+        if index != _NONE:
+            return index, False
+        index = self._keys[key] = len(self._initial)
+        self._initial.append(value)
+        return index, True
+
+    def _add(self, tree: Tree, functions: Tuple) -> int:
+        # Post-order, so the operands have their indices before the operations.
+        # The stack holds the nodes to expand, and the expanded operations
+        indices: List[int] = []
+        stack: List[Tuple[Tree, bool]] = [(tree, False)]
+
+        while stack:
+            node, expanded = stack.pop()
+            if not expanded:
+                self._tree_nodes += 1
+
+            if isinstance(node, OpNode):
+                if not expanded:
+                    stack.append((node, True))
+                    if node.right:
+                        stack.append((node.right, False))
+                    if node.left:
+                        stack.append((node.left, False))
+                    continue
+
+                op = node.token.value
+                right = indices.pop() if node.right else _NONE
+                left = indices.pop() if node.left else _NONE
+                # The groups are the same operations as the nodes they wrap
+                index, new = self._intern((op, left, right))
+                if new:
+                    codes = _binary_codes if left != _NONE else _unary_codes
+                    # A missing right-hand side always fails
+                    function = functions[codes[op]] if right != _NONE else None
+                    self._operations.append((index, function, left, right))
+
+            elif isinstance(node, NumNode):
+                value = node.token.value
+                index, _ = self._intern(_constant_key(value), value)
+
+            else:
+                name = node.token.value.name
+                index, new = self._intern(name)
+                if new:
+                    self._variables.append((index, name))
+
+            indices.append(index)
+
+        return indices[0]
+
+    @property
+    def formulas(self) -> int:
+        """The number of formulas."""
+        return len(self._roots)
+
+    @property
+    def nodes(self) -> int:
+        """The number of distinct subtrees, evaluated once per evaluation."""
+        return len(self._initial)
+
+    @property
+    def tree_nodes(self) -> int:
+        """The number of nodes in all the trees."""
+        return self._tree_nodes
+
+    @property
+    def ratio(self) -> float:
+        """How many nodes of the trees every node of the DAG stands for."""
+        return self._tree_nodes / self.nodes if self.nodes else 1.0
+
+    def _eval_alone(
+        self, formula: int, bindings: Mapping[str, Number]
+    ) -> Number | EvalError:
+        # Evaluated on its own, the formula raises its error at its position,
+        #  unless the whole set went over a time limit the formula alone doesn't
+        try:
+            return Program(self._trees[formula], self._backend).eval(bindings)
+        except EvalError as ee:
+            return ee
+
+    def eval(
+        self, bindings: Mapping[str, Number] | None = None, errors: str = "raise"
+    ) -> List[Number | EvalError | None]:
+        """Evaluates every formula.
+
+        Args:
+            bindings (Mapping[str, Number] | None, optional): The values of the
+                variables. Defaults to None.
+            errors (str, optional): What to do with the formulas that fail
+                to evaluate: "raise" raises the error of the first one,
+                "return" returns their errors in place of their values.
+                Defaults to "raise".
+
+        Raises:
+            ValueError: If the error policy is unexpected.
+            EvalError: If a formula fails to evaluate and `errors` is "raise".
+
+        Returns:
+            List[Number | EvalError | None]: The value of every formula,
+                in order, None for the empty ones.
+        """
+        if errors not in ERROR_POLICIES:
+            raise ValueError(
+                f"unexpected error policy '{errors}', expected one of {ERROR_POLICIES}"
+            )
+
+        bindings = bindings or {}
+        self._backend.begin()
+        values = self._initial.copy()
+        for index, name in self._variables:
+            values[index] = bindings.get(name, _FAILED)
+
+        failed = _FAILED
+        for index, function, left, right in self._operations:
+            rhs = values[right] if function is not None else failed
+            if left == _NONE:
+                if rhs is failed:
+                    values[index] = failed
+                    continue
+                try:
+                    values[index] = function(rhs)
+                except ArithmeticError:
+                    values[index] = failed
+            else:
+                lhs = values[left]
+                if lhs is failed or rhs is failed:
+                    values[index] = failed
+                    continue
+                try:
+                    values[index] = function(lhs, rhs)
+                except ArithmeticError:
+                    values[index] = failed
+
+        results: List[Number | EvalError | None] = []
+        for formula, root in enumerate(self._roots):
+            value = values[root] if root != _NONE else None
+            if value is failed:
+                value = self._eval_alone(formula, bindings)
+                if errors == "raise" and isinstance(value, EvalError):
+                    raise value
+            results.append(value)
+        return results
@@ -0,0 +1,143 @@
+"""The errors of parsing and evaluating the inputs.
+
+The errors keep their message, position, token and kind as attributes,
+and only render the caret line pointing at the position when displayed,
+so the inputs failing in bulk don't pay for the formatting:
+
+    >>> calc = Calc(prompt="> ", input_string="1 + (2", errors="return")
+    >>> error = calc.result
+    >>> error.kind, error.position
+    (<ErrorKind.UNMATCHED_BRACKET: 'unmatched bracket'>, 4)
+    >>> print(error)
+          ^
+    unmatched '(' at 4
+"""
+
+from enum import Enum
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .token import Token
+
+
+class ErrorKind(Enum):
+    """What went wrong."""
+
+    # Parsing
+    UNEXPECTED_TEXT = "unexpected text"
+    INVALID_LITERAL = "invalid literal"
+    UNMATCHED_BRACKET = "unmatched bracket"
+    TOO_MANY_TOKENS = "too many tokens"
+    TOO_DEEPLY_NESTED = "too deeply nested"
+    LITERAL_TOO_LARGE = "literal too large"
+    # Evaluation
+    MISSING_OPERAND = "missing operand"
+    UNDEFINED_VARIABLE = "undefined variable"
+    RESULT_TOO_LARGE = "result too large"
+    TIME_LIMIT = "time limit exceeded"
+    ARITHMETIC = "arithmetic error"
+
+
+class CalcError(Exception):
+    """Base class of the errors with a position in the input."""
+
+    def __init__(
+        self,
+        message: str,
+        position: int | None,
+        kind: ErrorKind,
+        token: "Token | str | None" = None,
+    ):
+        super().__init__(message)
+        self.message = message
+        self.position = position
+        """The position in the input, None if not known yet."""
+        self.kind = kind
+        self.token = token
+        """The token at fault, or the illegal text, if known."""
+        self.indent = 0
+        """The length of the prompt before the input, when displayed."""
+
+    def caret(self) -> str:
+        """The caret line pointing at the position, followed by the message."""
+        if self.position is None:
+            return self.message
+        return (self.indent + self.position) * " " + "^\n" + self.message
+
+    def __str__(self) -> str:
+        return self.caret()
+
+    def __reduce__(self):
+        state = dict(self.__dict__)
+        return (
+            self.__class__,
+            (self.message, self.position, self.kind, self.token),
+            state,
+        )
+
+
+class ParseError(CalcError, SyntaxError):
+    """A malformed input, or an input over the limits."""
+
+    @property
+    def msg(self) -> str:
+        """The caret line and the message, as shown for syntax errors."""
+        return self.caret()
+
+
+class EvalError(CalcError, ArithmeticError):
+    """An input that fails to evaluate."""
+
+    def __init__(
+        self,
+        message: str,
+        position: int | None = None,
+        kind: ErrorKind = ErrorKind.ARITHMETIC,
+        token: "Token | str | None" = None,
+    ):
+        super().__init__(message, position, kind, token)
+        # As in the ArithmeticError(message, position) raised before
+        if position is not None:
+            self.args = (message, position)
+
+    @classmethod
+    def missing_rhs(cls, token: "Token") -> "EvalError":
+        """The error of an operation without its right-hand side.
+
+        Args:
+            token (Token): The token of the operation.
+
+        Returns:
+            EvalError: The error, positioned at the end of the operation.
+        """
+        return cls(
+            f"missing the right-hand-side for '{token.value.symbol}'",
+            token.end - 1,
+            ErrorKind.MISSING_OPERAND,
+            token,
+        )
+
+
+def locate(error: ArithmeticError, position: int, token: "Token | None" = None):
+    """Positions an evaluation error at the operation that raised it.
+
+    Args:
+        error (ArithmeticError): The error, either an `EvalError`
+            or an error raised by Python, such as ZeroDivisionError.
+        position (int): The position of the operation.
+        token (Token | None, optional): The token of the operation.
+            Defaults to None.
+
+    Returns:
+        EvalError: The error itself, if it already has a position,
+            or a positioned `EvalError` of the same kind.
+    """
+    if isinstance(error, EvalError):
+        if error.position is not None:
+            return error
+        return EvalError(error.message, position, error.kind, token)
+
+    # OverflowError has the error number first
+    args = error.args
+    message = args[-1] if args and isinstance(args[-1], str) else str(error)
+    return EvalError(message, position, ErrorKind.ARITHMETIC, token)
@@ -0,0 +1,261 @@
+"""Parsed expressions, evaluated without any state kept between the calls.
+
+Unlike a `Calc`, which keeps its current input, an `Expression` is never
+changed once parsed, so it can be shared by any number of threads,
+along with the `ParseCache` it came from:
+
+    >>> expression = parse("x * 2 + y")
+    >>> expression(x=3, y=4)
+    10
+    >>> evaluate("(1 + 2) * 3")
+    9
+"""
+
+from functools import lru_cache
+from numbers import Number
+from typing import TYPE_CHECKING, Callable, Dict, Mapping, Tuple
+
+from .batch import BatchResult, eval_batch
+from .cache import ParseCache
+from .codegen import to_python as _to_python
+from .limits import Limits
+from .memo import MemoizedTree
+from .numeric import NumericBackend
+from .optimize import optimize as _optimize
+from .parser import AnyToken, Parser, _ParsedInput
+from .program import Program
+from .tree import Tree
+
+if TYPE_CHECKING:  # pragma: no cover
+    import numpy as np
+
+
+def _run(stage: str, func: Callable, *args):
+    return func(*args)
+
+
+# The parsers keep no state, so one per configuration is shared by all the calls
+@lru_cache(maxsize=64)
+def _parser(backend: NumericBackend | None, limits: Limits | None) -> Parser:
+    return Parser(backend, limits)
+
+
+class Expression:
+    """A parsed expression, which can be evaluated any number of times."""
+
+    __slots__ = ("_parsed", "_parser")
+
+    def __init__(self, parsed: _ParsedInput, parser: Parser):
+        """Wraps a parsed input. Use `parse` to parse an expression.
+
+        Args:
+            parsed (_ParsedInput): The parsed input.
+            parser (Parser): The parser that parsed it.
+        """
+        self._parsed = parsed
+        self._parser = parser
+
+    @property
+    def text(self) -> str:
+        """The text of the expression, without trailing whitespace."""
+        return self._parsed.text
+
+    @property
+    def tokens(self) -> Tuple[AnyToken, ...]:
+        """The tokens."""
+        return tuple(self._parsed.tokens)
+
+    @property
+    def tree(self) -> Tree | None:
+        """The root of the syntax tree, None for an empty expression.
+        It must not be modified, as it may be shared."""
+        return self._parsed.tree
+
+    @property
+    def variables(self) -> Tuple[str, ...]:
+        """The names of the variables, in the order of their first use."""
+        return self.compile(optimize=False).variables
+
+    @property
+    def backend(self) -> NumericBackend:
+        """The numeric backend."""
+        return self._parser.backend
+
+    @property
+    def limits(self) -> Limits | None:
+        """The resource limits, if any."""
+        return self._parser.limits
+
+    def _compile_tree(self, compiler: Callable, optimize: bool):
+        tree, backend = self._parsed.tree, self._parser.eval_backend
+        if optimize:
+            tree = _optimize(tree, backend)
+        return compiler(tree, backend)
+
+    def _compiled(
+        self,
+        compiled: Dict[bool, Callable],
+        compiler: Callable,
+        optimize: bool,
+        stage: Callable = _run,
+    ):
+        # Compiled once per parsed input, by whichever thread gets there first
+        if optimize not in compiled:
+            compiled[optimize] = stage(
+                "compile", self._compile_tree, compiler, optimize
+            )
+        return compiled[optimize]
+
+    def compile(self, optimize: bool = True) -> Program:
+        """Compiles the expression into a reusable program.
+
+        Args:
+            optimize (bool, optional): Whether to simplify the tree first,
+                see `calc.optimize.optimize`. Defaults to True.
+
+        Returns:
+            Program: The program evaluating the expression.
+        """
+        return self._compiled(self._parsed.programs, Program, optimize)
+
+    def to_python(self, optimize: bool = True) -> Callable:
+        """Compiles the expression into a native Python function.
+
+        Args:
+            optimize (bool, optional): Whether to simplify the tree first,
+                see `calc.optimize.optimize`. Defaults to True.
+
+        Raises:
+            ValueError: If the expression is too deeply nested
+                for the Python compiler.
+
+        Returns:
+            Callable: The function, taking the variables in the order
+                of their first use, see `calc.codegen.to_python`.
+        """
+        return self._compiled(self._parsed.functions, _to_python, optimize)
+
+    def memoize(self, bindings: Mapping[str, Number] | None = None) -> MemoizedTree:
+        """Makes a tree of the expression that keeps the values of its nodes.
+
+        The memoized tree has its own state, so it's not to be shared.
+
+        Args:
+            bindings (Mapping[str, Number] | None, optional): The initial values
+                of the variables. Defaults to None.
+
+        Returns:
+            MemoizedTree: The memoized tree, see `calc.memo.MemoizedTree`.
+        """
+        return MemoizedTree(self._parsed.tree, bindings, self._parser.eval_backend)
+
+    def eval(self, bindings: Mapping[str, Number] | None = None) -> Number | None:
+        """Evaluates the numerical value.
+
+        Args:
+            bindings (Mapping[str, Number] | None, optional): The values of the
+                variables. Defaults to None.
+
+        Raises:
+            EvalError: If the evaluation fails, with the message
+                and the position of the failed operation.
+
+        Returns:
+            Number | None: The numerical value, or None for an empty expression.
+        """
+        return self.compile(optimize=False).eval(bindings)
+
+    def __call__(self, **bindings: Number) -> Number | None:
+        """Evaluates the numerical value with the given variable values."""
+        return self.eval(bindings)
+
+    def eval_batch(
+        self, columns: Mapping[str, "np.ndarray"], errors: str = "mask"
+    ) -> BatchResult:
+        """Evaluates the expression for every row of a batch.
+
+        Requires NumPy.
+
+        Args:
+            columns (Mapping[str, np.ndarray]): The values of the variables.
+            errors (str, optional): "mask" or "raise", see `calc.batch.eval_batch`.
+                Defaults to "mask".
+
+        Returns:
+            BatchResult: The values and the mask of the failed rows.
+        """
+        return eval_batch(self._parsed.tree, columns, errors)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.text!r})"
+
+
+def parse(
+    text: str,
+    backend: NumericBackend | None = None,
+    limits: Limits | None = None,
+    cache: ParseCache[_ParsedInput] | None = None,
+) -> Expression:
+    """Parses an expression.
+
+    Args:
+        text (str): The expression.
+        backend (NumericBackend | None, optional): The backend converting
+            the literals and applying the operations. Defaults to None,
+            for `FLOAT`.
+        limits (Limits | None, optional): The resource limits.
+            Defaults to None, for no limits.
+        cache (ParseCache[_ParsedInput] | None, optional): The cache of parsed
+            inputs, which can be shared with other threads and with the `Calc`
+            instances. Defaults to None.
+
+    Raises:
+        ParseError: If the expression is malformed or over the limits,
+            with the position of the error.
+
+    Returns:
+        Expression: The parsed expression.
+    """
+    parser = _parser(backend, limits)
+    # Trailing whitespace doesn't affect the tokens or their positions
+    text = text.rstrip()
+    if cache is None:
+        return Expression(parser.parse(text), parser)
+
+    key = parser.key(text)
+    parsed = cache.get(key)
+    if parsed is None:
+        parsed = parser.parse(text)
+        cache.put(key, parsed)
+    return Expression(parsed, parser)
+
+
+def evaluate(
+    text: str,
+    bindings: Mapping[str, Number] | None = None,
+    backend: NumericBackend | None = None,
+    limits: Limits | None = None,
+    cache: ParseCache[_ParsedInput] | None = None,
+) -> Number | None:
+    """Parses and evaluates an expression.
+
+    Args:
+        text (str): The expression.
+        bindings (Mapping[str, Number] | None, optional): The values of the
+            variables. Defaults to None.
+        backend (NumericBackend | None, optional): The backend converting
+            the literals and applying the operations. Defaults to None,
+            for `FLOAT`.
+        limits (Limits | None, optional): The resource limits.
+            Defaults to None, for no limits.
+        cache (ParseCache[_ParsedInput] | None, optional): The cache of parsed
+            inputs, see `parse`. Defaults to None.
+
+    Raises:
+        ParseError: If the expression is malformed or over the limits.
+        EvalError: If the evaluation fails.
+
+    Returns:
+        Number | None: The numerical value, or None for an empty expression.
+    """
+    return parse(text, backend, limits, cache).eval(bindings)
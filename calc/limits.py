@@ -0,0 +1,206 @@
+"""Resource limits bounding the work of a single input.
+
+Python's integers are unbounded, so an input like `9**(9**9)`
+would otherwise keep a core busy and take gigabytes of memory:
+
+    >>> calc = Calc(input_string="9**(9**9)", limits=Limits())
+    >>> calc.compile()()
+    Traceback (most recent call last):
+    ...
+    calc.errors.EvalError:  ^
+    result too large: over 65536 bits
+"""
+
+import math
+import threading
+from fractions import Fraction
+from numbers import Number
+from time import monotonic
+from typing import NamedTuple
+
+from .errors import ErrorKind, EvalError, ParseError
+from .numeric import NumericBackend
+from .op import Op
+
+
+class Limits(NamedTuple):
+    """The limits of a `Calc`. None disables a limit."""
+
+    max_bits: int | None = 1 << 16
+    """The maximum bit length of an exact result, or of the numerator
+    plus the denominator of a fraction."""
+    max_tokens: int | None = 100_000
+    """The maximum number of tokens in an input."""
+    max_depth: int | None = 1_000
+    """The maximum nesting depth of the brackets."""
+    time_budget: float | None = None
+    """The maximum duration of an evaluation, in seconds."""
+
+
+def _bits(value: Number) -> int:
+    # The size of the exact values, the other values have a fixed size
+    if type(value) is int:
+        return value.bit_length()
+    if type(value) is Fraction:
+        return value.numerator.bit_length() + value.denominator.bit_length()
+    return 0
+
+
+def _min_power_bits(value: Number, exponent: int) -> int:
+    # A lower bound of the size of value ** exponent,
+    #  as |value| >= 2 ** (bit_length - 1)
+    if type(value) is Fraction:
+        return _min_power_bits(value.numerator, exponent) + _min_power_bits(
+            value.denominator, exponent
+        )
+    return exponent * max(abs(value).bit_length() - 1, 0)
+
+
+# The bits of a digit, by the prefix of the based literals
+_digit_bits = {"b": 1, "o": 3, "x": 4}
+_decimal_digit_bits = math.log2(10)
+
+
+def _based_bits(text: str) -> int:
+    # A lower bound of the size of a based literal, such as 0x1f
+    digits = text[2:].lstrip("0")
+    if not digits:
+        return 0
+    return (len(digits) - 1) * _digit_bits[text[1].lower()] + 1
+
+
+def _decimal_bits(text: str) -> float:
+    # A lower bound of the size of a decimal literal as an exact fraction.
+    # As M * 10**E, with the m digits of M, it's at least 10**(m-1+E),
+    #  and its denominator is at least 10**(-E) / M > 10**(-E-m)
+    mantissa, _, exponent = text.lower().partition("e")
+    whole, _, fraction = mantissa.partition(".")
+    m = len((whole + fraction).lstrip("0"))
+    if m == 0:
+        return 0.0
+    e = int(exponent or 0) - len(fraction)
+    return max(m - 1 + e, -e - m, 0) * _decimal_digit_bits
+
+
+class _Deadline(threading.local):
+    # Every thread evaluates with its own deadline,
+    #  so a backend can be shared between threads
+    value: float | None = None
+
+
+class LimitedBackend(NumericBackend):
+    """Applies the operations of another backend within the limits.
+
+    The operations whose results are certain to exceed the maximum size
+    aren't applied at all. The others are applied, and their results checked,
+    so a single operation never produces much more than the maximum size.
+    The literals are checked the same way, from the size their text implies,
+    before they're converted.
+    """
+
+    def __init__(self, backend: NumericBackend, limits: Limits):
+        """Wraps a backend.
+
+        Args:
+            backend (NumericBackend): The backend applying the operations.
+            limits (Limits): The limits. Only `max_bits` and `time_budget` apply
+                here, `max_bits` to the literals too, and the others are checked
+                by the `Parser`.
+        """
+        self._backend = backend
+        self._limits = limits
+        self._deadline = _Deadline()
+
+    @property
+    def backend(self) -> NumericBackend:
+        """The backend applying the operations."""
+        return self._backend
+
+    @property
+    def limits(self) -> Limits:
+        """The limits."""
+        return self._limits
+
+    def _check_literal(self, bits: float):
+        # Raised without a position, which the parser adds
+        max_bits = self._limits.max_bits
+        if max_bits is not None and bits > max_bits:
+            raise ParseError(
+                f"literal too large: over {max_bits} bits",
+                None,
+                ErrorKind.LITERAL_TOO_LARGE,
+            )
+
+    def integer(self, text: str) -> Number:
+        # Only the exact literals grow with their digits,
+        #  the others are converted to a fixed size
+        if self._backend.exact_literals:
+            self._check_literal(_decimal_bits(text))
+        value = self._backend.integer(text)
+        self._check_literal(_bits(value))
+        return value
+
+    def real(self, text: str) -> Number:
+        if self._backend.exact_literals:
+            self._check_literal(_decimal_bits(text))
+        value = self._backend.real(text)
+        self._check_literal(_bits(value))
+        return value
+
+    def based(self, text: str) -> Number:
+        # Converted through an exact integer by every backend
+        self._check_literal(_based_bits(text))
+        value = self._backend.based(text)
+        self._check_literal(_bits(value))
+        return value
+
+    def begin(self):
+        """Starts the time budget of an evaluation, if there's one."""
+        self._backend.begin()
+        budget = self._limits.time_budget
+        self._deadline.value = None if budget is None else monotonic() + budget
+
+    def _exponent(self, lhs: Number, rhs: Number) -> int | None:
+        # The exponent of the exact powers, which may get arbitrarily large.
+        # Negative integer powers of integers are floats
+        if type(rhs) is Fraction and rhs.denominator == 1:
+            rhs = rhs.numerator
+        if type(rhs) is not int:
+            return None
+        if type(lhs) is int:
+            return rhs if rhs > 0 else None
+        if type(lhs) is Fraction:
+            return abs(rhs)
+        return None
+
+    def eval(self, op: Op, lhs: Number | None, rhs: Number) -> Number:
+        deadline = self._deadline.value
+        if deadline is not None and monotonic() > deadline:
+            raise EvalError("time limit exceeded", kind=ErrorKind.TIME_LIMIT)
+
+        max_bits = self._limits.max_bits
+        if max_bits is None:
+            return self._backend.eval(op, lhs, rhs)
+
+        # The operations certain to exceed the limit are rejected up front
+        if op is Op.EXP and lhs is not None:
+            exponent = self._exponent(lhs, rhs)
+            too_large = exponent is not None and (
+                _min_power_bits(lhs, exponent) > max_bits
+            )
+        elif op is Op.MULT and type(lhs) is int and type(rhs) is int:
+            # A product of integers has at least as many bits
+            #  as its operands together, less one
+            too_large = lhs.bit_length() + rhs.bit_length() - 1 > max_bits
+        else:
+            too_large = False
+
+        if not too_large:
+            value = self._backend.eval(op, lhs, rhs)
+            too_large = _bits(value) > max_bits
+        if too_large:
+            raise EvalError(
+                f"result too large: over {max_bits} bits",
+                kind=ErrorKind.RESULT_TOO_LARGE,
+            )
+        return value
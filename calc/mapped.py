@@ -0,0 +1,159 @@
+"""Evaluation of files of expressions, one per line, mapped into memory.
+
+The file is never read into `str` objects: it's memory-mapped,
+every line is a `memoryview` into the mapping, and it's tokenized
+in place from its bytes. The lines behind are dropped from memory
+as the evaluation goes, so the memory used doesn't grow with the file.
+
+The values are 64-bit floats, NaN for the empty lines, the failed lines
+and the lines with a complex value,
+collected into an `array` or written to a binary file:
+
+    >>> values = evaluate_mapped("expressions.txt")
+    >>> with open("values.bin", "wb") as output:
+    ...     write_mapped("expressions.txt", output)
+"""
+
+import math
+import mmap
+import os
+from array import array
+from typing import BinaryIO, Iterator
+
+from .errors import CalcError
+from .limits import Limits
+from .numeric import NumericBackend
+from .parser import Parser
+
+# How much of the mapping is read before the pages behind are dropped
+_RELEASE_BYTES = 64 << 20
+
+
+def lines(buffer: bytes | bytearray | mmap.mmap) -> Iterator[memoryview]:
+    """Splits a buffer into lines, without copying them.
+
+    The pages of a mapped file are dropped from memory once read past,
+    where the platform allows it.
+
+    Args:
+        buffer (bytes | bytearray | mmap.mmap): The buffer.
+
+    Yields:
+        memoryview: Every line, without its newline, released once
+            the next one is taken.
+    """
+    release = isinstance(buffer, mmap.mmap) and hasattr(mmap, "MADV_DONTNEED")
+    released = 0
+
+    with memoryview(buffer) as view:
+        start, end = 0, len(view)
+        while start < end:
+            stop = buffer.find(b"\n", start)
+            if stop < 0:
+                stop = end
+            with view[start:stop] as line:
+                yield line
+            start = stop + 1
+
+            if release and start - released >= _RELEASE_BYTES:
+                # Only whole pages, up to the one with the next line
+                page = start - start % mmap.PAGESIZE
+                buffer.madvise(mmap.MADV_DONTNEED, released, page - released)
+                released = page
+
+
+def _value(parser: Parser, backend: NumericBackend, line: memoryview) -> float:
+    try:
+        tree, _ = parser.build(*parser.group(parser.tokenize(line)))
+        if tree is None:
+            return math.nan
+        # Through the backend, so the limits apply
+        return float(tree.eval(None, backend))
+    # The integers too large for a float raise OverflowError,
+    #  and the complex results, or the operations on them, raise TypeError
+    except (CalcError, ArithmeticError, TypeError):
+        return math.nan
+
+
+def _values(
+    path: str | os.PathLike, backend: NumericBackend | None, limits: Limits | None
+) -> Iterator[float]:
+    parser = Parser(backend, limits)
+    eval_backend = parser.eval_backend
+
+    with open(path, "rb") as file:
+        # An empty file can't be mapped
+        if os.fstat(file.fileno()).st_size == 0:
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                mapped.madvise(mmap.MADV_SEQUENTIAL)
+            for line in lines(mapped):
+                yield _value(parser, eval_backend, line)
+
+
+def evaluate_mapped(
+    path: str | os.PathLike,
+    backend: NumericBackend | None = None,
+    limits: Limits | None = Limits(),
+) -> array:
+    """Evaluates a file of expressions, one per line.
+
+    Args:
+        path (str | os.PathLike): The path to the file, of ASCII text.
+        backend (NumericBackend | None, optional): The backend converting
+            the literals and applying the operations. Defaults to None,
+            for `FLOAT`.
+        limits (Limits | None, optional): The resource limits of every line.
+            Defaults to the default `Limits`.
+
+    Returns:
+        array: The values of the lines, as doubles, NaN for the empty lines
+            and the lines that fail to parse or to evaluate.
+    """
+    return array("d", _values(path, backend, limits))
+
+
+def write_mapped(
+    path: str | os.PathLike,
+    output: BinaryIO,
+    backend: NumericBackend | None = None,
+    limits: Limits | None = Limits(),
+    chunk_size: int = 65_536,
+) -> int:
+    """Evaluates a file of expressions, one per line, into a binary file.
+
+    Only a chunk of the values is kept in memory at a time.
+
+    Args:
+        path (str | os.PathLike): The path to the file, of ASCII text.
+        output (BinaryIO): The binary file the values are written to,
+            as doubles in the native byte order, see `evaluate_mapped`.
+        backend (NumericBackend | None, optional): The backend converting
+            the literals and applying the operations. Defaults to None,
+            for `FLOAT`.
+        limits (Limits | None, optional): The resource limits of every line.
+            Defaults to the default `Limits`.
+        chunk_size (int, optional): The number of values written at a time.
+            Defaults to 65536.
+
+    Raises:
+        ValueError: If the chunk size isn't positive.
+
+    Returns:
+        int: The number of lines, and of values written.
+    """
+    if chunk_size < 1:
+        raise ValueError(f"chunk size must be positive, got {chunk_size}")
+
+    count = 0
+    chunk = array("d")
+    for value in _values(path, backend, limits):
+        chunk.append(value)
+        if len(chunk) == chunk_size:
+            chunk.tofile(output)
+            count += chunk_size
+            del chunk[:]
+
+    chunk.tofile(output)
+    return count + len(chunk)
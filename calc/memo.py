@@ -0,0 +1,210 @@
+from numbers import Number
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Set, Tuple
+
+from .errors import EvalError, locate
+from .numeric import FLOAT, NumericBackend
+from .tree import OpNode, Tree, VarNode
+
+# The index of the missing nodes
+_NONE = -1
+
+
+class MemoizedTree:
+    """A syntax tree that keeps the value of every node between evaluations.
+
+    The nodes are stored in a side table, along with their values,
+    the indices of their parents and whether they're dirty.
+    Binding a variable or replacing a subtree marks only the paths
+    from the change back to the root as dirty, and the next evaluation
+    only evaluates the dirty nodes, so a change costs O(depth) instead of O(n):
+
+        >>> formula = Calc(input_string="x * 2 + y").memoize({"x": 3, "y": 4})
+        >>> formula.eval()
+        10
+        >>> formula.bind(y=5)
+        >>> formula.eval()
+        11
+
+    The tree itself is left intact, so it can still be shared,
+    for example with a `ParseCache`.
+    """
+
+    def __init__(
+        self,
+        tree: Tree | None,
+        bindings: Mapping[str, Number] | None = None,
+        backend: NumericBackend = FLOAT,
+    ):
+        """Makes the side table of a tree, with every node dirty.
+
+        Args:
+            tree (Tree | None): The root of the tree, or None for an empty input.
+            bindings (Mapping[str, Number] | None, optional): The values of the
+                variables. Defaults to None.
+            backend (NumericBackend, optional): The backend applying
+                the operations. Defaults to `FLOAT`.
+        """
+        self._nodes: List[Tree | None] = []
+        self._lefts: List[int] = []
+        self._rights: List[int] = []
+        self._parents: List[int] = []
+        self._values: List[Number | None] = []
+        self._dirty = bytearray()
+        # The index of every node by its id, and of every variable's nodes by name
+        self._indices: Dict[int, int] = {}
+        self._variables: Dict[str, Set[int]] = {}
+        self._bindings: Dict[str, Number] = dict(bindings or {})
+        self._backend = backend
+
+        self._root = _NONE if tree is None else self._add(tree, _NONE)
+
+    def _add(self, tree: Tree, parent: int) -> int:
+        root = len(self._nodes)
+
+        # The children are added after their parents, which then get their indices
+        stack: List[Tuple[Tree, int, List[int] | None]] = [(tree, parent, None)]
+        while stack:
+            node, parent, children = stack.pop()
+            index = len(self._nodes)
+            if children is not None:
+                children[parent] = index
+
+            self._nodes.append(node)
+            self._lefts.append(_NONE)
+            self._rights.append(_NONE)
+            self._parents.append(parent)
+            self._values.append(None)
+            self._dirty.append(True)
+            self._indices[id(node)] = index
+
+            if isinstance(node, OpNode):
+                if node.right:
+                    stack.append((node.right, index, self._rights))
+                if node.left:
+                    stack.append((node.left, index, self._lefts))
+            elif isinstance(node, VarNode):
+                self._variables.setdefault(node.token.value.name, set()).add(index)
+
+        return root
+
+    def _remove(self, root: int):
+        stack = [root]
+        while stack:
+            index = stack.pop()
+            node = self._nodes[index]
+            del self._indices[id(node)]
+            if isinstance(node, VarNode):
+                self._variables[node.token.value.name].discard(index)
+
+            # The entries of the removed nodes are left unused
+            self._nodes[index] = self._values[index] = None
+            for child in (self._lefts[index], self._rights[index]):
+                if child != _NONE:
+                    stack.append(child)
+
+    def _mark_dirty(self, index: int):
+        # The ancestors of a dirty node are already dirty
+        dirty, parents = self._dirty, self._parents
+        while index != _NONE and not dirty[index]:
+            dirty[index] = True
+            index = parents[index]
+
+    @property
+    def bindings(self) -> Mapping[str, Number]:
+        """The current values of the variables."""
+        return MappingProxyType(self._bindings)
+
+    def bind(self, **bindings: Number):
+        """Updates the values of the variables.
+
+        Marks the paths from the nodes of the changed variables as dirty.
+        """
+        for name, value in bindings.items():
+            self._bindings[name] = value
+            for index in self._variables.get(name, ()):
+                self._mark_dirty(index)
+
+    def replace(self, node: Tree, subtree: Tree):
+        """Replaces a subtree.
+
+        Only the side table changes, the tree itself is left intact.
+        Marks the path from the new subtree as dirty.
+
+        Args:
+            node (Tree): The root of the subtree to replace.
+            subtree (Tree): The new subtree.
+
+        Raises:
+            ValueError: If the node isn't in the tree.
+        """
+        index = self._indices.get(id(node), _NONE)
+        if index == _NONE:
+            raise ValueError(f"{node!r} isn't a node of the tree")
+
+        parent = self._parents[index]
+        self._remove(index)
+        new_index = self._add(subtree, parent)
+
+        if parent == _NONE:
+            self._root = new_index
+        elif self._lefts[parent] == index:
+            self._lefts[parent] = new_index
+        else:
+            self._rights[parent] = new_index
+        self._mark_dirty(parent)
+
+    def eval(self) -> Number | None:
+        """Evaluates the numerical value, reusing the values of the clean nodes.
+
+        The dirty nodes are evaluated in the same order as in `OpNode.eval`,
+        so the same error is raised first.
+
+        Returns:
+            Number | None: The numerical value, or None for an empty tree.
+        """
+        if self._root == _NONE:
+            return None
+
+        nodes, lefts, rights = self._nodes, self._lefts, self._rights
+        values, dirty = self._values, self._dirty
+        self._backend.begin()
+        apply = self._backend.eval
+        stack = [self._root]
+
+        while stack:
+            index = stack[-1]
+            if not dirty[index]:
+                stack.pop()
+                continue
+
+            node = nodes[index]
+            if isinstance(node, OpNode):
+                op_token = node.token
+                left, right = lefts[index], rights[index]
+                if right == _NONE:
+                    raise EvalError.missing_rhs(op_token)
+
+                # The dirty operands are evaluated first, the left-hand side first
+                if dirty[right] or left != _NONE and dirty[left]:
+                    stack.append(right)
+                    if left != _NONE:
+                        stack.append(left)
+                    continue
+
+                try:
+                    value = apply(
+                        op_token.value,
+                        values[left] if left != _NONE else None,
+                        values[right],
+                    )
+                except ArithmeticError as ae:
+                    raise locate(ae, op_token.start, op_token)
+            else:
+                value = node.eval(self._bindings)
+
+            values[index] = value
+            dirty[index] = False
+            stack.pop()
+
+        return values[self._root]
@@ -0,0 +1,182 @@
+"""Numeric backends: how the numbers are represented and operated on.
+
+The backend of a `Calc` converts the literals of its inputs,
+and applies the operations when its inputs are evaluated:
+
+    >>> calc = Calc(input_string="0.1 + 0.2", backend=DecimalBackend())
+    >>> calc.result
+    Decimal('0.3')
+"""
+
+import decimal
+from abc import ABC, abstractmethod
+from fractions import Fraction
+from numbers import Number
+from typing import Callable, Dict, Tuple
+
+from .op import Op
+
+
+class NumericBackend(ABC):
+    """Abstract base class for the numeric backends."""
+
+    exact_literals: bool = False
+    """Whether the decimal literals are converted exactly, into numbers
+    whose size grows with their digits and exponents, such as fractions."""
+
+    @abstractmethod
+    def integer(self, text: str) -> Number:
+        """Converts a decimal integer literal, such as `123`."""
+
+    @abstractmethod
+    def real(self, text: str) -> Number:
+        """Converts a literal with a fraction or an exponent, such as `1.5e3`."""
+
+    @abstractmethod
+    def based(self, text: str) -> Number:
+        """Converts a binary, octal or hexadecimal literal, such as `0x1f`."""
+
+    def begin(self):
+        """Called by the evaluators before every evaluation. Does nothing by default."""
+
+    def eval(self, op: Op, lhs: Number | None, rhs: Number) -> Number:
+        """Applies an operation.
+
+        Args:
+            op (Op): The operation.
+            lhs (Number | None): The left-hand side, None for the unary operations.
+            rhs (Number): The right-hand side.
+
+        Raises:
+            ArithmeticError: With the error message, but without the position.
+
+        Returns:
+            Number: The result.
+        """
+        return op.eval(lhs, rhs)
+
+
+class FloatBackend(NumericBackend):
+    """Integers where they're exact, and floats otherwise. The default."""
+
+    # Longer decimal integers may not survive the conversion to float,
+    #  which real literals go through
+    max_exact_digits = 15
+
+    def integer(self, text: str) -> Number:
+        if len(text) <= self.max_exact_digits:
+            return int(text)
+        return self.real(text)
+
+    def real(self, text: str) -> Number:
+        value = float(text)
+        return int(value) if value.is_integer() else value
+
+    def based(self, text: str) -> Number:
+        return int(text, base=0)
+
+
+class DecimalBackend(NumericBackend):
+    """Decimal floating point numbers, with a configurable precision and rounding.
+
+    The literals are converted exactly,
+    and the operations round their results according to the context.
+    """
+
+    def __init__(self, context: decimal.Context | None = None):
+        """Creates a backend.
+
+        Args:
+            context (decimal.Context | None, optional): The precision, rounding
+                and the other parameters of the operations. Defaults to None,
+                for the default context, with the precision of 28 digits.
+        """
+        self._context = context if context is not None else decimal.Context()
+        context = self._context
+        self._functions: Dict[Op, Callable[[Number, Number], decimal.Decimal]] = {
+            Op.ADD: context.add,
+            Op.SUB: context.subtract,
+            Op.MULT: context.multiply,
+            Op.DIV: context.divide,
+            Op.DIV_INT: lambda lhs, rhs: self._divmod(lhs, rhs)[0],
+            Op.MOD: lambda lhs, rhs: self._divmod(lhs, rhs)[1],
+            Op.EXP: context.power,
+        }
+
+    @property
+    def context(self) -> decimal.Context:
+        """The context of the operations."""
+        return self._context
+
+    def integer(self, text: str) -> decimal.Decimal:
+        return decimal.Decimal(text)
+
+    def real(self, text: str) -> decimal.Decimal:
+        return decimal.Decimal(text)
+
+    def based(self, text: str) -> decimal.Decimal:
+        return decimal.Decimal(int(text, base=0))
+
+    def _divmod(
+        self, lhs: Number, rhs: Number
+    ) -> Tuple[decimal.Decimal, decimal.Decimal]:
+        # The context rounds the quotient towards zero,
+        #  and the other backends towards minus infinity
+        context = self._context
+        quotient, remainder = context.divmod(lhs, rhs)
+        if remainder and (remainder < 0) != (rhs < 0):
+            quotient = context.subtract(quotient, 1)
+            remainder = context.add(remainder, rhs)
+        return quotient, remainder
+
+    def eval(self, op: Op, lhs: Number | None, rhs: Number) -> Number:
+        if lhs is None and op not in (Op.ADD, Op.SUB):
+            return op.eval(lhs, rhs)
+
+        # The signals trapped by the context are raised as exceptions,
+        #  whose messages are replaced with the ones of the other backends
+        try:
+            # Where the context gives an invalid operation or an infinity,
+            #  such as for 1 % 0 or 0 ** -1, the other backends divide by zero
+            if (not rhs and op in (Op.DIV, Op.DIV_INT, Op.MOD)) or (
+                op is Op.EXP and not lhs and rhs < 0
+            ):
+                raise ZeroDivisionError()
+            # And 0 ** 0 is 1
+            if op is Op.EXP and not lhs and not rhs:
+                return decimal.Decimal(1)
+            return self._functions[op](lhs or 0, rhs)
+        except ZeroDivisionError:
+            raise ArithmeticError("division by zero") from None
+        except (decimal.Overflow, decimal.Underflow):
+            raise ArithmeticError("numerical result out of range") from None
+        except decimal.DecimalException:
+            raise ArithmeticError("invalid operation") from None
+
+
+class FractionBackend(NumericBackend):
+    """Exact rational numbers.
+
+    Raising to a fractional power gives a float, as the result is irrational.
+    """
+
+    exact_literals = True
+
+    def integer(self, text: str) -> Fraction:
+        return Fraction(text)
+
+    def real(self, text: str) -> Fraction:
+        return Fraction(text)
+
+    def based(self, text: str) -> Fraction:
+        return Fraction(int(text, base=0))
+
+    def eval(self, op: Op, lhs: Number | None, rhs: Number) -> Number:
+        try:
+            return op.eval(lhs, rhs)
+        except ZeroDivisionError:
+            raise ArithmeticError("division by zero") from None
+
+
+FLOAT = FloatBackend()
+"""The default backend."""
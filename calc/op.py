@@ -1,6 +1,52 @@
+import operator
 from enum import Enum
+from functools import partial
 from numbers import Number
 from types import NotImplementedType
+from typing import Callable, Dict
+
+from .errors import ErrorKind, EvalError
+
+
+def _add(lhs: Number, rhs: Number) -> Number:
+    # A falsy left-hand side, such as 0.0, is taken as the integer 0
+    return (lhs or 0) + rhs
+
+
+def _sub(lhs: Number, rhs: Number) -> Number:
+    return (lhs or 0) - rhs
+
+
+_binary_functions: Dict[str, Callable[[Number, Number], Number]] = {
+    "+": _add,
+    "-": _sub,
+    "*": operator.mul,
+    "/": operator.truediv,
+    "//": operator.floordiv,
+    "%": operator.mod,
+    "**": operator.pow,
+}
+_unary_functions: Dict[str, Callable[[Number], Number]] = {
+    "+": partial(operator.add, 0),
+    "-": partial(operator.sub, 0),
+}
+
+
+def _missing_lhs(symbol: str) -> Callable[[Number], Number]:
+    def unary(rhs: Number) -> Number:
+        raise EvalError(
+            f"missing the left-hand-side for '{symbol}'",
+            kind=ErrorKind.MISSING_OPERAND,
+        )
+
+    return unary
+
+
+def _unexpected(symbol: str) -> Callable[[Number, Number], Number]:
+    def binary(lhs: Number, rhs: Number) -> Number:
+        raise NotImplementedError(f"unexpected operation '{symbol}'")
+
+    return binary
 
 
 class OpWithPrecedence(Enum):
@@ -13,28 +59,20 @@ class OpWithPrecedence(Enum):
 
         self.symbol: str = symbol
         self.precedence: int = precedence
+        # Resolved once, so evaluating is a single call
+        self.binary: Callable[[Number, Number], Number] = _binary_functions.get(
+            symbol
+        ) or _unexpected(symbol)
+        """Applies the operation to both operands."""
+        self.unary: Callable[[Number], Number] = _unary_functions.get(
+            symbol
+        ) or _missing_lhs(symbol)
+        """Applies the operation to the right-hand side alone."""
 
     def eval(self, lhs: Number | None = None, rhs: Number = 0) -> Number:
-        if self.symbol not in "+-" and lhs is None:
-            raise ArithmeticError(f"missing the left-hand-side for '{self.symbol}'")
-
-        match self.symbol:
-            case "+":
-                return (lhs or 0) + rhs
-            case "-":
-                return (lhs or 0) - rhs
-            case "*":
-                return lhs * rhs
-            case "/":
-                return lhs / rhs
-            case "//":
-                return lhs // rhs
-            case "%":
-                return lhs % rhs
-            case "**":
-                return lhs**rhs
-
-        raise NotImplementedError(f"unexpected operation '{self.symbol}'")
+        if lhs is None:
+            return self.unary(rhs)
+        return self.binary(lhs, rhs)
 
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}.{self.name}"
@@ -0,0 +1,100 @@
+from typing import List, Tuple
+
+from .numeric import FLOAT, NumericBackend
+from .op import Op
+from .token import Token
+from .tree import NumNode, OpNode, Tree
+
+
+def _is_int(node: Tree | None, value: int) -> bool:
+    # Only exact integers, so that the identities don't change the result's type
+    return (
+        type(node) is NumNode
+        and type(node.token.value) is int
+        and node.token.value == value
+    )
+
+
+def _simplify(
+    node: OpNode, lhs: Tree | None, rhs: Tree, backend: NumericBackend
+) -> Tree:
+    op = node.token.value
+
+    # Constant subtrees are folded, unless evaluating them raises,
+    #  in which case they're kept to raise at evaluation time.
+    # Not only ArithmeticError, such as the TypeError of `(-8) ** 0.5 // 1`
+    if (lhs is None or type(lhs) is NumNode) and type(rhs) is NumNode:
+        try:
+            value = backend.eval(op, lhs.token.value if lhs else None, rhs.token.value)
+        except Exception:
+            pass
+        else:
+            start = lhs.token.start if lhs else node.token.start
+            return NumNode(Token(value, start, rhs.token.end))
+
+    # x*1 => x, 1*x => x, x**1 => x.
+    # Not the additive ones, such as x+0 or --x: the sums treat a zero
+    #  left-hand side as the integer 0, so -0.0 or Decimal("0.00") would change
+    if lhs is not None:
+        if op is Op.MULT and _is_int(lhs, 1):
+            return rhs
+        if (op is Op.MULT and _is_int(rhs, 1)) or (op is Op.EXP and _is_int(rhs, 1)):
+            return lhs
+
+    if lhs is node.left and rhs is node.right:
+        return node
+    return node.__class__(node.token, lhs, rhs)
+
+
+def optimize(tree: Tree | None, backend: NumericBackend = FLOAT) -> Tree | None:
+    """Simplifies a syntax tree without changing its value.
+
+    Folds the constant subtrees into numbers, and drops the multiplications
+    and powers with no effect, such as `x*1` or `x**1`.
+    The subtrees that raise an error when evaluated are kept,
+    so the errors are still raised at evaluation time, at the same positions.
+
+    The tree itself is left intact, with the unchanged subtrees shared
+    between it and the result.
+
+    Args:
+        tree (Tree | None): The root of the tree.
+        backend (NumericBackend, optional): The backend folding the constants.
+            Defaults to `FLOAT`.
+
+    Returns:
+        Tree | None: The root of the simplified tree.
+    """
+    if tree is None:
+        return None
+
+    backend.begin()
+
+    # Post-order traversal with an explicit stack, as in OpNode.eval.
+    # The operations are pushed again once their operands are expanded
+    results: List[Tree | None] = []
+    stack: List[Tree | Tuple[OpNode]] = [tree]
+
+    while stack:
+        item = stack.pop()
+
+        if type(item) is tuple:
+            (node,) = item
+            rhs = results.pop()
+            lhs = results.pop()
+            results.append(_simplify(node, lhs, rhs, backend))
+
+        elif isinstance(item, OpNode) and item.right:
+            stack.append((item,))
+            stack.append(item.right)
+            if item.left:
+                stack.append(item.left)
+            else:
+                results.append(None)
+
+        else:
+            # Leaves, and the operations missing their right-hand side,
+            #  which raise before evaluating anything below them
+            results.append(item)
+
+    return results.pop()
@@ -0,0 +1,95 @@
+"""Evaluation of many independent expressions over a pool of processes."""
+
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Deque, Iterable, Iterator, List
+
+from .cache import ParseCache
+from .expression import evaluate
+from .limits import Limits
+from .records import Outcome, try_call
+
+# Every worker process has its own parse cache,
+#  which is reused across the chunks it gets
+_worker_cache: ParseCache | None = None
+_worker_limits: Limits | None = None
+
+
+def _init_worker(cache_size: int | None, limits: Limits | None):
+    global _worker_cache, _worker_limits
+    _worker_cache, _worker_limits = ParseCache(cache_size), limits
+
+
+def _evaluate_chunk(chunk: List[str]) -> List[Outcome]:
+    limits, cache = _worker_limits, _worker_cache
+    return [try_call(evaluate, text, None, None, limits, cache) for text in chunk]
+
+
+def _chunks(expressions: Iterable[str], chunk_size: int) -> Iterator[List[str]]:
+    expressions = iter(expressions)
+    chunk = list(islice(expressions, chunk_size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(expressions, chunk_size))
+
+
+def evaluate_all(
+    expressions: Iterable[str],
+    workers: int | None = None,
+    chunk_size: int = 1_000,
+    cache_size: int | None = 1_024,
+    limits: Limits | None = Limits(),
+) -> Iterator[Outcome]:
+    """Evaluates independent expressions in parallel.
+
+    The expressions are split into chunks, which are evaluated by a pool
+    of worker processes. Only a few chunks per worker are in flight at a time,
+    so the expressions can come from an arbitrarily long iterable.
+
+    Args:
+        expressions (Iterable[str]): The expressions.
+        workers (int | None, optional): The number of worker processes.
+            Defaults to None, for the number of CPUs.
+        chunk_size (int, optional): The number of expressions sent to a worker
+            at a time. Defaults to 1000.
+        cache_size (int | None, optional): The size of every worker's parse cache,
+            see `ParseCache`. Defaults to 1024.
+        limits (Limits | None, optional): The resource limits of every expression.
+            Defaults to the default `Limits`.
+
+    Yields:
+        Outcome: The outcome of every expression, in the input order.
+    """
+    if chunk_size < 1:
+        raise ValueError(f"chunk size must be positive, got {chunk_size}")
+
+    workers = workers or os.cpu_count() or 1
+    max_pending = 2 * workers
+
+    with ProcessPoolExecutor(
+        workers, initializer=_init_worker, initargs=(cache_size, limits)
+    ) as executor:
+        pending: Deque[Future] = deque()
+        for chunk in _chunks(expressions, chunk_size):
+            pending.append(executor.submit(_evaluate_chunk, chunk))
+            if len(pending) >= max_pending:
+                yield from pending.popleft().result()
+
+        while pending:
+            yield from pending.popleft().result()
+
+
+def evaluate_file(path: str | os.PathLike, **kwargs) -> Iterator[Outcome]:
+    """Evaluates a file of expressions, one per line, in parallel.
+
+    Args:
+        path (str | os.PathLike): The path to the file.
+        **kwargs: The options of `evaluate_all`.
+
+    Yields:
+        Outcome: The outcome of every line, in order.
+    """
+    with open(path) as lines:
+        yield from evaluate_all((line.rstrip("\n") for line in lines), **kwargs)
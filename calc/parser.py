@@ -0,0 +1,762 @@
+"""Parsing of the inputs into syntax trees.
+
+A `Parser` keeps only its configuration, the backend converting the literals
+and the limits, and returns everything it makes, so a single parser
+can be shared by any number of threads:
+
+    >>> parser = Parser()
+    >>> parsed = parser.parse("(x + 1) * 2")
+    >>> parsed.tree.eval({"x": 2})
+    6
+
+The errors are raised as `ParseError`, with their positions in the input.
+"""
+
+import math
+import re
+from bisect import bisect_left
+from itertools import islice
+from numbers import Number
+from operator import attrgetter
+from typing import Callable, Dict, Hashable, Iterator, List, Tuple
+
+from .errors import ErrorKind, ParseError
+from .limits import LimitedBackend, Limits
+from .numeric import FLOAT, NumericBackend
+from .op import Bracket, Op
+from .program import Program
+from .token import CLOSE_BRACKET, NUMBER, OP, OPEN_BRACKET, VAR, Token, classify
+from .tree import GroupNode, NumNode, OpNode, Tree, VarNode
+from .var import Var
+
+AnyToken = Token[Bracket] | Token[Number] | Token[Op] | Token[Var]
+TokenGroupItem = Token[Number] | Token[Op] | Token[Var] | "TokenGroup"
+TokenGroup = List[TokenGroupItem]
+# The binary inputs, tokenized in place, their positions count bytes
+Buffer = bytes | bytearray | memoryview
+
+
+# Every node on the right spine of the tree being built
+#  is stored together with the highest precedence
+#  that blocks a new operation on the way down to it
+SpineEntry = Tuple[Tree, float]
+
+# Values and groups stop the descent of any operation
+_VALUE_PRECEDENCE = math.inf
+
+
+def _push_spine(spine: List[SpineEntry], node: Tree):
+    precedence = node.token.precedence if type(node) is OpNode else _VALUE_PRECEDENCE
+    if spine and spine[-1][1] > precedence:
+        precedence = spine[-1][1]
+    spine.append((node, precedence))
+
+
+def _put_value(spine: List[SpineEntry], new_node: NumNode | VarNode | GroupNode):
+    if spine:
+        # A value that directly follows another value
+        #  goes to the bottom of that value's own right spine
+        rightmost_node = spine[-1][0].right
+        while rightmost_node:
+            _push_spine(spine, rightmost_node)
+            rightmost_node = rightmost_node.right
+
+        spine[-1][0].right = new_node
+    _push_spine(spine, new_node)
+
+
+def _put_op(spine: List[SpineEntry], new_node: OpNode, unary: bool = False):
+    # The new operation descends the spine
+    #  while it has a higher precedence than the nodes it passes
+    #  (unary operations have a higher precedence than binary,
+    #   groups have a higher precedence than any operation),
+    # and stops at the topmost node that blocks it.
+    # Since the blocking precedences are accumulated down the spine,
+    #  that node is found by going up from the bottom,
+    #  and everything passed on the way up ends up in the new operation's
+    #  left-hand side, so each node is passed at most once
+    blocking = _VALUE_PRECEDENCE if unary else new_node.token.precedence
+
+    while len(spine) > 1 and spine[-2][1] >= blocking:
+        spine.pop()
+
+    if spine and spine[-1][1] >= blocking:
+        # The entire expression below the blocking node
+        #  is the new operation's left-hand side
+        new_node.left = spine.pop()[0]
+
+    if spine:
+        spine[-1][0].right = new_node
+    _push_spine(spine, new_node)
+
+
+class _SharedSubtreeChanged(Exception):
+    """Raised when building a tree would modify the subtree of a group.
+
+    A value that directly follows another value is put into that value's subtree,
+    which then can't be shared with other trees.
+    """
+
+
+def _make_node(
+    token_group: TokenGroup, subtrees: Dict[int, Tree | None] | None = None
+) -> Tree:
+    """Builds the tree of a group of tokens.
+
+    Args:
+        token_group (TokenGroup): The tokens, with the nested groups as lists.
+        subtrees (Dict[int, Tree | None] | None, optional): The trees of
+            the nested groups, by the `id` of the group. The groups found there
+            aren't built again, and the trees of the other groups are added.
+            Defaults to None.
+
+    Raises:
+        _SharedSubtreeChanged: If the subtrees are given, but two values follow
+            each other.
+
+    Returns:
+        Tree: The root of the tree.
+    """
+    # The enclosing groups are kept on an explicit stack instead of recursing,
+    #  so the nesting depth isn't limited by the interpreter's recursion limit
+    outer_groups: List[
+        Tuple[TokenGroup, Iterator[TokenGroupItem], List[SpineEntry]]
+    ] = []
+    group, items, spine = token_group, iter(token_group), []
+    prev_is_value = False
+
+    while True:
+        for item in items:
+            # TokenGroup
+            if type(item) is list:
+                if prev_is_value and subtrees is not None:
+                    raise _SharedSubtreeChanged()
+                if subtrees is not None and id(item) in subtrees:
+                    subtree = subtrees[id(item)]
+                    if subtree is not None:
+                        _put_value(spine, subtree)
+                    prev_is_value = True
+                    continue
+
+                outer_groups.append((group, items, spine))
+                group, items, spine = item, iter(item), []
+                prev_is_value = False
+                break
+            # Token[Op]
+            elif item.kind == OP:
+                _put_op(spine, OpNode(item), unary=not prev_is_value)
+                prev_is_value = False
+            # Token[Var]
+            elif item.kind == VAR:
+                if prev_is_value and subtrees is not None:
+                    raise _SharedSubtreeChanged()
+                _put_value(spine, VarNode(item))
+                prev_is_value = True
+            # Token[Number]
+            else:
+                if prev_is_value and subtrees is not None:
+                    raise _SharedSubtreeChanged()
+                _put_value(spine, NumNode(item))
+                prev_is_value = True
+
+        # The current group is complete
+        else:
+            root = spine[0][0] if spine else None
+            if not outer_groups:
+                return root
+
+            if isinstance(root, OpNode):
+                root.__class__ = GroupNode
+            if subtrees is not None:
+                subtrees[id(group)] = root
+
+            group, items, spine = outer_groups.pop()
+            # An empty group still counts as a value, but adds no node
+            if root is not None:
+                _put_value(spine, root)
+            prev_is_value = True
+
+
+# The value of a group that hasn't been evaluated yet
+_UNEVALUATED = object()
+
+
+class _Group:
+    """A bracket group of a parsed input.
+
+    Kept by the opening bracket's index in the tokens,
+    so that an edited input can reuse the groups its edit doesn't touch.
+    """
+
+    __slots__ = ("end", "items", "tree", "value", "depth")
+
+    def __init__(
+        self,
+        end: int,
+        items: TokenGroup,
+        tree: Tree | None = None,
+        value: Number | object = _UNEVALUATED,
+        depth: int = 1,
+    ):
+        self.end = end
+        """The index of the closing bracket in the tokens."""
+        self.items = items
+        self.tree = tree
+        self.value = value
+        self.depth = depth
+        """The nesting depth of its brackets, 1 without nested groups."""
+
+
+def _shift_tree(root: Tree, tokens: Dict[int, Token], groups: Dict[int, Tree]) -> Tree:
+    # Copies the nodes of a tree with the shifted tokens, from the top down,
+    #  with the copies of the nested groups' trees put in as they are
+    root_copy = type(root)(tokens[id(root.token)])
+    stack: List[Tuple[Tree, Tree]] = [(root, root_copy)]
+    while stack:
+        node, copy = stack.pop()
+        left, right = node._left, node._right
+        if left is not None:
+            left_copy = groups.get(id(left))
+            if left_copy is None:
+                left_copy = type(left)(tokens[id(left.token)])
+                stack.append((left, left_copy))
+            copy._left = left_copy
+        if right is not None:
+            right_copy = groups.get(id(right))
+            if right_copy is None:
+                right_copy = type(right)(tokens[id(right.token)])
+                stack.append((right, right_copy))
+            copy._right = right_copy
+
+    return root_copy
+
+
+def _shift_groups(
+    groups: Dict[int, _Group],
+    old_tokens: List[AnyToken],
+    tokens: List[AnyToken],
+    j: int,
+    k: int,
+) -> Dict[int, _Group]:
+    """Copies the groups after an edit that changed the length of the input.
+
+    The copies have the shifted tokens of `Parser.retokenize`, in their items
+    and their trees, and keep the values, which don't depend on the positions.
+
+    Args:
+        groups (Dict[int, _Group]): The groups starting at or after the old
+            token j, by the index of the opening bracket.
+        old_tokens (List[AnyToken]): The tokens before the edit.
+        tokens (List[AnyToken]): The tokens after the edit, where the old
+            tokens [j:] are shifted to the new tokens [k:].
+        j (int): The index of the first old token after the edit.
+        k (int): The index of the first new token after the edit.
+
+    Returns:
+        Dict[int, _Group]: The copies, by the new index of the opening bracket.
+    """
+    shifted = {
+        id(old): new
+        for old, new in zip(islice(old_tokens, j, None), islice(tokens, k, None))
+    }
+    lists: Dict[int, TokenGroup] = {}
+    trees: Dict[int, Tree] = {}
+
+    copies: Dict[int, _Group] = {}
+    # The nested groups close first, so they're copied before the groups
+    #  around them, which then reuse their copies
+    for start, group in sorted(groups.items(), key=lambda item: item[1].end):
+        items = [
+            lists[id(item)] if type(item) is list else shifted[id(item)]
+            for item in group.items
+        ]
+        lists[id(group.items)] = items
+        tree = None
+        if group.tree is not None:
+            tree = trees[id(group.tree)] = _shift_tree(group.tree, shifted, trees)
+        copies[start - j + k] = _Group(
+            group.end - j + k, items, tree, group.value, group.depth
+        )
+    return copies
+
+
+def _common_prefix_length(a: str, b: str) -> int:
+    # A binary search comparing whole slices, which is faster
+    #  than comparing the characters one at a time
+    low, high = 0, min(len(a), len(b))
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[:middle] == b[:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def _common_suffix_length(a: str, b: str, limit: int) -> int:
+    low, high = 0, limit
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[len(a) - middle :] == b[len(b) - middle :]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+_start = attrgetter("start")
+_end = attrgetter("end")
+
+
+class _ParsedInput:
+    """The parsing results for an input, as stored in a `ParseCache`."""
+
+    def __init__(
+        self,
+        text: str,
+        tokens: List[AnyToken],
+        grouped_tokens: TokenGroup,
+        tree: Tree,
+        groups: Dict[int, _Group],
+    ):
+        self.text = text
+        self.tokens = tokens
+        self.grouped_tokens = grouped_tokens
+        self.tree = tree
+        # Keyed by the index of the opening bracket
+        self.groups = groups
+        # Keyed by whether the tree was optimized
+        self.programs: Dict[bool, Program] = {}
+        self.functions: Dict[bool, Callable] = {}
+        # Counted when first measured
+        self.nodes: int | None = None
+
+
+class Parser:
+    """Parses the inputs, without keeping any state between them."""
+
+    def __init__(
+        self, backend: NumericBackend | None = None, limits: Limits | None = None
+    ):
+        """Configures the parser.
+
+        Args:
+            backend (NumericBackend | None, optional): The backend converting
+                the literals. Defaults to None, for `FLOAT`.
+            limits (Limits | None, optional): The resource limits.
+                Defaults to None, for no limits.
+        """
+        self._backend = backend or FLOAT
+        self._limits = limits
+        # The operations are applied within the limits
+        self._eval_backend = (
+            LimitedBackend(self._backend, limits) if limits else self._backend
+        )
+
+    @property
+    def backend(self) -> NumericBackend:
+        """The numeric backend, converting the literals and applying the operations."""
+        return self._backend
+
+    @property
+    def limits(self) -> Limits | None:
+        """The resource limits, if any."""
+        return self._limits
+
+    @property
+    def eval_backend(self) -> NumericBackend:
+        """The backend applying the operations within the limits."""
+        return self._eval_backend
+
+    def key(self, text: str) -> Hashable:
+        """The key of an input in a `ParseCache`.
+
+        The literals are converted by the backend,
+        and the inputs over the limits aren't parsed,
+        so the inputs parsed with other backends or limits have other keys.
+        """
+        if self._backend is FLOAT and self._limits is None:
+            return text
+        return (self._backend, self._limits, text)
+
+    _numbers_patterns = [
+        # 0(b|o|x)##
+        r"(?P<based>0[box][\da-z]+)",
+        # ## (a decimal integer, unless followed by a fraction or an exponent)
+        r"(?P<integer>\d+)(?![.\de])",
+        # (##[.[##]] | .##)[e[+|-]##]
+        r"(?P<real>(?:\d+(?:\.\d*)?|\.\d+)(?:e[+\-]?\d+)?)",
+    ]
+    _names_pattern = [
+        # (letter | _)[letters | digits | _]
+        r"(?P<name>[a-z_][\da-z_]*)"
+    ]
+    _ops_pattern = [
+        # one of: +, -, *[*], /[/], %
+        r"(?P<op>\+|\-|\*{1,2}|\/{1,2}|\%)"
+    ]
+    _brackets_pattern = [
+        # one of: [, ], (, ), {, }
+        r"(?P<bracket>[\[\]\(\)\{\}])"
+    ]
+    _gaps_pattern = [
+        r"(?P<space>\s+)",
+        # anything else is illegal
+        r"(?P<illegal>.)",
+    ]
+    _all_patterns = "|".join(
+        _numbers_patterns
+        + _names_pattern
+        + _ops_pattern
+        + _brackets_pattern
+        + _gaps_pattern
+    )
+    _tokens_re = re.compile(_all_patterns, re.IGNORECASE | re.DOTALL)
+    # The same tokens in bytes, such as the lines of a memory-mapped file
+    _bytes_tokens_re = re.compile(_all_patterns.encode(), re.IGNORECASE | re.DOTALL)
+    _sym_tokens = {
+        "[": Bracket.S_OPEN,
+        "(": Bracket.P_OPEN,
+        "{": Bracket.C_OPEN,
+        "]": Bracket.S_CLOSE,
+        ")": Bracket.P_CLOSE,
+        "}": Bracket.C_CLOSE,
+        "+": Op.ADD,
+        "-": Op.SUB,
+        "*": Op.MULT,
+        "/": Op.DIV,
+        "//": Op.DIV_INT,
+        "%": Op.MOD,
+        "**": Op.EXP,
+    }
+    _sym_kinds = {symbol: classify(value) for symbol, value in _sym_tokens.items()}
+    # The patterns look at most this many characters past the end of a match,
+    #  for example "1e+" only becomes a single number once a digit follows
+    _max_lookahead = 3
+
+    def _scan(self, text: str | Buffer, pos: int = 0) -> Iterator[AnyToken]:
+        sym_tokens, sym_kinds = self._sym_tokens, self._sym_kinds
+        # Within the limits, so the literals too large aren't even built
+        backend = self._eval_backend
+        integer, real, based = backend.integer, backend.real, backend.based
+        binary = type(text) is not str
+        tokens_re = self._bytes_tokens_re if binary else self._tokens_re
+
+        # Every character of the input is matched by exactly one of the groups,
+        #  so a single pass finds the tokens and the illegal text between them.
+        # A match only depends on the text from where it starts,
+        #  so the scan can start at the boundary of any earlier match
+        for match in tokens_re.finditer(text, pos):
+            kind = match.lastgroup
+
+            if kind == "space":
+                continue
+
+            match_text = match[kind]
+            if binary:
+                # Only the illegal text can be outside of ASCII
+                match_text = match_text.decode("latin-1")
+            token_kind, precedence = NUMBER, 0
+            try:
+                if kind == "op" or kind == "bracket":
+                    val = sym_tokens[match_text]
+                    token_kind, precedence = sym_kinds[match_text]
+                elif kind == "integer":
+                    val = integer(match_text)
+                elif kind == "real":
+                    val = real(match_text)
+                elif kind == "name":
+                    val = Var(match_text)
+                    token_kind = VAR
+                elif kind == "based":
+                    val = based(match_text)
+                else:
+                    pos = match.start()
+                    raise ParseError(
+                        f"unexpected text at {pos + 1}: '{match_text}'",
+                        pos,
+                        ErrorKind.UNEXPECTED_TEXT,
+                        match_text,
+                    )
+            except ParseError as pe:
+                # The literals over the limits are rejected by the backend,
+                #  which doesn't know where they are
+                if pe.position is not None:
+                    raise
+                raise ParseError(
+                    pe.message, match.start(), pe.kind, match_text
+                ) from None
+            except ValueError:
+                # Such as 0b2, with a digit out of the range of its base
+                raise ParseError(
+                    f"invalid literal '{match_text}'",
+                    match.start(),
+                    ErrorKind.INVALID_LITERAL,
+                    match_text,
+                ) from None
+
+            yield Token(val, match.start(), match.end(), token_kind, precedence)
+
+    def tokenize(self, text: str | Buffer) -> List[AnyToken]:
+        """Splits an input into tokens.
+
+        Args:
+            text (str | Buffer): The input, or its ASCII bytes.
+
+        Raises:
+            ParseError: If the input has illegal text or an invalid literal.
+
+        Returns:
+            List[AnyToken]: The tokens, with only one over the maximum number
+                of tokens, if there are more.
+        """
+        # One token over the limit is enough to reject the input
+        max_tokens = self._limits.max_tokens if self._limits else None
+        tokens = self._scan(text)
+        if max_tokens is not None:
+            tokens = islice(tokens, max_tokens + 1)
+        return list(tokens)
+
+    def retokenize(
+        self, old: _ParsedInput, text: str
+    ) -> Tuple[List[AnyToken], int, int, int]:
+        """Tokenizes an edited input, scanning only around the edit.
+
+        The tokens before the edit are kept, and the tokens after it
+        are shifted by the change in the length.
+
+        Args:
+            old (_ParsedInput): The input before the edit.
+            text (str): The edited input.
+
+        Raises:
+            ParseError: If the input has illegal text or an invalid literal.
+
+        Returns:
+            Tuple[List[AnyToken], int, int, int]: The new tokens, up to one
+                over the maximum number of tokens in the scanned ones,
+                and the indices i, j and k, such that
+                the old tokens [i:j] are replaced with the new tokens [i:k],
+                and the old tokens [j:] are shifted to the new tokens [k:].
+        """
+        old_text, old_tokens = old.text, old.tokens
+        prefix = _common_prefix_length(old_text, text)
+        suffix = _common_suffix_length(
+            old_text, text, min(len(old_text), len(text)) - prefix
+        )
+        shift = len(text) - len(old_text)
+        edit_end = len(text) - suffix
+
+        # The tokens ending right before the edit may have looked into it
+        i = bisect_left(old_tokens, prefix - self._max_lookahead + 1, key=_end)
+        # The first token that may follow the edit unchanged
+        j = bisect_left(old_tokens, edit_end - shift, key=_start)
+
+        max_tokens = self._limits.max_tokens if self._limits else None
+        tokens = old_tokens[:i]
+        pos = old_tokens[i - 1].end if i else 0
+        for token in self._scan(text, pos):
+            # Once a token starts where an old token started after the edit,
+            #  the rest of the text is scanned as before
+            if token.start >= edit_end:
+                old_start = token.start - shift
+                while j < len(old_tokens) and old_tokens[j].start < old_start:
+                    j += 1
+                if j < len(old_tokens) and old_tokens[j].start == old_start:
+                    break
+            tokens.append(token)
+            # One token over the limit is enough to reject the input,
+            #  and the text after it isn't scanned, as in tokenize
+            if max_tokens is not None and len(tokens) > max_tokens:
+                j = len(old_tokens)
+                break
+        else:
+            j = len(old_tokens)
+
+        k = len(tokens)
+        if shift:
+            tokens.extend(
+                Token(
+                    token.value,
+                    token.start + shift,
+                    token.end + shift,
+                    token.kind,
+                    token.precedence,
+                )
+                for token in islice(old_tokens, j, None)
+            )
+        else:
+            tokens += old_tokens[j:]
+
+        return tokens, i, j, k
+
+    _bracket_matching = {
+        Bracket.P_CLOSE: Bracket.P_OPEN,
+        Bracket.S_CLOSE: Bracket.S_OPEN,
+        Bracket.C_CLOSE: Bracket.C_OPEN,
+    }
+
+    def group(
+        self, tokens: List[AnyToken], reusable: Dict[int, _Group] | None = None
+    ) -> Tuple[TokenGroup, Dict[int, _Group]]:
+        """Groups the tokens by the brackets.
+
+        Args:
+            tokens (List[AnyToken]): The tokens.
+            reusable (Dict[int, _Group] | None, optional): The groups known
+                from before, by the index of the opening bracket.
+                They're added to the groups as they are, without going through
+                their tokens, unless they'd be nested too deeply, which is then
+                raised as for the other groups. Defaults to None.
+
+        Raises:
+            ParseError: If the brackets are unmatched, or the tokens
+                are over the limits.
+
+        Returns:
+            Tuple[TokenGroup, Dict[int, _Group]]: The tokens,
+                with the nested groups as lists, and the groups,
+                by the index of the opening bracket.
+        """
+        grouped_tokens: TokenGroup = []
+        groups: Dict[int, _Group] = {}
+
+        max_tokens, max_depth = None, math.inf
+        if self._limits:
+            max_tokens = self._limits.max_tokens
+            if self._limits.max_depth is not None:
+                max_depth = self._limits.max_depth
+
+        if max_tokens is not None and len(tokens) > max_tokens:
+            start = tokens[max_tokens].start
+            raise ParseError(
+                f"too many tokens at {start}, the maximum is {max_tokens}",
+                start,
+                ErrorKind.TOO_MANY_TOKENS,
+                tokens[max_tokens],
+            )
+
+        group, bracket, index = grouped_tokens, None, None
+
+        stack: List[Tuple[TokenGroup, Token[Bracket], int]] = []
+        stack.append((group, bracket, index))
+        # The nesting depths of the groups closed in every open group
+        depths = [0]
+
+        enumerated = enumerate(tokens)
+        for token_index, token in enumerated:
+            kind = token.kind
+            # The values and the operations
+            if kind <= OP:
+                group.append(token)
+                continue
+
+            tok_val, tok_start = token.value, token.start
+            if kind == OPEN_BRACKET:
+                known = reusable.get(token_index) if reusable else None
+                if known is not None and len(stack) + known.depth - 1 <= max_depth:
+                    group.append(known.items)
+                    depths[-1] = max(depths[-1], known.depth)
+                    # Skips the group, up to and including its closing bracket
+                    skipped = known.end - token_index
+                    next(islice(enumerated, skipped, skipped), None)
+                    continue
+
+                # The groups too deep to reuse go through their tokens,
+                #  so the error is at the same bracket as without reusing them
+                if len(stack) > max_depth:
+                    raise ParseError(
+                        f"too deeply nested '{tok_val.value}' at {tok_start}, "
+                        f"the maximum depth is {max_depth}",
+                        tok_start,
+                        ErrorKind.TOO_DEEPLY_NESTED,
+                        token,
+                    )
+                group.append([])
+                group, bracket, index = group[-1], token, token_index
+                stack.append((group, bracket, index))
+                depths.append(0)
+
+            elif kind == CLOSE_BRACKET:
+                if not bracket or self._bracket_matching[tok_val] != bracket.value:
+                    raise ParseError(
+                        f"unmatched '{tok_val.value}' at {tok_start}",
+                        tok_start,
+                        ErrorKind.UNMATCHED_BRACKET,
+                        token,
+                    )
+
+                stack.pop()
+                depth = depths.pop() + 1
+                depths[-1] = max(depths[-1], depth)
+                groups[index] = _Group(token_index, group, depth=depth)
+                group, bracket, index = stack[-1]
+
+            else:
+                raise NotImplementedError(
+                    f"unexpected token '{tok_val}' at {tok_start}"
+                )
+
+        if bracket:
+            raise ParseError(
+                f"unmatched '{bracket.value.value}' at {bracket.start}",
+                bracket.start,
+                ErrorKind.UNMATCHED_BRACKET,
+                bracket,
+            )
+
+        if reusable:
+            groups.update(reusable)
+
+        return grouped_tokens, groups
+
+    def build(
+        self,
+        grouped_tokens: TokenGroup,
+        groups: Dict[int, _Group],
+        reusable: Dict[int, _Group] | None = None,
+    ) -> Tuple[Tree | None, Dict[int, _Group]]:
+        """Builds the tree of the grouped tokens.
+
+        Args:
+            grouped_tokens (TokenGroup): The grouped tokens.
+            groups (Dict[int, _Group]): Their groups, by the index
+                of the opening bracket. The trees of the groups
+                that aren't reused are set.
+            reusable (Dict[int, _Group] | None, optional): The groups
+                whose trees are reused, see `group`. Defaults to None.
+
+        Returns:
+            Tuple[Tree | None, Dict[int, _Group]]: The root of the tree,
+                and the groups, with none of them if the tree can't share
+                the trees of its groups.
+        """
+        reusable = reusable or {}
+        subtrees = {id(group.items): group.tree for group in reusable.values()}
+        try:
+            tree = _make_node(grouped_tokens, subtrees)
+        except _SharedSubtreeChanged:
+            # Nothing is shared with the malformed inputs
+            return _make_node(grouped_tokens), {}
+
+        for start, group in groups.items():
+            if start not in reusable:
+                group.tree = subtrees[id(group.items)]
+        return tree, groups
+
+    def parse(self, text: str) -> _ParsedInput:
+        """Parses an input.
+
+        Args:
+            text (str): The input, without trailing whitespace.
+
+        Raises:
+            ParseError: If the input is malformed or over the limits.
+
+        Returns:
+            _ParsedInput: The tokens, the groups and the tree of the input.
+        """
+        tokens = self.tokenize(text)
+        grouped_tokens, groups = self.group(tokens)
+        tree, groups = self.build(grouped_tokens, groups)
+        return _ParsedInput(text, tokens, grouped_tokens, tree, groups)
@@ -0,0 +1,195 @@
+from array import array
+from functools import lru_cache
+from numbers import Number
+from typing import Callable, Dict, List, Mapping, Tuple
+
+from .errors import ErrorKind, EvalError, locate
+from .numeric import FLOAT, NumericBackend
+from .op import Op
+from .tree import OpNode, Tree, VarNode
+
+# Instruction codes.
+# Every instruction has a single integer argument:
+#  the index of the constant for _PUSH, and of the operation's token for _FAIL,
+#  the index of the variable for _LOAD,
+#  and the source position of the operation for the rest
+_PUSH = 0
+_LOAD = 1
+_FAIL = 2
+_BINARY_BASE = 3
+_UNARY_BASE = _BINARY_BASE + len(Op)
+
+
+# Marks the variables missing from the bindings
+_unbound = object()
+
+_binary_codes = {op: _BINARY_BASE + i for i, op in enumerate(Op)}
+_unary_codes = {op: _UNARY_BASE + i for i, op in enumerate(Op)}
+
+# Indexed by the instruction code, the functions the operations are bound to
+_functions: Tuple[Callable | None, ...] = (
+    (None, None, None) + tuple(op.binary for op in Op) + tuple(op.unary for op in Op)
+)
+
+
+# Shared by the programs compiled for the same backend, such as the lines
+#  of a file, which would otherwise spend most of their time building them
+@lru_cache(maxsize=32)
+def _backend_functions(backend: NumericBackend) -> Tuple[Callable | None, ...]:
+    # The same layout as _functions, going through the backend
+    def binary(op: Op) -> Callable[[Number, Number], Number]:
+        return lambda lhs, rhs: backend.eval(op, lhs, rhs)
+
+    def unary(op: Op) -> Callable[[Number], Number]:
+        return lambda rhs: backend.eval(op, None, rhs)
+
+    return (
+        (None, None, None)
+        + tuple(binary(op) for op in Op)
+        + tuple(unary(op) for op in Op)
+    )
+
+
+class Program:
+    """A syntax tree lowered to a flat postfix program.
+
+    The operations are stored as instruction codes in an array,
+    and the numbers they operate on are stored in a separate constant pool,
+    so evaluating the program is a single loop over the instructions.
+
+    The variables are looked up once per evaluation,
+    so a program can be evaluated many times with different bindings:
+
+        >>> program = Calc(input_string="x * 2 + y").compile()
+        >>> program(x=3, y=4)
+        10
+    """
+
+    def __init__(self, tree: Tree | None, backend: NumericBackend = FLOAT):
+        """Compiles a syntax tree.
+
+        Args:
+            tree (Tree | None): The root of the tree, or None for an empty input.
+            backend (NumericBackend, optional): The backend applying
+                the operations. Defaults to `FLOAT`.
+        """
+        self._codes = array("B")
+        self._args = array("q")
+        self._constants: List[Number | Tuple[str, int]] = []
+        # The names of the variables, and their first positions in the input
+        self._names: List[str] = []
+        self._name_positions: List[int] = []
+        self._slots: Dict[str, int] = {}
+        self._backend = backend
+        # The backends with the default operations share the prepared functions
+        self._functions = (
+            _functions
+            if type(backend).eval is NumericBackend.eval
+            else _backend_functions(backend)
+        )
+
+        if tree is not None:
+            self._compile(tree)
+
+    def _emit(self, code: int, arg: int):
+        self._codes.append(code)
+        self._args.append(arg)
+
+    def _emit_constant(self, code: int, constant: Number | Tuple[str, int]):
+        self._emit(code, len(self._constants))
+        self._constants.append(constant)
+
+    def _compile(self, tree: Tree):
+        # The same traversal as in OpNode.eval,
+        #  emitting the instructions instead of executing them.
+        # The pending operations are stored as (code, position) pairs
+        stack: List[Tree | Tuple[int, int]] = [tree]
+
+        while stack:
+            item = stack.pop()
+
+            if type(item) is tuple:
+                self._emit(*item)
+
+            elif isinstance(item, OpNode):
+                op_token = item.token
+                if not item.right:
+                    # Everything after this instruction is unreachable
+                    self._emit_constant(_FAIL, op_token)
+                    return
+
+                codes = _binary_codes if item.left else _unary_codes
+                stack.append((codes[op_token.value], op_token.start))
+                stack.append(item.right)
+                if item.left:
+                    stack.append(item.left)
+
+            elif isinstance(item, VarNode):
+                self._emit(_LOAD, self._slot(item.token.value.name, item.token.start))
+
+            else:
+                self._emit_constant(_PUSH, item.eval())
+
+    def _slot(self, name: str, position: int) -> int:
+        if name not in self._slots:
+            self._slots[name] = len(self._names)
+            self._names.append(name)
+            self._name_positions.append(position)
+
+        return self._slots[name]
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    @property
+    def variables(self) -> Tuple[str, ...]:
+        """The names of the variables, in the order of their first use."""
+        return tuple(self._names)
+
+    def __call__(self, **bindings: Number) -> Number | None:
+        """Evaluates the numerical value with the given variable values."""
+        return self.eval(bindings)
+
+    def eval(self, bindings: Mapping[str, Number] | None = None) -> Number | None:
+        """Evaluates the numerical value.
+
+        Args:
+            bindings (Mapping[str, Number] | None, optional): The values of the
+                variables. Defaults to None.
+
+        Returns:
+            Number | None: The numerical value, or None for an empty program.
+        """
+        self._backend.begin()
+        functions, constants = self._functions, self._constants
+        push_code, unary_base, binary_base = _PUSH, _UNARY_BASE, _BINARY_BASE
+        load_code, unbound = _LOAD, _unbound
+        values = [(bindings or {}).get(name, unbound) for name in self._names]
+        stack: List[Number] = []
+        push, pop = stack.append, stack.pop
+
+        arg = -1
+        try:
+            for code, arg in zip(self._codes, self._args):
+                if code == push_code:
+                    push(constants[arg])
+                elif code >= unary_base:
+                    stack[-1] = functions[code](stack[-1])
+                elif code >= binary_base:
+                    rhs = pop()
+                    stack[-1] = functions[code](stack[-1], rhs)
+                elif code == load_code:
+                    value = values[arg]
+                    if value is unbound:
+                        raise EvalError(
+                            f"undefined variable '{self._names[arg]}'",
+                            self._name_positions[arg],
+                            ErrorKind.UNDEFINED_VARIABLE,
+                        )
+                    push(value)
+                else:
+                    raise EvalError.missing_rhs(constants[arg])
+        except ArithmeticError as ae:
+            raise locate(ae, arg)
+
+        return stack[-1] if stack else None
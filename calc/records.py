@@ -0,0 +1,122 @@
+"""The outcomes of evaluating expressions, and their text and JSON forms.
+
+Shared by the batch command line, the evaluation server
+and the parallel evaluation.
+"""
+
+import math
+import sys
+from decimal import Decimal
+from numbers import Number
+from typing import Any, Callable, Dict, Mapping, NamedTuple
+
+from .calc import Calc
+from .errors import CalcError
+
+
+class Outcome(NamedTuple):
+    """The result of evaluating one expression."""
+
+    value: Number | None
+    """The value, or None if the expression is empty or failed to evaluate."""
+    error: str | None = None
+    """The error message, if the expression failed to evaluate."""
+    position: int | None = None
+    """The position of the error in the expression, if known."""
+
+
+def try_call(func: Callable[..., Number | None], *args) -> Outcome:
+    """Calls an evaluation, returning the errors instead of raising them.
+
+    Args:
+        func (Callable[..., Number | None]): The evaluation,
+            such as `calc.expression.evaluate`, parsing without a prompt.
+        *args: Its arguments.
+
+    Returns:
+        Outcome: The value or the error.
+    """
+    try:
+        return Outcome(func(*args))
+    except CalcError as ce:
+        # Never displayed here, so the caret line is never rendered
+        return Outcome(None, ce.message, ce.position)
+    except TypeError as error:
+        # Such as an operation on a complex result
+        return Outcome(None, str(error))
+
+
+def format_value(value: Number) -> str:
+    """Formats a value as text, even an integer past Python's limit
+    on the digits of the integers converted to text.
+
+    Args:
+        value (Number): The value.
+
+    Returns:
+        str: The text of the value.
+    """
+    try:
+        return str(value)
+    except ValueError:
+        # Only the integers and the fractions have the limit,
+        #  which the conversion to Decimal doesn't go through
+        numerator = str(Decimal(value.numerator))
+        if value.denominator == 1:
+            return numerator
+        return f"{numerator}/{Decimal(value.denominator)}"
+
+
+def _json_value(value: Number | None) -> Any:
+    # The numbers JSON can hold, and the text of the others
+    if value is None:
+        return None
+    if type(value) is float:
+        # Without the Infinity and NaN of json.dumps, which aren't JSON
+        return value if math.isfinite(value) else format_value(value)
+    if type(value) is int:
+        # Only the integers surely within Python's limit on their digits,
+        #  as json.dumps converts them to text too
+        limit = sys.get_int_max_str_digits()
+        if not limit or value.bit_length() < (limit - 1) * math.log2(10):
+            return value
+    return format_value(value)
+
+
+def json_record(outcome: Outcome) -> Dict[str, Any]:
+    """Converts an outcome into a JSON object.
+
+    The values JSON can't hold as numbers, such as the infinities, the
+    Decimals, the complex numbers or the integers past Python's limit
+    on their digits,
+    are strings, see `format_value`.
+
+    Args:
+        outcome (Outcome): The outcome.
+
+    Returns:
+        Dict[str, Any]: Either `{"result": value}`, with None for an empty
+            expression, or `{"error": message, "position": position}`.
+    """
+    value, error, position = outcome
+    if error is None:
+        return {"result": _json_value(value)}
+    return {"error": error, "position": position}
+
+
+def try_evaluate(
+    calc: Calc, text: str, bindings: Mapping[str, Number] | None = None
+) -> Outcome:
+    """Evaluates an expression, returning the errors instead of raising them.
+
+    Args:
+        calc (Calc): The calculator to evaluate with, without a prompt.
+        text (str): The expression.
+        bindings (Mapping[str, Number] | None, optional): The values of the
+            variables. Defaults to None.
+
+    Returns:
+        Outcome: The value or the error.
+    """
+    calc.input = text
+    return try_call(lambda: calc.compile(optimize=False).eval(bindings))
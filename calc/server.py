@@ -0,0 +1,298 @@
+"""An asyncio evaluation service speaking newline-delimited JSON.
+
+Every request is a JSON object on its own line:
+
+    {"id": 1, "expr": "x * 2 + y", "vars": {"x": 3, "y": 4}}
+
+and gets a response on its own line, in the order of the requests:
+
+    {"id": 1, "result": 10}
+    {"id": 2, "error": "division by zero", "position": 2}
+
+The "id" and "vars" are optional. A client can send many requests
+without waiting for the responses. The values JSON can't hold as numbers,
+such as the infinities, are sent as strings, see `json_record`.
+
+Usage:
+    python -m calc.server [--host HOST] [--port PORT | --unix PATH]
+"""
+
+import argparse
+import asyncio
+import json
+from concurrent.futures import Executor
+from typing import Any, Dict
+
+from .cache import ParseCache
+from .expression import evaluate
+from .limits import Limits
+from .records import Outcome, json_record, try_call
+
+# Shared by all the threads evaluating the offloaded requests,
+#  while every process of a process pool has its own
+_offloaded_cache: ParseCache = ParseCache()
+
+
+def _offloaded_evaluate(
+    text: str, bindings: Dict[str, Any] | None, limits: Limits | None
+) -> Outcome:
+    return try_call(evaluate, text, bindings, None, limits, _offloaded_cache)
+
+
+def _response(request_id: Any, outcome: Outcome) -> bytes:
+    response = json_record(outcome)
+    if request_id is not None:
+        response = {"id": request_id} | response
+    return json.dumps(response, allow_nan=False).encode() + b"\n"
+
+
+def _safe_response(request_id: Any, outcome: Outcome) -> bytes:
+    # Whatever fails, the request gets an error response,
+    #  and the connection goes on with the requests after it
+    try:
+        return _response(request_id, outcome)
+    except Exception as error:
+        return _response(request_id, Outcome(None, str(error) or type(error).__name__))
+
+
+class EvaluationServer:
+    """Evaluates the requests of any number of connections on one event loop.
+
+    The short expressions are evaluated right on the loop, and the long ones
+    are offloaded to an executor, so they don't hold up the other connections.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_pending: int = 64,
+        max_line_length: int = 1 << 20,
+        offload_threshold: int = 10_000,
+        executor: Executor | None = None,
+        cache_size: int | None = 1_024,
+        limits: Limits | None = Limits(),
+    ):
+        """Configures the server.
+
+        Args:
+            max_connections (int, optional): The number of connections served
+                at once, the others are sent an error and closed. Defaults to 100.
+            max_pending (int, optional): The number of requests of a connection
+                waiting for their responses to be sent, before the server stops
+                reading that connection's requests. Defaults to 64.
+            max_line_length (int, optional): The maximum length of a request,
+                in bytes. Defaults to 1 MB.
+            offload_threshold (int, optional): The length of an expression,
+                from which it's evaluated in the executor. Defaults to 10000.
+            executor (Executor | None, optional): The executor for the long
+                expressions. Defaults to None, for the loop's default executor.
+            cache_size (int | None, optional): The size of the parse cache
+                of the expressions evaluated on the loop. Defaults to 1024.
+            limits (Limits | None, optional): The resource limits of every
+                request. Defaults to the default `Limits`.
+        """
+        self._max_connections = max_connections
+        self._max_pending = max_pending
+        self._max_line_length = max_line_length
+        self._offload_threshold = offload_threshold
+        self._executor = executor
+        self._limits = limits
+        self._cache = ParseCache(cache_size)
+        self._connections = 0
+
+    async def start_tcp(self, host: str = "127.0.0.1", port: int = 0) -> asyncio.Server:
+        """Starts serving on a TCP socket.
+
+        Args:
+            host (str, optional): The address to listen on. Defaults to localhost.
+            port (int, optional): The port to listen on. Defaults to 0, for any.
+
+        Returns:
+            asyncio.Server: The running server.
+        """
+        return await asyncio.start_server(
+            self._handle, host, port, limit=self._max_line_length
+        )
+
+    async def start_unix(self, path: str) -> asyncio.Server:
+        """Starts serving on a Unix socket.
+
+        Args:
+            path (str): The path to the socket.
+
+        Returns:
+            asyncio.Server: The running server.
+        """
+        return await asyncio.start_unix_server(
+            self._handle, path, limit=self._max_line_length
+        )
+
+    def _evaluate(self, line: bytes) -> "asyncio.Future[bytes] | bytes":
+        try:
+            request = json.loads(line)
+            text = request["expr"]
+            request_id = request.get("id")
+            bindings = request.get("vars")
+            if not isinstance(text, str) or not (
+                bindings is None
+                or isinstance(bindings, dict)
+                and all(type(v) in (int, float) for v in bindings.values())
+            ):
+                raise TypeError()
+        except (ValueError, KeyError, TypeError, AttributeError):
+            return _response(None, Outcome(None, "invalid request"))
+
+        if len(text) < self._offload_threshold:
+            outcome = try_call(
+                evaluate, text, bindings, None, self._limits, self._cache
+            )
+            return _safe_response(request_id, outcome)
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(
+            self._executor, _offloaded_evaluate, text, bindings, self._limits
+        )
+        return asyncio.ensure_future(self._respond_later(request_id, future))
+
+    @staticmethod
+    async def _respond_later(request_id: Any, outcome: "asyncio.Future[Outcome]"):
+        try:
+            ready = await outcome
+        except Exception as error:
+            # Such as a broken process pool
+            ready = Outcome(None, str(error) or type(error).__name__)
+        return _safe_response(request_id, ready)
+
+    async def _write_responses(
+        self, writer: asyncio.StreamWriter, responses: asyncio.Queue
+    ):
+        while True:
+            response = await responses.get()
+            if response is None:
+                break
+            if not isinstance(response, bytes):
+                response = await response
+
+            writer.write(response)
+            if responses.empty():
+                await writer.drain()
+
+    @staticmethod
+    async def _enqueue(
+        responses: asyncio.Queue, writing: asyncio.Task, response: Any
+    ) -> bool:
+        # Waits for room in the queue while the responses are being written.
+        # Returns False if the writing has ended, such as on a reset connection,
+        #  as the queue would then never have room again
+        if not writing.done():
+            if not responses.full():
+                responses.put_nowait(response)
+                return True
+
+            put = asyncio.ensure_future(responses.put(response))
+            await asyncio.wait((put, writing), return_when=asyncio.FIRST_COMPLETED)
+            if put.done():
+                return True
+            put.cancel()
+
+        if isinstance(response, asyncio.Future):
+            # An offloaded evaluation no one will wait for
+            response.cancel()
+        return False
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        if self._connections >= self._max_connections:
+            writer.write(_response(None, Outcome(None, "too many connections")))
+            await writer.drain()
+            writer.close()
+            return
+
+        self._connections += 1
+        # The responses in the request order, either ready or still evaluating.
+        # When it's full, reading the requests waits for the responses to be sent
+        responses: asyncio.Queue = asyncio.Queue(self._max_pending)
+        writing = asyncio.create_task(self._write_responses(writer, responses))
+
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    await self._enqueue(
+                        responses,
+                        writing,
+                        _response(None, Outcome(None, "request too long")),
+                    )
+                    break
+                except ConnectionResetError:
+                    # Like the end of the requests
+                    break
+
+                if not line:
+                    break
+                if line.strip() and not await self._enqueue(
+                    responses, writing, self._evaluate(line)
+                ):
+                    break
+
+            # The writing ends after the responses queued before the end marker,
+            #  or has already ended, possibly with the error to raise here
+            await self._enqueue(responses, writing, None)
+            await writing
+        except ConnectionError:
+            pass
+        finally:
+            # Whatever the writing didn't get to is dropped
+            writing.cancel()
+            while not responses.empty():
+                response = responses.get_nowait()
+                if isinstance(response, asyncio.Future):
+                    response.cancel()
+            self._connections -= 1
+            writer.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serves expression evaluation.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="the path of a Unix socket to listen on")
+    parser.add_argument("--max-connections", type=int, default=100)
+    parser.add_argument("--max-pending", type=int, default=64)
+    parser.add_argument("--max-line-length", type=int, default=1 << 20)
+    parser.add_argument("--offload-threshold", type=int, default=10_000)
+    parser.add_argument("--max-bits", type=int, default=Limits().max_bits)
+    parser.add_argument(
+        "--time-budget", type=float, help="the maximum seconds per request"
+    )
+    args = parser.parse_args()
+
+    async def serve():
+        evaluation_server = EvaluationServer(
+            max_connections=args.max_connections,
+            max_pending=args.max_pending,
+            max_line_length=args.max_line_length,
+            offload_threshold=args.offload_threshold,
+            limits=Limits(max_bits=args.max_bits, time_budget=args.time_budget),
+        )
+        if args.unix:
+            server = await evaluation_server.start_unix(args.unix)
+        else:
+            server = await evaluation_server.start_tcp(args.host, args.port)
+
+        address = server.sockets[0].getsockname()
+        if isinstance(address, tuple):
+            address = f"{address[0]}:{address[1]}"
+        print(f"listening on {address}", flush=True)
+
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
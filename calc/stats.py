@@ -0,0 +1,149 @@
+"""Measurements of the stages of parsing and evaluating the inputs.
+
+Instrumenting a `Calc` measures every operation on its input,
+and either passes the measurements to a callback, or aggregates them:
+
+    >>> calc = Calc(input_string="1 + 2", stats=True)
+    >>> calc.result
+    3
+    >>> calc.stats.stages["tokenize"].count
+    1
+"""
+
+from collections import Counter
+from typing import Dict, List, Mapping, NamedTuple, Tuple
+
+
+class Measurement(NamedTuple):
+    """The measurements of one operation of a `Calc`."""
+
+    operation: str
+    """The operation: "result", "compile", "to_python", "memoize" or "eval_batch"."""
+    durations: Mapping[str, float]
+    """The durations of the stages that ran, in seconds, by the name of the stage:
+    "tokenize", "group", "tree", "compile" or "eval"."""
+    total: float
+    """The duration of the whole operation, in seconds."""
+    parse: str | None
+    """How the input was parsed: "cached", if it was parsed before,
+    "incremental", if it was parsed from an earlier input, or "full".
+    None if the operation failed before parsing."""
+    tokens: int
+    """The number of tokens."""
+    nodes: int
+    """The number of nodes of the tree, 0 if it wasn't built."""
+    failed: bool
+    """Whether the operation raised an error."""
+
+
+class Histogram:
+    """Counts the values in buckets of powers of two.
+
+    The first bucket holds the values under one unit,
+    and every next bucket the values up to twice as large as the previous one.
+    """
+
+    def __init__(self, unit: float = 1.0):
+        """Creates an empty histogram.
+
+        Args:
+            unit (float, optional): The upper bound of the first bucket,
+                for example 1e-6 for the durations in seconds. Defaults to 1.
+        """
+        self._unit = unit
+        self._counts: List[int] = []
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value: float):
+        """Adds a value."""
+        bucket = int(value / self._unit).bit_length()
+        counts = self._counts
+        if bucket >= len(counts):
+            counts.extend([0] * (bucket + 1 - len(counts)))
+        counts[bucket] += 1
+
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    @property
+    def mean(self) -> float:
+        """The mean of the values, 0 if there are none."""
+        return self.total / self.count if self.count else 0.0
+
+    @property
+    def buckets(self) -> List[Tuple[float, int]]:
+        """The upper bound and the number of values of every bucket."""
+        return [
+            (self._unit * (1 << bucket), count)
+            for bucket, count in enumerate(self._counts)
+        ]
+
+    def percentile(self, percent: float) -> float:
+        """Estimates a percentile of the values.
+
+        Args:
+            percent (float): The percentile, from 0 to 100.
+
+        Returns:
+            float: The upper bound of the bucket of the percentile,
+                but no more than the largest value. 0 if there are no values.
+        """
+        rank = percent / 100 * self.count
+        seen = 0
+        for bound, count in self.buckets:
+            seen += count
+            if count and seen >= rank:
+                return min(bound, self.max)
+        return 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(count={self.count}, mean={self.mean:g},"
+            f" p50={self.percentile(50):g}, p99={self.percentile(99):g},"
+            f" max={self.max:g})"
+        )
+
+
+class Stats:
+    """Aggregates the measurements of a `Calc`."""
+
+    def __init__(self):
+        """Creates empty statistics."""
+        self.reset()
+
+    def reset(self):
+        """Forgets all the measurements."""
+        # The number of every operation,
+        #  and of the inputs by how they were parsed, see `Measurement.parse`
+        self.operations: Counter[str] = Counter()
+        self.parses: Counter[str] = Counter()
+        self.failures = 0
+        # The durations in seconds, of every stage and of the whole operations
+        self.stages: Dict[str, Histogram] = {}
+        self.total = Histogram(1e-6)
+        self.tokens = Histogram()
+        self.nodes = Histogram()
+
+    @property
+    def cache_hits(self) -> int:
+        """The number of operations on inputs that were parsed before."""
+        return self.parses["cached"]
+
+    def record(self, measurement: Measurement):
+        """Adds a measurement."""
+        self.operations[measurement.operation] += 1
+        if measurement.parse is not None:
+            self.parses[measurement.parse] += 1
+        self.failures += measurement.failed
+
+        for stage, duration in measurement.durations.items():
+            if stage not in self.stages:
+                self.stages[stage] = Histogram(1e-6)
+            self.stages[stage].add(duration)
+        self.total.add(measurement.total)
+        self.tokens.add(measurement.tokens)
+        self.nodes.add(measurement.nodes)
@@ -1,15 +1,83 @@
+from numbers import Number
 from types import NotImplementedType
-from typing import Generic, TypeVar
+from typing import Generic, Tuple, TypeVar
 
+from .op import Bracket, Op
+from .var import Var
 
 T = TypeVar("T")
 
+# The kinds of the tokens, so that the parser branches on small integers
+#  instead of checking the types of the values.
+# The kinds of the values and the operations come first
+NUMBER = 0
+VAR = 1
+OP = 2
+OPEN_BRACKET = 3
+CLOSE_BRACKET = 4
+OTHER = 5
+
+_bracket_kinds = {
+    Bracket.P_OPEN: OPEN_BRACKET,
+    Bracket.S_OPEN: OPEN_BRACKET,
+    Bracket.C_OPEN: OPEN_BRACKET,
+    Bracket.P_CLOSE: CLOSE_BRACKET,
+    Bracket.S_CLOSE: CLOSE_BRACKET,
+    Bracket.C_CLOSE: CLOSE_BRACKET,
+}
+
+
+def classify(value) -> Tuple[int, int]:
+    """Finds the kind and the precedence of a token's value.
+
+    Args:
+        value: The value.
+
+    Returns:
+        Tuple[int, int]: The kind, and the precedence of an operation,
+            or 0 for the other kinds.
+    """
+    if isinstance(value, Op):
+        return OP, value.precedence
+    if isinstance(value, Bracket):
+        return _bracket_kinds[value], 0
+    if isinstance(value, Var):
+        return VAR, 0
+    if isinstance(value, Number):
+        return NUMBER, 0
+    return OTHER, 0
+
 
 class Token(Generic[T]):
-    def __init__(self, value: T, start: int, end: int):
+    __slots__ = ("value", "start", "end", "kind", "precedence")
+
+    def __init__(
+        self,
+        value: T,
+        start: int,
+        end: int,
+        kind: int | None = None,
+        precedence: int = 0,
+    ):
+        """Creates a token.
+
+        Args:
+            value (T): The value.
+            start (int): The position of the first character.
+            end (int): The position past the last character.
+            kind (int | None, optional): The kind of the value, with
+                the precedence of an operation, as found by `classify`.
+                Defaults to None, for finding them from the value.
+            precedence (int, optional): The precedence of an operation,
+                only used with the kind. Defaults to 0.
+        """
         self.value = value
         self.start = start
         self.end = end
+        if kind is None:
+            kind, precedence = classify(value)
+        self.kind = kind
+        self.precedence = precedence
 
     def __repr__(self) -> str:
         return f"Token({self.value!r}, {self.start}, {self.end})"
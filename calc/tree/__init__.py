@@ -1,5 +1,6 @@
 from .num_node import NumNode
 from .op_node import GroupNode, OpNode
 from .tree import Tree
+from .var_node import VarNode
 
-__all__ = [GroupNode, NumNode, OpNode, Tree]
+__all__ = [GroupNode, NumNode, OpNode, Tree, VarNode]
@@ -1,13 +1,23 @@
 from numbers import Number
+from typing import TYPE_CHECKING, Mapping
 
 from ..token import Token
 from .tree import Tree
 
+if TYPE_CHECKING:  # pragma: no cover
+    from ..numeric import NumericBackend
+
 
 class NumNode(Tree):
+    __slots__ = ("token",)
+
     def __init__(self, token: Token[Number]):
         super().__init__()
         self.token = token
 
-    def eval(self) -> Number:
+    def eval(
+        self,
+        bindings: Mapping[str, Number] | None = None,
+        backend: "NumericBackend | None" = None,
+    ) -> Number:
         return self.token.value
@@ -1,11 +1,18 @@
 from numbers import Number
+from typing import TYPE_CHECKING, List, Mapping, MutableMapping
 
-from ..token import Token
+from ..errors import EvalError, locate
 from ..op import Op
+from ..token import Token
 from .tree import Tree
 
+if TYPE_CHECKING:  # pragma: no cover
+    from ..numeric import NumericBackend
+
 
 class OpNode(Tree):
+    __slots__ = ("token",)
+
     def __init__(
         self,
         token: Token[Op],
@@ -15,23 +22,86 @@ class OpNode(Tree):
         super().__init__(left, right)
         self.token = token
 
-    def eval(self) -> Number:
-        if not self.right:
-            raise ArithmeticError(
-                f"missing the right-hand-side for '{self.token.value.symbol}'",
-                self.token.end - 1,
-            )
+    def eval(
+        self,
+        bindings: Mapping[str, Number] | None = None,
+        backend: "NumericBackend | None" = None,
+        groups: MutableMapping[int, Number] | None = None,
+    ) -> Number:
+        """Evaluates the numerical value, see `Tree.eval`.
+
+        Args:
+            bindings (Mapping[str, Number] | None, optional): The values of the
+                variables. Defaults to None.
+            backend (NumericBackend | None, optional): The backend applying
+                the operations. Defaults to None, for the operations themselves.
+            groups (MutableMapping[int, Number] | None, optional): The values
+                of the group nodes, by their `id`. The groups found there
+                aren't evaluated again, and the values of the others are added.
+                Defaults to None.
+
+        Returns:
+            Number: The numerical value.
+        """
+        # Post-order traversal with an explicit stack,
+        #  so that deep trees don't hit the recursion limit.
+        # The stack holds the subtrees yet to be expanded,
+        #  the tokens of the operations waiting for their operands,
+        #  and the ids of the groups waiting for their values
+        values: List[Number | None] = []
+        stack: List[Tree | Token[Op] | int] = [self]
+        push, pop = values.append, values.pop
+        apply = None
+        if backend is not None:
+            backend.begin()
+            apply = backend.eval
 
+        # The errors of the operations only get their positions once raised,
+        #  the others already have them
+        item = self
         try:
-            return self.token.value.eval(
-                self.left.eval() if self.left else None, self.right.eval()
-            )
+            while stack:
+                item = stack.pop()
+
+                if type(item) is Token:
+                    rhs = pop()
+                    lhs = pop()
+                    op = item.value
+                    if apply is not None:
+                        push(apply(op, lhs, rhs))
+                    else:
+                        push(op.unary(rhs) if lhs is None else op.binary(lhs, rhs))
+
+                elif type(item) is int:
+                    groups[item] = values[-1]
+
+                elif isinstance(item, OpNode):
+                    if groups is not None and type(item) is GroupNode:
+                        key = id(item)
+                        if key in groups:
+                            push(groups[key])
+                            continue
+                        stack.append(key)
+
+                    if not item._right:
+                        raise EvalError.missing_rhs(item.token)
+
+                    stack.append(item.token)
+                    stack.append(item._right)
+                    if item._left:
+                        stack.append(item._left)
+                    else:
+                        push(None)
+
+                else:
+                    push(item.eval(bindings))
         except ArithmeticError as ae:
-            if len(ae.args) > 1:
+            if type(item) is not Token:
                 raise
-            else:
-                raise ArithmeticError(ae.args[0], self.token.start)
+            raise locate(ae, item.start, item)
+
+        return pop()
 
 
 class GroupNode(OpNode):
-    pass
+    __slots__ = ()
@@ -1,10 +1,16 @@
 from abc import ABC, abstractmethod
 from numbers import Number
+from typing import TYPE_CHECKING, Mapping
+
+if TYPE_CHECKING:  # pragma: no cover
+    from ..numeric import NumericBackend
 
 
 class Tree(ABC):
     """Abstract base class for the syntax tree nodes."""
 
+    __slots__ = ("_left", "_right")
+
     def __init__(self, left: "Tree | None" = None, right: "Tree | None" = None):
         """Creates a tree node.
 
@@ -44,11 +50,22 @@ class Tree(ABC):
         self._right = right
 
     @abstractmethod
-    def eval(self) -> Number:
+    def eval(
+        self,
+        bindings: Mapping[str, Number] | None = None,
+        backend: "NumericBackend | None" = None,
+    ) -> Number:
         """Evaluates the numerical value.
 
         Evaluates and returns the numerical value of the expression stored in the tree.
 
+        Args:
+            bindings (Mapping[str, Number] | None, optional): The values of the
+                variables. Defaults to None.
+            backend (NumericBackend | None, optional): The backend applying
+                the operations, such as a `LimitedBackend`. Defaults to None,
+                for the operations themselves.
+
         Returns:
             Number: The numerical value
         """
@@ -0,0 +1,34 @@
+from numbers import Number
+from typing import TYPE_CHECKING, Mapping
+
+from ..errors import ErrorKind, EvalError
+from ..token import Token
+from ..var import Var
+from .tree import Tree
+
+if TYPE_CHECKING:  # pragma: no cover
+    from ..numeric import NumericBackend
+
+
+class VarNode(Tree):
+    __slots__ = ("token",)
+
+    def __init__(self, token: Token[Var]):
+        super().__init__()
+        self.token = token
+
+    def eval(
+        self,
+        bindings: Mapping[str, Number] | None = None,
+        backend: "NumericBackend | None" = None,
+    ) -> Number:
+        name = self.token.value.name
+        if bindings is None or name not in bindings:
+            raise EvalError(
+                f"undefined variable '{name}'",
+                self.token.start,
+                ErrorKind.UNDEFINED_VARIABLE,
+                self.token,
+            )
+
+        return bindings[name]
@@ -0,0 +1,24 @@
+from types import NotImplementedType
+
+
+class Var:
+    """A variable, whose value is bound at evaluation time."""
+
+    __slots__ = ("name",)
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.name!r})"
+
+    def __str__(self) -> str:
+        return f"'{self.name}'"
+
+    def __eq__(self, other) -> bool | NotImplementedType:
+        if isinstance(other, Var):
+            return self.name == other.name
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.name)
@@ -0,0 +1,72 @@
+import subprocess
+import sys
+
+import pytest
+
+from calc import Calc
+
+np = pytest.importorskip("numpy")
+
+
+def test_eval_batch():
+    calc = Calc(input_string="x * 2 + y")
+    result = calc.eval_batch({"x": np.array([1, 2, 3]), "y": np.array([4, 5, 6])})
+    assert result.values.tolist() == [6, 9, 12]
+    assert not result.errors.any()
+
+
+def test_broadcast_constant():
+    calc = Calc(input_string="2 ** 10 + x")
+    result = calc.eval_batch({"x": [0.5, -1]})
+    assert result.values.tolist() == [1024.5, 1023]
+
+
+def test_same_as_scalar():
+    calc = Calc(input_string="-(x - 1) // 2 + x % 3 * -y ** 2 / 4")
+    xs, ys = np.arange(-5, 5), np.linspace(-2, 2, 10)
+    result = calc.eval_batch({"x": xs, "y": ys})
+
+    program = calc.compile()
+    expected = [program(x=int(x), y=float(y)) for x, y in zip(xs, ys)]
+    assert result.values == pytest.approx(expected)
+
+
+def test_mask_division_by_zero():
+    calc = Calc(input_string="1 + x / y")
+    result = calc.eval_batch({"x": [1, 2, 3], "y": [1, 0, 2]})
+    assert result.errors.tolist() == [False, True, False]
+    assert result.values[0] == 2 and result.values[2] == 2.5
+    assert np.isnan(result.values[1])
+
+
+def test_mask_exp():
+    calc = Calc(input_string="x ** y")
+    result = calc.eval_batch({"x": [0, -8, 10, 2], "y": [-1, 0.5, 400, 3]})
+    assert result.errors.tolist() == [True, True, True, False]
+    assert result.values[3] == 8
+
+
+def test_mask_undefined_variable():
+    calc = Calc(input_string="x + z")
+    result = calc.eval_batch({"x": [1, 2]})
+    assert result.errors.all()
+
+
+def test_raise():
+    calc = Calc(input_string="1 + x / y")
+    with pytest.raises(ArithmeticError) as ei:
+        calc.eval_batch({"x": [1, 2], "y": [1, 0]}, errors="raise")
+    assert ei.value.args == ("division by zero", 6)
+
+
+def test_unexpected_policy():
+    with pytest.raises(ValueError, match=r"unexpected error policy 'ignore'"):
+        Calc(input_string="x").eval_batch({"x": [1]}, errors="ignore")
+
+
+def test_numpy_imported_lazily():
+    code = "import sys, calc; print('numpy' in sys.modules)"
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    assert output.strip() == "False"
@@ -0,0 +1,77 @@
+import pytest
+
+from calc import Calc
+from calc.cache import ParseCache
+
+
+def test_lru_eviction():
+    cache = ParseCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+
+    assert "b" not in cache
+    assert len(cache) == 2
+    assert cache.evictions == 1
+
+
+def test_counters():
+    cache = ParseCache()
+    cache.put("a", 1)
+    cache.get("a")
+    cache.get("b")
+    assert (cache.hits, cache.misses, cache.evictions) == (1, 1, 0)
+
+    cache.clear()
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses, cache.evictions) == (0, 0, 0)
+
+
+def test_unbounded():
+    cache = ParseCache(maxsize=None)
+    for i in range(1_000):
+        cache.put(i, i)
+    assert len(cache) == 1_000
+    assert cache.evictions == 0
+
+
+def test_invalid_size():
+    with pytest.raises(ValueError, match=r"cache size must be positive, got 0"):
+        ParseCache(maxsize=0)
+
+
+def test_repeat_input_skips_parsing(monkeypatch):
+    calc = Calc(cache=ParseCache())
+    calc.input = "2 * (3 + 4)"
+    assert calc.result == 14
+
+    def fail(self):
+        raise AssertionError("parsed again")
+
+    monkeypatch.setattr(Calc, "_tokenize", fail)
+    monkeypatch.setattr(Calc, "_group_tokens_by_brackets", fail)
+
+    calc.input = "1 + 1"
+    calc.input = "2 * (3 + 4)  "
+    assert calc.result == 14
+    assert calc.cache.hits == 1
+
+
+def test_shared_between_instances():
+    cache = ParseCache()
+    first, second = Calc(cache=cache), Calc(cache=cache)
+    first.input = second.input = "x * 2"
+
+    assert first.compile() is second.compile()
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_errors_not_cached():
+    cache = ParseCache()
+    calc = Calc(cache=cache)
+    calc.input = "(1 + 2"
+    for _ in range(2):
+        with pytest.raises(SyntaxError):
+            calc.result
+    assert len(cache) == 0
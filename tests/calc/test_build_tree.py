@@ -0,0 +1,70 @@
+from typing import Callable
+
+from calc import Calc
+from calc.op import Op
+from calc.tree import GroupNode, NumNode, Tree
+
+
+def _build(calc: Calc, text: str) -> Tree | None:
+    calc.input = text
+    calc._build_tree()
+    return calc._tree
+
+
+def test_empty(calc_instance: Calc):
+    assert _build(calc_instance, "") is None
+
+
+def test_left_associative(calc_instance: Calc, tree_shape: Callable):
+    assert tree_shape(_build(calc_instance, "1 - 2 - 3")) == (
+        "-",
+        ("-", 1, 2),
+        3,
+    )
+
+
+def test_precedence(calc_instance: Calc, tree_shape: Callable):
+    assert tree_shape(_build(calc_instance, "1 + 2 * 3 ** 4 - 5")) == (
+        "-",
+        ("+", 1, ("*", 2, ("**", 3, 4))),
+        5,
+    )
+
+
+def test_unary_after_binary(calc_instance: Calc, tree_shape: Callable):
+    assert tree_shape(_build(calc_instance, "2 ** -3 * 4")) == (
+        "*",
+        ("**", 2, ("-", None, 3)),
+        4,
+    )
+
+
+def test_unary_chain(calc_instance: Calc, tree_shape: Callable):
+    assert tree_shape(_build(calc_instance, "--2 ** 2")) == (
+        "-",
+        None,
+        ("-", None, ("**", 2, 2)),
+    )
+
+
+def test_group(calc_instance: Calc, tree_shape: Callable):
+    tree = _build(calc_instance, "2 * (3 + 4) ** 2")
+    assert tree_shape(tree) == ("*", 2, ("**", ("()", 3, 4), 2))
+    assert type(tree.right.left) is GroupNode
+    assert tree.right.left.token.value is Op.ADD
+
+
+def test_only_number_in_group(calc_instance: Calc):
+    tree = _build(calc_instance, "((2))")
+    assert type(tree) is NumNode
+    assert tree.token.value == 2
+
+
+def test_long_input(calc_instance: Calc, tree_shape: Callable):
+    terms = 10_000
+    tree = _build(calc_instance, " + ".join("2 * 3 ** 1" for _ in range(terms)))
+
+    for _ in range(terms - 1):
+        assert tree_shape(tree.right) == ("*", 2, ("**", 3, 1))
+        tree = tree.left
+    assert tree_shape(tree) == ("*", 2, ("**", 3, 1))
@@ -1,4 +1,5 @@
-from calc import Calc
+from calc import Calc, parse
+from calc.tree import GroupNode
 
 
 def test_group_first(calc_instance: Calc):
@@ -34,3 +35,62 @@ def test_double_unary(calc_instance: Calc):
 def test_only_number_in_brackets(calc_instance: Calc):
     calc_instance.input = "(2)"
     assert calc_instance.result == 2
+
+
+def test_deep_nesting(calc_instance: Calc):
+    depth = 5_000
+    calc_instance.input = "(" * depth + "1" + " + 1)" * depth
+    assert calc_instance.result == depth + 1
+
+
+def test_long_unary_chain(calc_instance: Calc):
+    calc_instance.input = "-" * 5_001 + "2"
+    assert calc_instance.result == -2
+
+
+def test_long_sum(calc_instance: Calc):
+    calc_instance.input = " + ".join("1" for _ in range(10_000))
+    assert calc_instance.result == 10_000
+
+
+def test_error_position(calc_instance: Calc, capsys):
+    calc_instance.input = "2 * (1 + 3 / 0)"
+    assert calc_instance.result is None
+    assert capsys.readouterr().out == (
+        (calc_instance.prompt_length + 11) * " " + "^\ndivision by zero\n"
+    )
+
+
+def test_missing_rhs_position(calc_instance: Calc, capsys):
+    calc_instance.input = "(2 ** 3 *) + 1"
+    assert calc_instance.result is None
+    assert capsys.readouterr().out == (
+        (calc_instance.prompt_length + 8) * " "
+        + "^\nmissing the right-hand-side for '*'\n"
+    )
+
+
+def test_variables(calc_instance: Calc):
+    calc_instance.input = "x * 2 + y"
+    calc_instance._build_tree()
+    assert calc_instance._tree.eval({"x": 3, "y": 4}) == 10
+
+
+def test_undefined_variable(calc_instance: Calc, capsys):
+    calc_instance.input = "1 + rate"
+    assert calc_instance.result is None
+    assert capsys.readouterr().out == (
+        (calc_instance.prompt_length + 4) * " " + "^\nundefined variable 'rate'\n"
+    )
+
+
+def test_known_group_values():
+    tree = parse("(1 + 2) * (3 + x)").tree
+    first, second = tree.left, tree.right
+    assert isinstance(first, GroupNode) and isinstance(second, GroupNode)
+
+    # The known value is used as it is, and the other one is added
+    groups = {id(first): 10}
+    assert tree.eval({"x": 4}, None, groups) == 70
+    assert groups == {id(first): 10, id(second): 7}
+    assert tree.eval(None, None, groups) == 70
@@ -0,0 +1,166 @@
+from typing import Callable
+
+import pytest
+from hypothesis import example, given, strategies as st
+
+from calc import Calc
+from calc.limits import Limits
+from calc.numeric import FloatBackend
+from calc.op import Op
+from calc.parser import Parser
+from calc.tree import GroupNode, NumNode, VarNode
+
+
+class _RecordingBackend(FloatBackend):
+    """Records the operations it applies."""
+
+    def __init__(self):
+        self.evaluated = []
+
+    def eval(self, op, lhs, rhs):
+        self.evaluated.append(op)
+        return super().eval(op, lhs, rhs)
+
+
+def _group_trees(calc: Calc) -> list:
+    return [group.tree for _, group in sorted(calc._groups.items())]
+
+
+def _parse(calc: Calc, text: str, tree_shape: Callable):
+    calc.input = text
+    try:
+        calc._build_tree()
+    except SyntaxError as error:
+        return str(error)
+    tokens = [repr(token) for token in calc._tokens]
+    return tokens, tree_shape(calc._tree, positions=True)
+
+
+_texts = st.text(alphabet="0123456789.eEbxo+-/%()[]{} _a", max_size=20)
+
+
+_limits = st.none() | st.builds(
+    Limits,
+    max_tokens=st.none() | st.integers(1, 20),
+    max_depth=st.integers(1, 3),
+)
+
+
+@given(
+    _texts,
+    st.lists(st.tuples(st.integers(0, 20), st.integers(0, 3), _texts)),
+    _limits,
+)
+@example("+[11+]", [(1, 0, "{{")], Limits(max_depth=2))
+@example(" (1)", [(0, 1, "[(")], Limits(max_depth=2))
+def test_same_as_full_parse(tree_shape, text, edits, limits):
+    calc = Calc(prompt="", limits=limits)
+    _parse(calc, text, tree_shape)
+    for start, length, new_text in edits:
+        start = min(start, len(text))
+        text = text[:start] + new_text + text[start + length :]
+        assert _parse(calc, text, tree_shape) == _parse(
+            Calc(prompt="", limits=limits), text, tree_shape
+        )
+
+
+def test_scans_around_edit(monkeypatch):
+    calc = Calc()
+    calc.input = "1 + 2 * 3" * 100
+    calc._build_tree()
+
+    positions = []
+    scan = Parser._scan
+
+    def recording_scan(self, text: str, pos: int = 0):
+        positions.append(pos)
+        return scan(self, text, pos)
+
+    monkeypatch.setattr(Parser, "_scan", recording_scan)
+    calc.input += " + 4"
+    assert calc.result == eval(calc.input)
+    assert len(positions) == 1 and positions[0] > len(calc.input) - 10
+
+
+def test_reuses_untouched_groups():
+    calc = Calc()
+    calc.input = "(1 + 2) * [3 - 4] - {5 // 6}"
+    assert calc.result == -3
+    first, second, third = _group_trees(calc)
+
+    # The same length, so the groups after the edit are reused too
+    calc.input = "(1 + 2) * [3 - 9] - {5 // 6}"
+    assert calc.result == -18
+    trees = _group_trees(calc)
+    assert trees[0] is first and trees[2] is third
+    assert trees[1] is not second
+    assert [group.value for _, group in sorted(calc._groups.items())] == [3, -6, 0]
+
+    # The groups after the edit have their tokens shifted
+    calc.input = "(1 + 2) * [3 - 19] - {5 // 0}"
+    calc._build_tree()
+    with pytest.raises(ArithmeticError) as ae:
+        calc._tree.eval()
+    assert ae.value.args == ("integer division or modulo by zero", 24)
+    assert _group_trees(calc)[0] is first
+
+
+def test_reuses_group_values():
+    backend = _RecordingBackend()
+    calc = Calc(backend=backend)
+    calc.input = "(2 ** 10) * 3"
+    assert calc.result == 3072
+    assert isinstance(calc._groups[0].tree, GroupNode)
+
+    backend.evaluated.clear()
+    calc.input = "(2 ** 10) * 3 + 1"
+    assert calc.result == 3073
+    assert backend.evaluated == [Op.MULT, Op.ADD]
+
+
+@pytest.mark.parametrize(
+    "text, edited",
+    [
+        ("(1 +) 3", "(1 +) + 3"),
+        ("(1 + 2)(3)", "(1 + 2) + (3)"),
+        ("(1 + 2) + (3)", "(1 + 2) x (3)"),
+        ("(1+)", "(1+)2"),
+        ("[-10] 99", "[-10]99"),
+        ("(4*4)+54", "(4*4)54"),
+    ],
+)
+def test_values_in_a_row(tree_shape, text, edited):
+    calc = Calc(prompt="", errors="return")
+    for text in (text, edited, text):
+        fresh = Calc(prompt="", errors="return")
+        assert _parse(calc, text, tree_shape) == _parse(fresh, text, tree_shape)
+        assert str(calc.result) == str(fresh.result)
+
+
+def test_leaves_reused():
+    calc = Calc()
+    calc.input = "(1)   + (x)"
+    calc._build_tree()
+    leaves = _group_trees(calc)
+    assert [type(leaf) for leaf in leaves] == [NumNode, VarNode]
+
+    calc.input = "(1)   - (x)"
+    calc._build_tree()
+    assert _group_trees(calc) == leaves
+
+
+def test_shifted_groups_keep_values(tree_shape):
+    backend = _RecordingBackend()
+    calc = Calc(backend=backend)
+    calc.input = "3 * ((2 ** 10) - [1])"
+    assert calc.result == 3069
+
+    # A longer input, so the groups after the edit are copied
+    #  with their tokens shifted, and keep their values
+    backend.evaluated.clear()
+    calc.input = "1 + 30 * ((2 ** 10) - [1])"
+    assert calc.result == 30691
+    assert backend.evaluated == [Op.MULT, Op.ADD]
+    assert tree_shape(calc._tree, positions=True) == tree_shape(
+        Calc(input_string=calc.input).expression.tree, positions=True
+    )
@@ -2,6 +2,7 @@ import pytest
 from calc import Calc
 from calc.op import Bracket, Op
 from calc.token import Token
+from calc.var import Var
 
 
 def test_float_wo_exp(calc_instance: Calc):
@@ -71,7 +72,7 @@ def test_bin(calc_instance: Calc):
 
 
 def test_bin_invalid(calc_instance: Calc):
-    with pytest.raises(ValueError, match=r"invalid literal for int\(\)"):
+    with pytest.raises(SyntaxError, match="invalid literal '0b12'"):
         calc_instance.input = "0b12"
         calc_instance._tokenize()
 
@@ -83,13 +84,13 @@ def test_oct(calc_instance: Calc):
 
 
 def test_oct_invalid(calc_instance: Calc):
-    with pytest.raises(ValueError, match=r"invalid literal for int\(\)"):
+    with pytest.raises(SyntaxError, match="invalid literal '0o19'"):
         calc_instance.input = "0o19"
         calc_instance._tokenize()
 
 
 def test_oct_w_exp_invalid(calc_instance: Calc):
-    with pytest.raises(ValueError, match=r"invalid literal for int\(\)"):
+    with pytest.raises(SyntaxError, match="invalid literal '0o77E'"):
         calc_instance.input = "0o77E+1"
         calc_instance._tokenize()
 
@@ -101,7 +102,7 @@ def test_hex(calc_instance: Calc):
 
 
 def test_hex_invalid(calc_instance: Calc):
-    with pytest.raises(ValueError, match=r"invalid literal for int\(\)"):
+    with pytest.raises(SyntaxError, match="invalid literal '0xfg'"):
         calc_instance.input = "0xfg"
         calc_instance._tokenize()
 
@@ -163,3 +164,21 @@ def test_integration(calc_instance: Calc):
         Token(Bracket.P_CLOSE, 24, 25),
         Token(Bracket.S_CLOSE, 25, 26),
     ]
+
+
+def test_names(calc_instance: Calc):
+    calc_instance.input = "x * _y2 + Rate"
+    calc_instance._tokenize()
+    assert calc_instance._tokens == [
+        Token(Var("x"), 0, 1),
+        Token(Op.MULT, 2, 3),
+        Token(Var("_y2"), 4, 7),
+        Token(Op.ADD, 8, 9),
+        Token(Var("Rate"), 10, 14),
+    ]
+
+
+def test_number_followed_by_name(calc_instance: Calc):
+    calc_instance.input = "2e1x"
+    calc_instance._tokenize()
+    assert calc_instance._tokens == [Token(20, 0, 3), Token(Var("x"), 3, 4)]
@@ -0,0 +1,143 @@
+import operator
+from decimal import Decimal
+
+import pytest
+from hypothesis import given, strategies as st
+
+from calc import Calc
+from calc.codegen import MAX_DEPTH
+from calc.limits import Limits
+from calc.numeric import DecimalBackend
+
+
+def _outcome(evaluate, *args):
+    try:
+        return evaluate(*args)
+    except ArithmeticError as ae:
+        return ae.args
+    except SyntaxError:
+        return "syntax"
+
+
+def _zero_division(operation):
+    # The messages differ between the Python versions
+    return _outcome(operation, 1, 0)[0]
+
+
+@pytest.mark.parametrize(
+    "text, expression",
+    [
+        ("(x + 1) * -y", "((x or 0) + 1) * (0 - y)"),
+        ("x - (y - 1)", "(x or 0) - ((y or 0) - 1)"),
+        ("2 + x * y", "2 + x * y"),
+        ("x * y * 2", "x * y * 2"),
+        ("x * (y * 2)", "x * (y * 2)"),
+        ("x ** (y ** 2)", "x ** y ** 2"),
+        ("(x ** y) ** 2", "(x ** y) ** 2"),
+        ("x ** -y", "x ** (0 - y)"),
+        ("--x", "0 - (0 - x)"),
+        ("x // -2", "x // (0 - 2)"),
+        ("*x", "_missing(x, \"missing the left-hand-side for '*'\", 0)"),
+        ("x +", "_fail(_c4)"),
+        ("", "None"),
+    ],
+)
+def test_source(text, expression):
+    function = Calc(input_string=text).to_python(optimize=False)
+    assert f"        return {expression}\n" in function.source
+
+
+def test_evaluate():
+    function = Calc(input_string="x * 2 + y").to_python()
+    assert function.variables == ("x", "y")
+    assert function(3, 4) == function(x=3, y=4) == 10
+
+
+def test_cached():
+    calc = Calc(input_string="x + 1")
+    assert calc.to_python() is calc.to_python()
+    assert calc.to_python(optimize=False) is not calc.to_python()
+
+
+def test_unary_semantics():
+    # (lhs or 0) - rhs, as in OpWithPrecedence.eval
+    function = Calc(input_string="x - y").to_python()
+    assert str(function(-0.0, 0.0)) == str((-0.0 or 0) - 0.0)
+    assert str(Calc(input_string="-x").to_python()(0.0)) == "0.0"
+
+
+@pytest.mark.parametrize(
+    "text, args, error",
+    [
+        ("x / y", (1, 0), (_zero_division(operator.truediv), 2)),
+        ("1 + (x // y) * 2", (1, 0), (_zero_division(operator.floordiv), 7)),
+        ("x % 0 + 1 / 0", (1,), (_zero_division(operator.mod), 2)),
+        ("*x", (1,), ("missing the left-hand-side for '*'", 0)),
+        ("x - ", (), ("missing the right-hand-side for '-'", 2)),
+    ],
+)
+def test_error_positions(text, args, error):
+    calc = Calc(input_string=text)
+    for optimize in (False, True):
+        with pytest.raises(ArithmeticError) as ae:
+            calc.to_python(optimize)(*args)
+        assert ae.value.args == error
+
+
+def test_variable_names():
+    calc = Calc(input_string="if + _c1 + ArithmeticError + _eval")
+    function = calc.to_python()
+    assert function.variables == ("if", "_c1", "ArithmeticError", "_eval")
+    assert function(1, 2, 3, 4) == 10
+    assert "def _expression(if_, _c1_, ArithmeticError_, _eval_):" in function.source
+
+
+def test_constants():
+    # Too long for a literal
+    function = Calc(input_string="x + 2 ** 100 + 1e999").to_python()
+    assert function(1) == 1 + 2**100 + float("inf")
+
+
+def test_backend():
+    function = Calc(input_string="x / 3 - -y", backend=DecimalBackend()).to_python()
+    assert "_eval(" in function.source
+    assert function(Decimal(1), Decimal(2)) == Decimal(1) / Decimal(3) + 2
+    with pytest.raises(ArithmeticError) as ae:
+        Calc(input_string="1 + x / 0", backend=DecimalBackend()).to_python()(1)
+    assert ae.value.args[1] == 6
+
+
+def test_limits():
+    function = Calc(input_string="x ** 100", limits=Limits(max_bits=64)).to_python()
+    assert function(1) == 1
+    with pytest.raises(ArithmeticError) as ae:
+        function(3)
+    assert ae.value.args == ("result too large: over 64 bits", 2)
+
+
+def test_too_deep():
+    depth = MAX_DEPTH + 10
+    calc = Calc(input_string="(1 + " * depth + "x" + ")" * depth)
+    with pytest.raises(ValueError, match="too deeply nested"):
+        calc.to_python(optimize=False)
+
+
+_texts = st.text(alphabet="0123456789.+-*/%()xy ", max_size=20)
+
+
+@given(_texts, st.integers(-3, 3), st.floats(-3, 3))
+def test_same_as_program(text, x, y):
+    calc = Calc(prompt="", input_string=text)
+    program = _outcome(calc.compile, False)
+    if program == "syntax":
+        return
+    bindings = {name: x if name[0] == "x" else y for name in program.variables}
+    expected = _outcome(program.eval, bindings)
+    for optimize in (False, True):
+        function = calc.to_python(optimize)
+        args = [bindings[name] for name in function.variables]
+        value = _outcome(function, *args)
+        # Not their repr, which fails for the integers past Python's limit
+        #  on their digits, but 1 and 1.0 aren't the same, and NaN is
+        assert type(value) is type(expected)
+        assert value == expected or value != value and expected != expected
@@ -0,0 +1,30 @@
+from typing import Callable
+
+import pytest
+
+from calc.tree import GroupNode, NumNode, Tree, VarNode
+
+
+def _shape(node: Tree | None, positions: bool = False):
+    if node is None:
+        return None
+    if isinstance(node, (NumNode, VarNode)):
+        label = node.token.value
+    else:
+        label = "()" if type(node) is GroupNode else node.token.value.symbol
+    if positions:
+        label = (label, node.token.start, node.token.end)
+    if isinstance(node, (NumNode, VarNode)):
+        return label
+    return (label, _shape(node.left, positions), _shape(node.right, positions))
+
+
+@pytest.fixture(scope="session")
+def tree_shape() -> Callable:
+    """Nested tuples of a tree, to compare it with the expected one.
+
+    The numbers and variables are their values, and the operations are
+    `(symbol, left, right)` tuples, with "()" for the groups. With
+    `positions=True`, every value or symbol comes with its token's span.
+    """
+    return _shape
@@ -0,0 +1,112 @@
+from decimal import Decimal
+
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from calc import ErrorKind, EvalError, parse
+from calc.cse import FormulaSet
+from calc.limits import LimitedBackend, Limits
+from calc.numeric import FLOAT, DecimalBackend
+from calc.program import Program
+
+
+def _formulas(*texts: str, backend=FLOAT) -> FormulaSet:
+    return FormulaSet((parse(text, backend).tree for text in texts), backend)
+
+
+def test_shared():
+    formulas = _formulas("(a + b) ** 2", "1 + (a + b) ** 2", "[a + b] ** 2")
+    assert formulas.eval({"a": 1, "b": 2}) == [9, 10, 9]
+    assert formulas.formulas == 3
+    assert formulas.tree_nodes == 17
+    # a, b, a + b, 2, ** and 1, +
+    assert formulas.nodes == 7
+    assert formulas.ratio == 17 / 7
+
+
+def test_not_shared():
+    # The same value, but not the same literal or operation
+    formulas = _formulas("7 // 2", "7 // 2.5", "2 - 1", "1 - 2", "-x", "x")
+    assert formulas.eval({"x": 4}) == [3, 2.0, 1, -1, -4, 4]
+    assert formulas.nodes == 10
+
+
+def test_empty():
+    formulas = _formulas("", "1")
+    assert formulas.eval() == [None, 1]
+    assert _formulas().eval() == []
+    assert _formulas().ratio == 1.0
+
+
+@pytest.mark.parametrize(
+    "text, kind, position",
+    [
+        ("1 + y / (x - x)", ErrorKind.ARITHMETIC, 6),
+        ("x + z", ErrorKind.UNDEFINED_VARIABLE, 4),
+        ("x * (1 -)", ErrorKind.MISSING_OPERAND, 7),
+        ("x + * 1", ErrorKind.MISSING_OPERAND, 4),
+    ],
+)
+def test_errors(text, kind, position):
+    # The shared subtree fails, but every formula has its own position
+    formulas = _formulas("y / (x - x)", text, "x + 1")
+    values = formulas.eval({"x": 1, "y": 2}, errors="return")
+    assert values[0].args == ("division by zero", 2)
+    assert (values[1].kind, values[1].position) == (kind, position)
+    assert values[2] == 2
+
+    with pytest.raises(EvalError) as error:
+        formulas.eval({"x": 1, "y": 2})
+    assert error.value is not values[0]
+    assert error.value.args == ("division by zero", 2)
+
+    with pytest.raises(ValueError, match="unexpected error policy"):
+        formulas.eval(errors="mask")
+
+
+def test_backend():
+    formulas = _formulas("0.1 + 0.2", "(0.1 + 0.2) * 10", backend=DecimalBackend())
+    assert formulas.eval() == [Decimal("0.3"), Decimal("3.0")]
+
+    formulas = _formulas(
+        "x ** 100", "2 ** (x ** 100)", backend=LimitedBackend(FLOAT, Limits())
+    )
+    values = formulas.eval({"x": 2}, errors="return")
+    assert values[0] == 2**100
+    assert values[1].kind is ErrorKind.RESULT_TOO_LARGE
+
+
+def test_decimal_exponents_not_shared():
+    # Equal, but with different exponents, and so different results
+    formulas = _formulas("2 * 0.50", "2 * 0.5", backend=DecimalBackend())
+    values = formulas.eval()
+    assert [str(value) for value in values] == ["1.00", "1.0"]
+    assert formulas.nodes == 5
+
+
+_texts = st.text(alphabet="0123456789.+-*/%()xy ", max_size=12)
+
+
+@given(st.lists(_texts, max_size=8), st.integers(-3, 3), st.integers(-3, 3))
+def test_same_as_alone(texts, x, y):
+    trees = []
+    for text in texts:
+        try:
+            trees.append(parse(text).tree)
+        except SyntaxError:
+            pass
+
+    bindings = {"x": x, "y": y}
+    values = FormulaSet(trees).eval(bindings, errors="return")
+    for tree, value in zip(trees, values):
+        try:
+            expected = Program(tree).eval(bindings)
+        except EvalError as ee:
+            expected = ee.args
+        if isinstance(value, EvalError):
+            value = value.args
+        # Not their repr, which fails for the integers past Python's limit
+        #  on their digits, but 1 and 1.0 aren't the same, and NaN is
+        assert type(value) is type(expected)
+        assert value == expected or value != value and expected != expected
@@ -0,0 +1,193 @@
+import pickle
+
+import pytest
+
+from calc import Calc, CalcError, ErrorKind, EvalError, ParseError, evaluate, parse
+from calc.errors import locate
+from calc.limits import Limits
+
+
+@pytest.mark.parametrize(
+    "text, kind, position",
+    [
+        ("1 + $", ErrorKind.UNEXPECTED_TEXT, 4),
+        ("(1 + 2", ErrorKind.UNMATCHED_BRACKET, 0),
+        ("1 + 2)", ErrorKind.UNMATCHED_BRACKET, 5),
+        ("1 + 0b2", ErrorKind.INVALID_LITERAL, 4),
+        ("0xg", ErrorKind.INVALID_LITERAL, 0),
+    ],
+)
+def test_parse_error(text, kind, position):
+    with pytest.raises(ParseError) as error:
+        parse(text)
+    assert error.value.kind is kind
+    assert error.value.position == position
+    assert error.value.msg == position * " " + "^\n" + error.value.message
+
+
+def test_tokens():
+    with pytest.raises(ParseError) as error:
+        parse("1 + $")
+    assert error.value.token == "$"
+    with pytest.raises(ParseError) as error:
+        parse("1 + (2")
+    assert error.value.token.start == 4
+    error = Calc(input_string="1 + x", errors="return").result
+    assert error.token.value.name == "x"
+
+
+def test_limits_kinds():
+    with pytest.raises(ParseError) as error:
+        parse("1 + 2 + 3", limits=Limits(max_tokens=3))
+    assert error.value.kind is ErrorKind.TOO_MANY_TOKENS
+    with pytest.raises(ParseError) as error:
+        parse("((1))", limits=Limits(max_depth=1))
+    assert error.value.kind is ErrorKind.TOO_DEEPLY_NESTED
+    with pytest.raises(EvalError) as error:
+        evaluate("2 ** 100000", limits=Limits())
+    assert error.value.kind is ErrorKind.RESULT_TOO_LARGE
+    assert error.value.position == 2
+
+
+@pytest.mark.parametrize(
+    "text, kind, position",
+    [
+        ("1 / 0", ErrorKind.ARITHMETIC, 2),
+        ("1 + x", ErrorKind.UNDEFINED_VARIABLE, 4),
+        ("1 +", ErrorKind.MISSING_OPERAND, 2),
+        ("* 1", ErrorKind.MISSING_OPERAND, 0),
+    ],
+)
+def test_eval_error(text, kind, position):
+    expression = parse(text)
+    evaluations = [
+        expression.eval,
+        expression.compile(optimize=False).eval,
+        expression.memoize().eval,
+        Calc(input_string=text, errors="raise")._eval,
+    ]
+    # The native functions take all their variables
+    if not expression.variables:
+        evaluations.append(expression.to_python(optimize=False))
+    for evaluate_ in evaluations:
+        with pytest.raises(EvalError) as error:
+            evaluate_()
+        assert error.value.kind is kind
+        assert error.value.position == position
+        # As the ArithmeticError raised before
+        assert isinstance(error.value, ArithmeticError)
+        assert error.value.args[1] == position
+
+
+def test_missing_rhs():
+    text = "2 * (1 - 3 +)"
+    expression = parse(text)
+    evaluations = [
+        expression.eval,
+        expression.compile(optimize=False).eval,
+        expression.memoize().eval,
+        expression.to_python(optimize=False),
+        Calc(input_string=text, errors="raise")._eval,
+    ]
+    for evaluate_ in evaluations:
+        with pytest.raises(EvalError) as error:
+            evaluate_()
+        assert error.value.args == ("missing the right-hand-side for '+'", 11)
+        assert error.value.kind is ErrorKind.MISSING_OPERAND
+        assert error.value.token.start == 11
+
+
+def test_overflow():
+    # OverflowError has the error number as its first argument
+    for evaluate_ in (evaluate, lambda text: parse(text).to_python()()):
+        with pytest.raises(EvalError) as error:
+            evaluate_("1 + 1.5 ** 10000")
+        assert error.value.args == ("Numerical result out of range", 8)
+    assert Calc(input_string="1 + 1.5 ** 10000", errors="return").result.position == 8
+
+
+def test_locate():
+    error = EvalError("time limit exceeded", kind=ErrorKind.TIME_LIMIT)
+    assert str(error) == "time limit exceeded"
+    located = locate(error, 3)
+    assert located.kind is ErrorKind.TIME_LIMIT
+    assert located.args == ("time limit exceeded", 3)
+    assert locate(located, 5) is located
+    assert locate(ZeroDivisionError("division by zero"), 1).args == (
+        "division by zero",
+        1,
+    )
+
+
+def test_lazy_caret():
+    error = ParseError("unmatched '(' at 2", 2, ErrorKind.UNMATCHED_BRACKET, "(")
+    assert error.message == "unmatched '(' at 2"
+    assert str(error) == error.msg == "  ^\nunmatched '(' at 2"
+    error.indent = 3
+    assert str(error) == "     ^\nunmatched '(' at 2"
+    assert isinstance(error, (CalcError, SyntaxError))
+
+
+def test_pickle():
+    error = EvalError("division by zero", 2, ErrorKind.ARITHMETIC)
+    error.indent = 4
+    copy = pickle.loads(pickle.dumps(error))
+    assert type(copy) is EvalError
+    assert (copy.message, copy.position, copy.kind) == (
+        "division by zero",
+        2,
+        error.kind,
+    )
+    assert str(copy) == str(error)
+    copy = pickle.loads(pickle.dumps(ParseError("x", 0, ErrorKind.UNEXPECTED_TEXT)))
+    assert copy.kind is ErrorKind.UNEXPECTED_TEXT
+
+
+def test_calc_print(capsys):
+    calc = Calc(prompt="> ", input_string="1 + 1/0")
+    assert calc.result is None
+    assert capsys.readouterr().out == "       ^\ndivision by zero\n"
+    with pytest.raises(SyntaxError) as error:
+        calc.input = "1 + (2"
+        calc.result
+    assert error.value.msg == "      ^\nunmatched '(' at 4"
+
+
+def test_calc_raise():
+    calc = Calc(prompt="> ", input_string="1 + 1/0", errors="raise")
+    with pytest.raises(EvalError) as error:
+        calc.result
+    assert str(error.value) == "       ^\ndivision by zero"
+
+
+def test_calc_return(capsys):
+    calc = Calc(prompt="> ", input_string="1 + 1/0", errors="return", stats=True)
+    error = calc.result
+    assert isinstance(error, EvalError)
+    assert (error.kind, error.position) == (ErrorKind.ARITHMETIC, 5)
+    assert calc.result is error
+
+    calc.input = "1 + (2"
+    error = calc.result
+    assert isinstance(error, ParseError)
+    assert error.kind is ErrorKind.UNMATCHED_BRACKET
+    assert str(error) == "      ^\nunmatched '(' at 4"
+
+    calc.input = "1 + 0o9"
+    error = calc.result
+    assert isinstance(error, ParseError)
+    assert (error.kind, error.position, error.token) == (
+        ErrorKind.INVALID_LITERAL,
+        4,
+        "0o9",
+    )
+
+    calc.input = "1 + 2"
+    assert calc.result == 3
+    assert capsys.readouterr().out == ""
+    assert calc.stats.failures == 3
+
+
+def test_calc_invalid_errors():
+    with pytest.raises(ValueError, match="errors must be one of"):
+        Calc(errors="ignore")
@@ -0,0 +1,95 @@
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+import pytest
+
+from calc import Calc, Expression, evaluate, parse
+from calc.cache import ParseCache
+from calc.limits import Limits
+from calc.numeric import DecimalBackend
+
+
+def test_evaluate():
+    assert evaluate("2 * (3 + 4)") == 14
+    assert evaluate("x * 2 + y", {"x": 3, "y": 4}) == 10
+    assert evaluate("  ") is None
+    assert evaluate("0.1 + 0.2", backend=DecimalBackend()) == Decimal("0.3")
+
+
+def test_parse():
+    expression = parse("(x + 1) * y  ")
+    assert isinstance(expression, Expression)
+    assert expression.text == "(x + 1) * y"
+    assert len(expression.tokens) == 7
+    assert expression.variables == ("x", "y")
+    assert expression(x=1, y=3) == expression.eval({"x": 1, "y": 3}) == 6
+    assert expression.compile()(x=2, y=2) == expression.to_python()(2, 2) == 6
+    assert expression.memoize({"x": 0, "y": 5}).eval() == 5
+    assert repr(expression) == "Expression('(x + 1) * y')"
+
+
+def test_immutable():
+    expression = parse("1 + 2")
+    with pytest.raises(AttributeError):
+        expression.text = "3"
+    with pytest.raises(AttributeError):
+        expression.cache = None
+
+
+def test_errors():
+    with pytest.raises(SyntaxError) as error:
+        parse("1 + (2")
+    assert error.value.msg == "    ^\nunmatched '(' at 4"
+
+    with pytest.raises(ArithmeticError) as error:
+        evaluate("1 + 1/0")
+    assert error.value.args == ("division by zero", 5)
+
+    with pytest.raises(ArithmeticError) as error:
+        evaluate("2 ** 100000", limits=Limits())
+    assert error.value.args == ("result too large: over 65536 bits", 2)
+
+
+def test_cache():
+    cache = ParseCache()
+    first = parse("x * 2", cache=cache)
+    second = parse("x * 2 ", cache=cache)
+    assert first.compile() is second.compile()
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # Keyed by the backend and the limits
+    parse("x * 2", limits=Limits(), cache=cache)
+    assert len(cache) == 2
+
+    # Shared with the calculators
+    calc = Calc(input_string="x * 2", cache=cache)
+    assert calc.compile() is first.compile()
+
+
+def test_calc_expression():
+    calc = Calc(prompt="> ", input_string="1 + 2")
+    expression = calc.expression
+    calc.input = "3 * 4"
+    assert calc.result == 12
+    assert expression.eval() == 3
+    assert calc.expression.eval() == 12
+
+
+def test_threads():
+    cache = ParseCache(maxsize=16)
+    texts = [f"x * {i} + (y - {i % 7})" for i in range(200)]
+    shared = parse("x * 2 + y", limits=Limits(time_budget=60))
+
+    def run(i: int):
+        text = texts[i % len(texts)]
+        value = evaluate(text, {"x": i, "y": 1}, limits=Limits(), cache=cache)
+        return value, shared(x=i, y=1)
+
+    with ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(run, range(2_000)))
+
+    for i, (value, shared_value) in enumerate(results):
+        j = i % len(texts)
+        assert value == i * j + (1 - j % 7)
+        assert shared_value == i * 2 + 1
+    assert cache.hits + cache.misses == 2_000
@@ -0,0 +1,212 @@
+from decimal import Decimal
+from fractions import Fraction
+
+import pytest
+
+from calc import Calc, ErrorKind
+from calc.cache import ParseCache
+from calc.limits import LimitedBackend, Limits
+from calc.numeric import FLOAT, DecimalBackend, FractionBackend
+from calc.op import Op
+
+
+def _errors(text: str, limits: Limits, **kwargs) -> list:
+    calc = Calc(prompt="", input_string=text, limits=limits, **kwargs)
+    errors = []
+    for evaluate in (
+        lambda: calc.compile()(),
+        lambda: calc.compile(optimize=False)(),
+        lambda: calc.memoize().eval(),
+    ):
+        with pytest.raises(ArithmeticError) as error:
+            evaluate()
+        errors.append(error.value.args)
+    return errors
+
+
+@pytest.mark.parametrize(
+    "text, position",
+    [
+        ("9**(9**9)", 1),
+        ("1 + 2**100000", 5),
+        ("(2**40000) * (3**30000)", 11),
+        ("2**65535 + 2**65535", 9),
+    ],
+)
+def test_too_large(text, position):
+    message = "result too large: over 65536 bits"
+    assert _errors(text, Limits()) == [(message, position)] * 3
+
+
+def test_too_large_printed(capsys):
+    calc = Calc(prompt="> ", input_string="1 + 9**(9**9)", limits=Limits())
+    assert calc.result is None
+    assert capsys.readouterr().out == "       ^\nresult too large: over 65536 bits\n"
+
+
+_WITHIN_LIMITS = [
+    ("2**65535", 2**65535),
+    ("2**65535 - 1 + 2**65535", 2**65536 - 1),
+    ("(-1)**1000000001", -1),
+    ("0**1000000000", 0),
+    ("2**-1000000000", 0.0),
+    ("2.0**1000", 2.0**1000),
+    ("(2**30000 + 1) * (2**30000 + 1)", (2**30000 + 1) ** 2),
+]
+
+
+# The big integers are too long for the test ids
+@pytest.mark.parametrize(
+    "text, expected", _WITHIN_LIMITS, ids=[text for text, _ in _WITHIN_LIMITS]
+)
+def test_within_limits(text, expected):
+    calc = Calc(input_string=text, limits=Limits())
+    assert calc.compile()() == calc.compile(optimize=False)() == expected
+    assert calc.memoize().eval() == calc.result == expected
+
+
+def test_fractions():
+    assert (
+        _errors("(2/3)**100000", Limits(), backend=FractionBackend())
+        == [("result too large: over 65536 bits", 5)] * 3
+    )
+
+    calc = Calc(input_string="(2/3)**-1000", limits=Limits(), backend=FractionBackend())
+    assert calc.result == Fraction(3, 2) ** 1000
+
+
+def test_decimal_unaffected():
+    calc = Calc(input_string="9**(9**9)", limits=Limits(), backend=DecimalBackend())
+    with pytest.raises(ArithmeticError, match="out of range"):
+        calc.compile()()
+
+
+def test_max_bits():
+    assert (
+        _errors("2**20", Limits(max_bits=20))
+        == [("result too large: over 20 bits", 1)] * 3
+    )
+    assert Calc(input_string="2**20", limits=Limits(max_bits=None)).result == 2**20
+
+
+@pytest.mark.parametrize(
+    "text, backend",
+    [
+        ("1 + 0x" + "f" * 20_000, FLOAT),
+        ("1 + 0b1" + "0" * 65_536, DecimalBackend()),
+        ("1 + 1e3000000", FractionBackend()),
+        ("1 + 1e-3000000", FractionBackend()),
+        ("1 + 12345.6789e100000", FractionBackend()),
+    ],
+    ids=["hex", "binary", "exponent", "negative exponent", "mantissa"],
+)
+def test_literal_too_large(text, backend):
+    calc = Calc(prompt="", input_string=text, limits=Limits(), backend=backend)
+    with pytest.raises(SyntaxError) as error:
+        calc.result
+    assert error.value.kind is ErrorKind.LITERAL_TOO_LARGE
+    assert error.value.position == 4
+    assert error.value.message == "literal too large: over 65536 bits"
+
+
+def test_literal_within_limits():
+    limits = Limits()
+    assert Calc(input_string="0x" + "f" * 16_384, limits=limits).result == (
+        2**65536 - 1
+    )
+    assert Calc(input_string="0x000" + "1" * 3, limits=limits).result == 0x111
+    # Only the exact literals grow with their exponents
+    assert Calc(input_string="1e400", limits=limits).result == float("inf")
+    assert Calc(
+        input_string="1e400", limits=limits, backend=DecimalBackend()
+    ).result == Decimal("1e400")
+    calc = Calc(input_string="0.5e-10", limits=limits, backend=FractionBackend())
+    assert calc.result == Fraction(1, 2 * 10**10)
+
+
+def test_bound_variables():
+    program = Calc(input_string="x * x", limits=Limits(max_bits=101)).compile()
+    assert program(x=2**50) == 2**100
+    with pytest.raises(ArithmeticError) as error:
+        program(x=2**60)
+    assert error.value.args == ("result too large: over 101 bits", 2)
+
+
+def test_tree_through_backend():
+    calc = Calc(input_string="x * x", limits=Limits(max_bits=101))
+    calc._build_tree()
+    backend = LimitedBackend(FLOAT, Limits(max_bits=101))
+    assert calc._tree.eval({"x": 2**50}, backend) == 2**100
+    with pytest.raises(ArithmeticError) as error:
+        calc._tree.eval({"x": 2**60}, backend)
+    assert error.value.args == ("result too large: over 101 bits", 2)
+    # Without a backend, the operations themselves
+    assert calc._tree.eval({"x": 2**60}) == 2**120
+
+
+def test_max_tokens():
+    calc = Calc(prompt="> ", input_string="1 + 2 + 3", limits=Limits(max_tokens=4))
+    with pytest.raises(SyntaxError) as error:
+        calc.result
+    assert error.value.msg == "          ^\ntoo many tokens at 8, the maximum is 4"
+
+    calc.input = "1 + 2"
+    assert calc.result == 3
+
+
+def test_max_depth():
+    calc = Calc(prompt="> ", input_string="((1) + [{2}])", limits=Limits(max_depth=2))
+    with pytest.raises(SyntaxError) as error:
+        calc.result
+    assert error.value.msg == (
+        "          ^\ntoo deeply nested '{' at 8, the maximum depth is 2"
+    )
+
+    calc.input = "((1) + [2])"
+    assert calc.result == 3
+    # The reused groups are still within the limit
+    calc.input = "((1) + [2]) * (3)"
+    assert calc.result == 9
+
+
+def test_deep_nesting_unlimited():
+    depth = 5_000
+    calc = Calc(input_string="(" * depth + "1" + ")" * depth)
+    assert calc.result == 1
+    calc = Calc(input_string="(" * depth + "1" + ")" * depth, limits=Limits())
+    with pytest.raises(SyntaxError, match="the maximum depth is 1000"):
+        calc.result
+
+
+def test_time_budget(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr("calc.limits.monotonic", lambda: now[0])
+    backend = LimitedBackend(FLOAT, Limits(time_budget=1.0))
+
+    backend.begin()
+    assert backend.eval(Op.ADD, 1, 2) == 3
+    now[0] = 2.0
+    with pytest.raises(ArithmeticError, match="time limit exceeded"):
+        backend.eval(Op.ADD, 1, 2)
+
+    # Every evaluation gets the whole budget
+    backend.begin()
+    assert backend.eval(Op.ADD, 1, 2) == 3
+
+
+def test_time_budget_exceeded():
+    program = Calc(input_string="1 + 2 * 3", limits=Limits(time_budget=-1.0)).compile(
+        optimize=False
+    )
+    with pytest.raises(ArithmeticError) as error:
+        program()
+    assert error.value.args == ("time limit exceeded", 6)
+
+
+def test_cache_keyed_by_limits():
+    cache = ParseCache()
+    text = "(((1)))"
+    assert Calc(input_string=text, cache=cache).result == 1
+    with pytest.raises(SyntaxError):
+        Calc(input_string=text, cache=cache, limits=Limits(max_depth=2)).result
+    assert Calc(input_string=text, cache=cache, limits=Limits()).result == 1
@@ -0,0 +1,66 @@
+import importlib.util
+import io
+import json
+from decimal import Decimal
+from pathlib import Path
+
+# The command line is the package's __main__.py, next to the calc package
+_spec = importlib.util.spec_from_file_location(
+    "calc_main", Path(__file__).parents[2] / "__main__.py"
+)
+calc_main = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(calc_main)
+
+# A complex result and a bad line in the middle of a chunk, which is written all at once
+LINES = (
+    "1 + 2\n9 ** 5000\n(-8) ** 0.5 // 1\n(-1) ** 0.5\n9 ** (9 ** 9)\n1 / 0\n\n4\n"
+    "1.7976931348623157e308 * 1.5\n1e308 * 10.5 - 1e308 * 10.5\n(1 +\n"
+)
+
+
+def _batch(text: str, output_format: str) -> str:
+    stdout = io.StringIO()
+    calc_main.batch(io.StringIO(text), stdout, output_format)
+    return stdout.getvalue()
+
+
+def test_plain():
+    assert _batch(LINES, "plain").splitlines() == [
+        "3",
+        str(Decimal(9**5000)),
+        "error: unsupported operand type(s) for //: 'complex' and 'int'",
+        str((-1) ** 0.5),
+        "error at 2: result too large: over 65536 bits",
+        "error at 2: division by zero",
+        "",
+        "4",
+        "inf",
+        "nan",
+        "error at 0: unmatched '(' at 0",
+    ]
+
+
+def test_jsonl():
+    records = [json.loads(line) for line in _batch(LINES, "jsonl").splitlines()]
+    assert records == [
+        {"result": 3},
+        {"result": str(Decimal(9**5000))},
+        {
+            "error": "unsupported operand type(s) for //: 'complex' and 'int'",
+            "position": None,
+        },
+        {"result": str((-1) ** 0.5)},
+        {"error": "result too large: over 65536 bits", "position": 2},
+        {"error": "division by zero", "position": 2},
+        {"result": None},
+        {"result": 4},
+        {"result": "inf"},
+        {"result": "nan"},
+        {"error": "unmatched '(' at 0", "position": 0},
+    ]
+
+
+def test_chunks(monkeypatch):
+    monkeypatch.setattr(calc_main, "CHUNK_SIZE", 8)
+    lines = "".join(f"{i} * 2\n" for i in range(50))
+    assert _batch(lines, "plain") == "".join(f"{i * 2}\n" for i in range(50))
@@ -0,0 +1,89 @@
+import math
+from array import array
+from decimal import Decimal
+
+import pytest
+
+from calc import Calc
+from calc.limits import Limits
+from calc.mapped import evaluate_mapped, lines, write_mapped
+from calc.numeric import DecimalBackend
+from calc.parser import Parser
+
+
+def test_lines():
+    assert [bytes(line) for line in lines(b"1 + 2\n\n3\r\n4")] == [
+        b"1 + 2",
+        b"",
+        b"3\r",
+        b"4",
+    ]
+    assert [bytes(line) for line in lines(b"1\n")] == [b"1"]
+    assert list(lines(b"")) == []
+
+
+def test_tokenize_bytes():
+    parser = Parser()
+    text = "(x + 0x1f) * 2.5e1 // y_2 % 3 ** 4"
+    assert parser.tokenize(memoryview(text.encode())) == parser.tokenize(text)
+
+
+def test_evaluate_mapped(tmp_path):
+    path = tmp_path / "expressions.txt"
+    path.write_bytes(b"2 * (3 + 4)\n\n1 / 0\n1 + (2\n0b2\n1.5 + $\n9 ** (9 ** 9)\n7")
+    values = evaluate_mapped(path)
+    assert values[0] == 14 and values[-1] == 7
+    assert all(math.isnan(value) for value in values[1:-1])
+    assert len(values) == 8
+
+
+def test_complex(tmp_path):
+    # A complex result, and an operation rejecting one
+    path = tmp_path / "expressions.txt"
+    path.write_text("(-8) ** 0.5\n(-8) ** 0.5 // 1\n2\n")
+    values = evaluate_mapped(path)
+    assert math.isnan(values[0]) and math.isnan(values[1])
+    assert values[2] == 2
+
+
+def test_same_as_calc(tmp_path):
+    texts = ["1 + 2 * 3", "-4 // 3", "2 ** 0.5", "(1 + 2) % [7 - 5]", "1e300 * 10"]
+    path = tmp_path / "expressions.txt"
+    path.write_text("\n".join(texts) + "\n")
+    assert list(evaluate_mapped(path)) == [
+        float(Calc(input_string=text).result) for text in texts
+    ]
+
+
+def test_backend_and_limits(tmp_path):
+    path = tmp_path / "expressions.txt"
+    path.write_text("0.1 + 0.2\n1 + 2 + 3\n")
+    values = evaluate_mapped(path, backend=DecimalBackend())
+    assert values[0] == float(Decimal("0.3"))
+    values = evaluate_mapped(path, limits=Limits(max_tokens=3))
+    assert math.isnan(values[1])
+
+
+def test_empty(tmp_path):
+    path = tmp_path / "expressions.txt"
+    path.write_bytes(b"")
+    assert evaluate_mapped(path) == array("d")
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 1_000])
+def test_write_mapped(tmp_path, chunk_size):
+    path = tmp_path / "expressions.txt"
+    path.write_text("\n".join(f"{i} * 2" for i in range(5)))
+    output = tmp_path / "values.bin"
+    with open(output, "wb") as file:
+        assert write_mapped(path, file, chunk_size=chunk_size) == 5
+
+    values = array("d")
+    with open(output, "rb") as file:
+        values.fromfile(file, 5)
+    assert list(values) == [0, 2, 4, 6, 8]
+
+
+def test_chunk_size(tmp_path):
+    with pytest.raises(ValueError, match="chunk size"):
+        write_mapped(tmp_path / "expressions.txt", None, chunk_size=0)
@@ -0,0 +1,126 @@
+import pytest
+
+from calc import Calc
+from calc.memo import MemoizedTree
+from calc.op import Op
+from calc.token import Token
+from calc.tree import NumNode
+
+
+@pytest.fixture
+def evaluated(monkeypatch) -> list:
+    evaluated = []
+    op_eval = Op.eval
+
+    def recording_eval(self, lhs, rhs):
+        evaluated.append(self)
+        return op_eval(self, lhs, rhs)
+
+    monkeypatch.setattr(Op, "eval", recording_eval)
+    return evaluated
+
+
+def _memoize(text: str, **bindings) -> MemoizedTree:
+    return Calc(input_string=text).memoize(bindings)
+
+
+def test_empty():
+    assert _memoize("").eval() is None
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["2 * (3 + 4) + 7 * 2**2", "3 * --2", "-2 ** 2", "7 // 2 % 3 - 1 / 4", "(5)"],
+)
+def test_same_as_tree(text):
+    calc = Calc(input_string=text)
+    assert calc.memoize().eval() == calc.result
+
+
+def test_bind_evaluates_path(evaluated):
+    formula = _memoize("(a + b) * (c - d) + e", a=1, b=2, c=3, d=4, e=5)
+    assert formula.eval() == 2
+    assert len(evaluated) == 4
+
+    evaluated.clear()
+    formula.bind(c=10)
+    assert formula.eval() == 23
+    assert evaluated == [Op.SUB, Op.MULT, Op.ADD]
+
+    evaluated.clear()
+    assert formula.eval() == 23
+    assert evaluated == []
+
+    formula.bind(e=0, a=0)
+    assert formula.eval() == 12
+    assert evaluated == [Op.ADD, Op.MULT, Op.ADD]
+    assert formula.bindings == {"a": 0, "b": 2, "c": 10, "d": 4, "e": 0}
+
+
+def test_repeated_variable(evaluated):
+    formula = _memoize("x * x + 1 + y", x=2, y=0)
+    assert formula.eval() == 5
+
+    evaluated.clear()
+    formula.bind(x=3)
+    assert formula.eval() == 10
+    assert evaluated == [Op.MULT, Op.ADD, Op.ADD]
+
+
+def test_errors_stay_dirty():
+    formula = _memoize("(1 + x) / y + z", z=1)
+    with pytest.raises(ArithmeticError) as ae:
+        formula.eval()
+    assert ae.value.args == ("undefined variable 'x'", 5)
+
+    formula.bind(x=1, y=0)
+    with pytest.raises(ArithmeticError) as ae:
+        formula.eval()
+    assert ae.value.args == ("division by zero", 8)
+
+    formula.bind(y=4)
+    assert formula.eval() == 1.5
+
+
+def test_missing_rhs_first():
+    formula = _memoize("1 / 0 -")
+    with pytest.raises(ArithmeticError) as ae:
+        formula.eval()
+    assert ae.value.args == ("missing the right-hand-side for '-'", 6)
+
+
+def test_replace(evaluated):
+    calc = Calc(input_string="(1 + 2) * (3 + 4) - 5")
+    formula = calc.memoize()
+    assert formula.eval() == 16
+
+    # (3 + 4) => 10
+    group = calc._tree.left.right
+    evaluated.clear()
+    formula.replace(group, NumNode(Token(10, 10, 17)))
+    assert formula.eval() == 25
+    assert evaluated == [Op.MULT, Op.SUB]
+    assert calc._tree.left.right is group
+
+    with pytest.raises(ValueError, match="isn't a node of the tree"):
+        formula.replace(group, NumNode(Token(0, 0, 1)))
+
+    formula.replace(calc._tree, NumNode(Token(7, 0, 1)))
+    assert formula.eval() == 7
+
+
+def test_replace_with_variables():
+    calc = Calc(input_string="x + y")
+    formula = calc.memoize({"x": 1, "y": 2})
+    assert formula.eval() == 3
+
+    other = Calc(input_string="y * 10")
+    other._build_tree()
+    formula.replace(calc._tree.left, other._tree)
+    assert formula.eval() == 22
+
+    # x isn't in the tree anymore
+    formula.bind(x=100)
+    assert formula.eval() == 22
+    formula.bind(y=1)
+    assert formula.eval() == 11
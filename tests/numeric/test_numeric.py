@@ -0,0 +1,151 @@
+import decimal
+from decimal import Decimal
+from fractions import Fraction
+
+import pytest
+
+from calc import Calc
+from calc.cache import ParseCache
+from calc.numeric import (
+    FLOAT,
+    DecimalBackend,
+    FloatBackend,
+    FractionBackend,
+    NumericBackend,
+)
+
+BACKENDS = [FloatBackend(), DecimalBackend(), FractionBackend()]
+
+
+def _results(text: str, backend: NumericBackend, **bindings) -> list:
+    calc = Calc(input_string=text, backend=backend)
+    return [
+        calc.compile()(**bindings),
+        calc.compile(optimize=False)(**bindings),
+        calc.memoize(bindings).eval(),
+    ]
+
+
+def test_float_literals():
+    calc = Calc(input_string="1 + 2.0 + 1e3 + 0x10 + 1234567890123456789")
+    assert calc.backend is FLOAT
+    calc._build_tree()
+    # The long integers go through float
+    assert [token.value for token in calc._tokens[::2]] == [
+        1,
+        2,
+        1000,
+        16,
+        int(float(1234567890123456789)),
+    ]
+
+
+@pytest.mark.parametrize(
+    "backend, expected",
+    [
+        (DecimalBackend(), Decimal("0.3")),
+        (FractionBackend(), Fraction(3, 10)),
+    ],
+)
+def test_exact(backend, expected):
+    assert _results("0.1 + 0.2", backend) == [expected] * 3
+    assert _results("0.1 + 0.2", FloatBackend()) == [0.1 + 0.2] * 3
+    assert Calc(input_string="0.1 + 0.2", backend=backend).result == expected
+
+
+def test_decimal_literals():
+    calc = Calc(input_string="12 + 1.50 + .5e1 + 0b11", backend=DecimalBackend())
+    calc._build_tree()
+    assert [token.value for token in calc._tokens[::2]] == [
+        Decimal("12"),
+        Decimal("1.50"),
+        Decimal("5"),
+        Decimal("3"),
+    ]
+    assert calc.result == Decimal("21.50")
+
+
+def test_decimal_context():
+    context = decimal.Context(prec=5, rounding=decimal.ROUND_DOWN)
+    backend = DecimalBackend(context)
+    assert backend.context is context
+    assert _results("2 / 3 + x", backend, x=Decimal(1)) == [Decimal("1.6666")] * 3
+
+
+def test_fraction_literals():
+    calc = Calc(input_string="1.5e-3 * 2 // (1/3)", backend=FractionBackend())
+    assert calc.result == 0
+    calc.input = "1.5e-3 * 2 / (1/3)"
+    assert calc.result == Fraction(9, 1000)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize(
+    "text, message, position",
+    [
+        ("1 + 2 / (3 - 3)", "division by zero", 6),
+        ("* 2", "missing the left-hand-side for '*'", 0),
+        ("2 * -", "missing the right-hand-side for '-'", 4),
+    ],
+)
+def test_errors(backend, text, message, position):
+    calc = Calc(input_string=text, backend=backend)
+    for evaluate in (calc.compile(optimize=False), calc.memoize().eval):
+        with pytest.raises(ArithmeticError) as ae:
+            evaluate()
+        assert ae.value.args == (message, position)
+
+
+def test_decimal_errors():
+    backend = DecimalBackend(decimal.Context(Emax=10))
+    with pytest.raises(ArithmeticError) as ae:
+        Calc(input_string="10 ** 20", backend=backend).compile()()
+    assert ae.value.args == ("numerical result out of range", 3)
+
+    with pytest.raises(ArithmeticError) as ae:
+        Calc(input_string="(-1) ** 0.5", backend=backend).compile()()
+    assert ae.value.args == ("invalid operation", 5)
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("7 // -2", -4),
+        ("7 % -2", -1),
+        ("(-7) // 2", -4),
+        ("(-7) % 2", 1),
+        ("7.5 % -2", -0.5),
+        ("6 % -2", 0),
+        ("0 ** 0", 1),
+    ],
+)
+def test_same_results(text, expected):
+    # Floored like Python's numbers, whatever the backend
+    for backend in BACKENDS:
+        assert _results(text, backend) == [expected] * 3
+
+
+@pytest.mark.parametrize("text", ["10 % 0", "10 // 0", "0 % 0", "0 / 0", "0 ** -1"])
+def test_same_errors(text):
+    # The exact backends have the same message, Python's numbers their own
+    messages = set()
+    for backend in BACKENDS:
+        with pytest.raises(ArithmeticError) as ae:
+            Calc(input_string=text, backend=backend).compile(optimize=False)()
+        if not isinstance(backend, FloatBackend):
+            messages.add(ae.value.args[0])
+    assert messages == {"division by zero"}
+
+
+def test_unary():
+    for backend in BACKENDS:
+        assert _results("--2 - -x", backend, x=backend.integer("1")) == [3] * 3
+
+
+def test_cache_per_backend():
+    cache = ParseCache()
+    float_calc = Calc(input_string="0.5", cache=cache)
+    decimal_calc = Calc(input_string="0.5", cache=cache, backend=DecimalBackend())
+    assert type(float_calc.result) is float
+    assert type(decimal_calc.result) is Decimal
+    assert len(cache) == 2
@@ -1,4 +1,9 @@
+from decimal import Decimal
+from fractions import Fraction
+
 import pytest
+
+from calc.errors import ErrorKind, EvalError
 from calc.op import Op, OpWithPrecedence
 
 
@@ -14,6 +19,83 @@ def test_eval():
     assert Op.EXP.eval(2, 2) == 4
 
 
+def _match_eval(op: Op, lhs, rhs):
+    # The dispatch on the symbol that the bound functions replace
+    if op.symbol not in "+-" and lhs is None:
+        raise EvalError(
+            f"missing the left-hand-side for '{op.symbol}'",
+            kind=ErrorKind.MISSING_OPERAND,
+        )
+
+    match op.symbol:
+        case "+":
+            return (lhs or 0) + rhs
+        case "-":
+            return (lhs or 0) - rhs
+        case "*":
+            return lhs * rhs
+        case "/":
+            return lhs / rhs
+        case "//":
+            return lhs // rhs
+        case "%":
+            return lhs % rhs
+        case "**":
+            return lhs**rhs
+
+
+def _outcome(func, *args):
+    try:
+        value = func(*args)
+    except Exception as error:
+        return type(error), error.args
+    # repr tells 0 from 0.0 and -0.0
+    return type(value), repr(value)
+
+
+_operands = [
+    (7, 2),
+    (-7, 2),
+    (7, -2),
+    (-7, -2),
+    (7.5, -2),
+    (-7.5, 2.5),
+    (0.0, -0.0),
+    (-0.0, 3),
+    (7, 0),
+    (7.5, 0.0),
+    (0, 0),
+    (-8, 0.5),
+    (0, -1),
+    (Fraction(-7, 2), Fraction(1, 3)),
+    (Decimal("-7"), Decimal("2")),
+]
+
+
+@pytest.mark.parametrize("op", list(Op))
+@pytest.mark.parametrize("lhs, rhs", _operands)
+def test_binary_as_match(op, lhs, rhs):
+    assert _outcome(op.binary, lhs, rhs) == _outcome(_match_eval, op, lhs, rhs)
+    assert _outcome(op.eval, lhs, rhs) == _outcome(_match_eval, op, lhs, rhs)
+
+
+@pytest.mark.parametrize("op", list(Op))
+@pytest.mark.parametrize("rhs", [2, -2.5, 0.0, -0.0, Fraction(1, 3)])
+def test_unary_as_match(op, rhs):
+    assert _outcome(op.unary, rhs) == _outcome(_match_eval, op, None, rhs)
+    assert _outcome(op.eval, None, rhs) == _outcome(_match_eval, op, None, rhs)
+
+
+def test_floored():
+    # Floored towards negative infinity, with the sign of the divisor
+    assert (Op.DIV_INT.binary(-7, 2), Op.MOD.binary(-7, 2)) == (-4, 1)
+    assert (Op.DIV_INT.binary(7, -2), Op.MOD.binary(7, -2)) == (-4, -1)
+    assert (Op.DIV_INT.binary(-7.5, 2), Op.MOD.binary(-7.5, 2)) == (-4.0, 0.5)
+    for op in (Op.DIV, Op.DIV_INT, Op.MOD):
+        with pytest.raises(ZeroDivisionError):
+            op.binary(7, 0)
+
+
 def test_eval_mult_missing_args():
     with pytest.raises(ArithmeticError, match=r"missing the left-hand-side for '\*'"):
         Op.MULT.eval(rhs=2)
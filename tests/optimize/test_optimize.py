@@ -0,0 +1,89 @@
+from decimal import Decimal
+from numbers import Number
+from typing import Callable
+
+import pytest
+
+from calc import Calc
+from calc.optimize import optimize
+from calc.tree import GroupNode, NumNode, OpNode, Tree, VarNode
+from calc.var import Var
+
+
+def _optimized(text: str) -> Tree | None:
+    calc = Calc(input_string=text)
+    calc._build_tree()
+    return optimize(calc._tree)
+
+
+def test_empty():
+    assert optimize(None) is None
+
+
+def test_fold_constants():
+    tree = _optimized("2**10 * (3 + 4)")
+    assert type(tree) is NumNode
+    assert tree.token.value == 7168
+    assert (tree.token.start, tree.token.end) == (0, 14)
+
+
+def test_fold_inside_formula(tree_shape: Callable):
+    tree = _optimized("x - 2**10 * (3 + 4)")
+    assert tree_shape(tree) == ("-", Var("x"), 7168)
+
+
+def test_fold_unary():
+    assert _optimized("-(2 + 3)").token.value == -5
+
+
+@pytest.mark.parametrize("text", ["x * 1", "1 * x", "x**1"])
+def test_identities(text: str):
+    assert type(_optimized(text)) is VarNode
+
+
+@pytest.mark.parametrize("text", ["x + 0", "0 + x", "x - 0", "+x", "--x"])
+@pytest.mark.parametrize("x", [0.0, -0.0, Decimal("0.00"), Decimal("1.50")])
+def test_additive_kept(text: str, x: Number):
+    tree = _optimized(text)
+    assert type(tree) is OpNode
+
+    value = tree.eval({"x": x})
+    expected = Calc(input_string=text).compile(optimize=False).eval({"x": x})
+    assert (type(value), str(value)) == (type(expected), str(expected))
+
+
+def test_identities_keep_float():
+    assert type(_optimized("x * 1.5")) is OpNode
+    assert type(_optimized("x * (0.5 * 2)")) is OpNode
+
+
+def test_keep_raising_subtree():
+    calc = Calc(input_string="x + 1/0 * (2 + 3)")
+    calc._build_tree()
+    tree = optimize(calc._tree)
+
+    assert tree.right.right.token.value == 5
+    with pytest.raises(ArithmeticError) as ei:
+        tree.eval({"x": 1})
+    assert ei.value.args == ("division by zero", 5)
+
+
+def test_keep_failing_subtree():
+    # The complex result can't be floor divided, with a TypeError
+    calc = Calc(input_string="(-8) ** 0.5 // 1")
+    program = calc.compile()
+    with pytest.raises(TypeError):
+        program.eval()
+
+
+def test_original_intact():
+    calc = Calc(input_string="(1 + 2) * x")
+    calc._build_tree()
+    optimize(calc._tree)
+    assert type(calc._tree.left) is GroupNode
+
+
+def test_deep():
+    depth = 5_000
+    tree = _optimized("(" * depth + "x" + " + 1)" * depth)
+    assert tree.eval({"x": 1}) == depth + 1
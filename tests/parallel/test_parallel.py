@@ -0,0 +1,49 @@
+import pytest
+
+from calc.limits import Limits
+from calc.parallel import evaluate_all, evaluate_file
+from calc.records import Outcome
+
+
+def test_input_order():
+    expressions = [f"{i} * 2" for i in range(1_000)]
+    outcomes = list(evaluate_all(expressions, workers=2, chunk_size=7))
+    assert [outcome.value for outcome in outcomes] == [i * 2 for i in range(1_000)]
+
+
+def test_errors_as_outcomes():
+    outcomes = list(evaluate_all(["1 / 0", "2 +", "3"], workers=2, chunk_size=1))
+    assert outcomes == [
+        Outcome(None, "division by zero", 2),
+        Outcome(None, "missing the right-hand-side for '+'", 2),
+        Outcome(3),
+    ]
+
+
+def test_limits():
+    outcomes = evaluate_all(
+        ["2**100", "2**200"], workers=1, limits=Limits(max_bits=128)
+    )
+    assert list(outcomes) == [
+        Outcome(2**100),
+        Outcome(None, "result too large: over 128 bits", 1),
+    ]
+
+
+def test_empty():
+    assert list(evaluate_all([], workers=1)) == []
+
+
+def test_invalid_chunk_size():
+    with pytest.raises(ValueError, match=r"chunk size must be positive, got 0"):
+        list(evaluate_all(["1"], chunk_size=0))
+
+
+def test_file(tmp_path):
+    path = tmp_path / "expressions.txt"
+    path.write_text("1 + 1\n\n2 ** 10\n")
+    assert list(evaluate_file(path, workers=2)) == [
+        Outcome(2),
+        Outcome(None),
+        Outcome(1024),
+    ]
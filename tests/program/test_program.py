@@ -0,0 +1,89 @@
+import pytest
+
+from calc import Calc
+from calc.program import Program
+
+
+def _compile(text: str) -> Program:
+    return Calc(input_string=text).compile()
+
+
+def test_empty():
+    program = _compile("")
+    assert len(program) == 0
+    assert program.eval() is None
+
+
+def test_postfix_order():
+    program = Calc(input_string="2 * (3 + 4)").compile(optimize=False)
+    assert list(program._args) == [0, 1, 2, 7, 2]
+    assert program._constants == [2, 3, 4]
+
+
+def test_eval():
+    assert _compile("2 * (3 + 4) + 7 * 2**2").eval() == 42
+
+
+def test_unary():
+    assert _compile("3 * --2").eval() == 6
+    assert _compile("-2 ** 2").eval() == -4
+
+
+def test_reuse():
+    program = _compile("1 / 4")
+    assert program.eval() == 0.25
+    assert program.eval() == 0.25
+
+
+def test_division_by_zero_position():
+    with pytest.raises(ArithmeticError) as ei:
+        _compile("2 * (1 + 3 / 0)").eval()
+    assert ei.value.args == ("division by zero", 11)
+
+
+def test_missing_lhs_position():
+    with pytest.raises(ArithmeticError) as ei:
+        _compile("2 + * 3").eval()
+    assert ei.value.args == ("missing the left-hand-side for '*'", 4)
+
+
+def test_missing_rhs_position():
+    with pytest.raises(ArithmeticError) as ei:
+        _compile("(2 ** 3 *) + 1").eval()
+    assert ei.value.args == ("missing the right-hand-side for '*'", 8)
+
+
+def test_same_as_tree():
+    calc = Calc(input_string="1 - 2 / 4 * 3 ** 2 % 5 // 2 + -(0.5 - 1)")
+    assert calc.compile().eval() == calc.result
+
+
+def test_call_with_bindings():
+    program = _compile("x * 2 + y")
+    assert program.variables == ("x", "y")
+    assert program(x=3, y=4) == 10
+    assert program(x=0.5, y=-1) == 0
+
+
+def test_repeated_variable():
+    program = _compile("x * x - (x + 1)")
+    assert program.variables == ("x",)
+    assert program(x=5) == 19
+
+
+def test_undefined_variable_position():
+    with pytest.raises(ArithmeticError) as ei:
+        _compile("x + 2 * y / y")(x=1)
+    assert ei.value.args == ("undefined variable 'y'", 8)
+
+
+def test_error_order():
+    with pytest.raises(ArithmeticError) as ei:
+        _compile("1 / 0 + x")()
+    assert ei.value.args == ("division by zero", 2)
+
+
+def test_optimized():
+    program = _compile("2 ** 10 * (3 + 4) * x * 1")
+    assert program._constants == [7168]
+    assert program(x=2) == 14336
@@ -0,0 +1,66 @@
+import subprocess
+import sys
+from decimal import Decimal
+from fractions import Fraction
+
+from calc import Calc, evaluate
+from calc.records import Outcome, format_value, json_record, try_call, try_evaluate
+
+
+def test_try_evaluate():
+    calc = Calc(prompt="")
+    assert try_evaluate(calc, "2 * (3 + 4)") == Outcome(14)
+    assert try_evaluate(calc, "") == Outcome(None)
+    assert try_evaluate(calc, "1 + 1/0") == Outcome(None, "division by zero", 5)
+    assert try_evaluate(calc, "(1 + 2") == Outcome(None, "unmatched '(' at 0", 0)
+    assert try_evaluate(calc, "1 + 0b2") == Outcome(None, "invalid literal '0b2'", 4)
+
+
+def test_try_call_complex():
+    # A complex result is a value, like any other
+    assert try_call(evaluate, "(-1) ** 0.5") == Outcome((-1) ** 0.5)
+
+
+def test_try_call_type_error():
+    # A complex result isn't an error, until an operation rejects it
+    outcome = try_call(evaluate, "(-8) ** 0.5 // 1")
+    assert outcome.value is None
+    assert outcome.error.startswith("unsupported operand type(s) for //")
+
+
+def test_format_value():
+    assert format_value(12) == "12"
+    assert format_value(Decimal("0.30")) == "0.30"
+    big = 9**5000
+    assert format_value(big) == str(Decimal(big))
+    assert format_value(Fraction(big, 7)) == f"{Decimal(big)}/7"
+
+
+def test_json_record():
+    assert json_record(Outcome(3)) == {"result": 3}
+    assert json_record(Outcome(0.5)) == {"result": 0.5}
+    assert json_record(Outcome(None)) == {"result": None}
+    assert json_record(Outcome(Decimal("0.30"))) == {"result": "0.30"}
+    assert json_record(Outcome(Fraction(1, 3))) == {"result": "1/3"}
+    # Not numbers in JSON
+    assert json_record(Outcome(float("inf"))) == {"result": "inf"}
+    assert json_record(Outcome(-float("inf"))) == {"result": "-inf"}
+    assert json_record(Outcome(float("nan"))) == {"result": "nan"}
+    assert json_record(Outcome(complex(0, 2))) == {"result": "2j"}
+    big = 9**5000
+    assert json_record(Outcome(big)) == {"result": str(Decimal(big))}
+    assert json_record(Outcome(None, "division by zero", 2)) == {
+        "error": "division by zero",
+        "position": 2,
+    }
+
+
+def test_no_process_pool():
+    # The command line and the server don't depend on the parallel evaluation
+    code = (
+        "import sys, calc.records, calc.server; print('calc.parallel' in sys.modules)"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    assert output.strip() == "False"
@@ -0,0 +1,202 @@
+import asyncio
+import json
+import socket
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+import pytest
+
+from calc.limits import Limits
+from calc.records import Outcome
+from calc.server import EvaluationServer, _response
+
+
+async def _exchange(server: EvaluationServer, lines: list) -> list:
+    tcp_server = await server.start_tcp(port=0)
+    host, port = tcp_server.sockets[0].getsockname()[:2]
+    async with tcp_server:
+        reader, writer = await asyncio.open_connection(host, port)
+        if lines:
+            writer.writelines(line + b"\n" for line in lines)
+            await writer.drain()
+            writer.write_eof()
+
+        responses = [json.loads(line) for line in (await reader.read()).splitlines()]
+        writer.close()
+        return responses
+
+
+def _requests(*requests) -> list:
+    return [json.dumps(request).encode() for request in requests]
+
+
+def _serve(lines: list, **kwargs) -> list:
+    return asyncio.run(_exchange(EvaluationServer(**kwargs), lines))
+
+
+def test_pipelined_requests():
+    requests = _requests(*({"id": i, "expr": f"{i} * 2"} for i in range(200)))
+    assert _serve(requests, max_pending=8) == [
+        {"id": i, "result": i * 2} for i in range(200)
+    ]
+
+
+def test_variables_and_errors():
+    assert _serve(
+        _requests(
+            {"expr": "x * 2 + y", "vars": {"x": 3, "y": 0.5}},
+            {"id": "a", "expr": "1 / x", "vars": {"x": 0}},
+            {"id": "b", "expr": "(1 + 2"},
+            {"id": "c", "expr": ""},
+        )
+    ) == [
+        {"result": 6.5},
+        {"id": "a", "error": "division by zero", "position": 2},
+        {"id": "b", "error": "unmatched '(' at 0", "position": 0},
+        {"id": "c", "result": None},
+    ]
+
+
+def test_limits():
+    requests = _requests(
+        {"id": 1, "expr": "9**(9**9)"},
+        {"id": 2, "expr": "(" * 10 + "1" + ")" * 10},
+        {"id": 3, "expr": "2**20"},
+    )
+    assert _serve(requests, limits=Limits(max_bits=64, max_depth=5)) == [
+        {"id": 1, "error": "result too large: over 64 bits", "position": 1},
+        {
+            "id": 2,
+            "error": "too deeply nested '(' at 5, the maximum depth is 5",
+            "position": 5,
+        },
+        {"id": 3, "result": 2**20},
+    ]
+
+
+def test_bad_request_keeps_connection():
+    # Past the digits Python converts to text, and an error outside of calc
+    requests = _requests(
+        {"id": 1, "expr": "9 ** 5000"},
+        {"id": 2, "expr": "(-8) ** 0.5 // 1"},
+        {"id": 3, "expr": "1 + 2"},
+    )
+    responses = _serve(requests)
+    assert responses[0]["id"] == 1
+    assert responses[0]["result"] == str(Decimal(9**5000))
+    assert responses[1]["id"] == 2
+    assert responses[1]["error"].startswith("unsupported operand type(s)")
+    assert responses[2] == {"id": 3, "result": 3}
+
+
+def test_non_finite_results():
+    assert _response(1, Outcome(float("inf"))) == b'{"id": 1, "result": "inf"}\n'
+    assert _serve(_requests({"expr": "1.7976931348623157e308 * 1.5"})) == [
+        {"result": "inf"}
+    ]
+
+
+def test_connection_reset():
+    async def reset() -> tuple:
+        errors = []
+        asyncio.get_running_loop().set_exception_handler(
+            lambda loop, context: errors.append(context["message"])
+        )
+        server = EvaluationServer()
+        tcp_server = await server.start_tcp(port=0)
+        host, port = tcp_server.sockets[0].getsockname()[:2]
+        async with tcp_server:
+            _, writer = await asyncio.open_connection(host, port)
+            await asyncio.sleep(0.05)
+            # Closed with a reset rather than the end of the requests
+            writer.get_extra_info("socket").setsockopt(
+                socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0)
+            )
+            writer.transport.abort()
+            for _ in range(100):
+                await asyncio.sleep(0.01)
+                if server._connections == 0:
+                    break
+        return server._connections, errors
+
+    assert asyncio.run(reset()) == (0, [])
+
+
+def test_reset_without_reading():
+    # The responses fill the socket buffers, then the connection is reset
+    #  while the server waits for room to queue more of them
+    async def reset() -> int:
+        server = EvaluationServer(max_pending=8)
+        tcp_server = await server.start_tcp(port=0)
+        client = socket.socket()
+        client.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+        client.connect(tcp_server.sockets[0].getsockname()[:2])
+        async with tcp_server:
+            _, writer = await asyncio.open_connection(sock=client)
+            request = json.dumps({"expr": "9 ** 5000"}).encode() + b"\n"
+            writer.write(request * 3000)
+            await asyncio.sleep(0.5)
+            client.setsockopt(
+                socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0)
+            )
+            writer.transport.abort()
+            for _ in range(100):
+                await asyncio.sleep(0.01)
+                if server._connections == 0:
+                    break
+        return server._connections
+
+    # Not asyncio.run, which would wait for a stuck connection forever
+    loop = asyncio.new_event_loop()
+    try:
+        assert loop.run_until_complete(reset()) == 0
+    finally:
+        loop.close()
+
+
+def test_offloaded_requests_keep_order():
+    expressions = ["1 + " * 50 + "1", "2", "+".join(["3"] * 30), "1 / 0"]
+    with ThreadPoolExecutor(2) as executor:
+        responses = _serve(
+            _requests(*({"id": i, "expr": e} for i, e in enumerate(expressions))),
+            offload_threshold=20,
+            executor=executor,
+        )
+    assert responses == [
+        {"id": 0, "result": 51},
+        {"id": 1, "result": 2},
+        {"id": 2, "result": 90},
+        {"id": 3, "error": "division by zero", "position": 2},
+    ]
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        b"not json",
+        b"[1, 2]",
+        b'{"id": 1}',
+        b'{"expr": 1}',
+        b'{"expr": "x", "vars": {"x": "1"}}',
+        b'{"expr": "x", "vars": [1]}',
+    ],
+)
+def test_invalid_request(line):
+    assert _serve([line, b'{"expr": "1"}']) == [
+        {"error": "invalid request", "position": None},
+        {"result": 1},
+    ]
+
+
+def test_request_too_long():
+    assert _serve([b'{"expr": "1"}', b" " * 200], max_line_length=100) == [
+        {"result": 1},
+        {"error": "request too long", "position": None},
+    ]
+
+
+def test_too_many_connections():
+    assert _serve([], max_connections=0) == [
+        {"error": "too many connections", "position": None}
+    ]
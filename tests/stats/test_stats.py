@@ -0,0 +1,119 @@
+import pytest
+
+from calc import Calc
+from calc.cache import ParseCache
+from calc.stats import Histogram, Measurement, Stats
+
+
+def test_disabled():
+    calc = Calc(input_string="1 + 2")
+    assert calc.result == 3
+    assert calc.stats is None
+
+
+def test_callback():
+    measurements = []
+    calc = Calc(input_string="(1 + 2) * x", on_measurement=measurements.append)
+    assert calc.compile()(x=2) == 6
+    assert calc.stats is None
+
+    (measurement,) = measurements
+    assert isinstance(measurement, Measurement)
+    assert measurement.operation == "compile"
+    assert list(measurement.durations) == ["tokenize", "group", "tree", "compile"]
+    assert all(duration >= 0 for duration in measurement.durations.values())
+    assert measurement.total >= sum(measurement.durations.values())
+    assert measurement.parse == "full"
+    assert (measurement.tokens, measurement.nodes) == (7, 5)
+    assert not measurement.failed
+
+
+def test_parse_kinds():
+    measurements = []
+    calc = Calc(input_string="1 + 2", on_measurement=measurements.append)
+    calc.result
+    calc.compile()
+    calc.compile()
+    calc.input = "1 + 23"
+    calc.result
+    calc.memoize()
+
+    assert [(m.operation, m.parse) for m in measurements] == [
+        ("result", "full"),
+        ("compile", "cached"),
+        ("compile", "cached"),
+        ("result", "incremental"),
+        ("memoize", "cached"),
+    ]
+    assert list(measurements[0].durations) == ["tokenize", "group", "tree", "eval"]
+    assert list(measurements[2].durations) == []
+    assert list(measurements[3].durations) == ["tokenize", "group", "tree", "eval"]
+    assert list(measurements[4].durations) == ["compile"]
+
+
+def test_failures(capsys):
+    measurements = []
+    calc = Calc(prompt="", input_string="1 / 0", on_measurement=measurements.append)
+    assert calc.result is None
+    capsys.readouterr()
+    calc.input = "(1"
+    with pytest.raises(SyntaxError):
+        calc.compile()
+
+    assert [(m.parse, m.failed) for m in measurements] == [
+        ("full", True),
+        (None, True),
+    ]
+    assert measurements[1].nodes == 0
+    assert list(measurements[1].durations) == ["tokenize", "group"]
+
+
+def test_stats():
+    cache = ParseCache()
+    calc = Calc(prompt="", cache=cache, stats=True)
+    for text in ["1 + 2", "3 * 4", "1 + 2", "(5"]:
+        calc.input = text
+        try:
+            calc.compile()()
+        except SyntaxError:
+            pass
+
+    stats = calc.stats
+    assert stats.operations == {"compile": 4}
+    assert stats.parses == {"full": 1, "incremental": 1, "cached": 1}
+    assert stats.cache_hits == 1
+    assert stats.failures == 1
+    assert stats.stages["tokenize"].count == 3
+    assert stats.stages["compile"].count == 2
+    assert stats.total.count == 4
+    assert stats.tokens.total == 3 + 3 + 3 + 2
+    assert stats.nodes.total == 3 + 3 + 3
+
+    stats.reset()
+    assert stats.total.count == 0
+    assert stats.stages == {}
+
+
+def test_histogram():
+    histogram = Histogram(unit=1e-6)
+    assert histogram.percentile(50) == 0.0
+    assert histogram.mean == 0.0
+
+    for value in [0.5e-6, 3e-6, 3e-6, 3e-6, 100e-6]:
+        histogram.add(value)
+    assert histogram.count == 5
+    assert histogram.max == 100e-6
+    assert histogram.mean == pytest.approx(109.5e-6 / 5)
+    assert [count for _, count in histogram.buckets] == [1, 0, 3, 0, 0, 0, 0, 1]
+    assert histogram.buckets[2][0] == pytest.approx(4e-6)
+    assert histogram.percentile(0) == pytest.approx(1e-6)
+    assert histogram.percentile(50) == pytest.approx(4e-6)
+    assert histogram.percentile(100) == 100e-6
+    assert "count=5" in repr(histogram)
+
+
+def test_stats_record():
+    stats = Stats()
+    stats.record(Measurement("result", {"eval": 2e-6}, 3e-6, "full", 3, 3, False))
+    assert stats.stages["eval"].total == 2e-6
+    assert stats.operations["result"] == 1
@@ -1,4 +1,20 @@
-from calc.token import Token
+from decimal import Decimal
+
+import pytest
+
+from calc import Calc
+from calc.op import Bracket, Op
+from calc.token import (
+    CLOSE_BRACKET,
+    NUMBER,
+    OP,
+    OPEN_BRACKET,
+    OTHER,
+    VAR,
+    Token,
+    classify,
+)
+from calc.var import Var
 
 
 def test_init():
@@ -6,3 +22,36 @@ def test_init():
     assert t.value == "a"
     assert t.start == 0
     assert t.end == 1
+
+
+def test_no_instance_dict():
+    t = Token("a", 0, 1)
+    assert not hasattr(t, "__dict__")
+
+
+@pytest.mark.parametrize(
+    "value, kind, precedence",
+    [
+        (1, NUMBER, 0),
+        (Decimal("1.5"), NUMBER, 0),
+        (Var("x"), VAR, 0),
+        (Op.ADD, OP, 0),
+        (Op.DIV, OP, 1),
+        (Op.EXP, OP, 2),
+        (Bracket.S_OPEN, OPEN_BRACKET, 0),
+        (Bracket.C_CLOSE, CLOSE_BRACKET, 0),
+        ("a", OTHER, 0),
+    ],
+)
+def test_kind(value, kind, precedence):
+    assert classify(value) == (kind, precedence)
+    t = Token(value, 0, 1)
+    assert (t.kind, t.precedence) == (kind, precedence)
+
+
+def test_scanned_kinds():
+    calc = Calc(input_string="(x + 2) ** 3")
+    calc._tokenize()
+    assert [(t.kind, t.precedence) for t in calc._tokens] == [
+        classify(t.value) for t in calc._tokens
+    ]
@@ -43,3 +43,11 @@ def test_setters():
     root.right = right
     assert root.left == left
     assert root.right == right
+
+
+def test_no_instance_dict():
+    from calc.tree import GroupNode, NumNode, OpNode, VarNode
+
+    for cls in (Tree, GroupNode, NumNode, OpNode, VarNode):
+        node = cls.__new__(cls)
+        assert not hasattr(node, "__dict__")